@@ -32,7 +32,8 @@ def create_app(config_class=Config):
             r"/api/*": {
                 "origins": "*",
                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization"],
+                "allow_headers": ["Content-Type", "Authorization", "Last-Event-ID"],
+                "expose_headers": ["X-Slug-Job-Id", "X-Slug-Job-Events"],
                 "supports_credentials": False,
             }
         },
@@ -62,6 +63,6 @@ def create_app(config_class=Config):
 
 @login_manager.user_loader
 def load_user(user_id):
-    from app.models.user import User
+    from app.services.identity_cache import get_identity
 
-    return User.query.get(int(user_id))
+    return get_identity(int(user_id))
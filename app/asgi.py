@@ -0,0 +1,250 @@
+import asyncio
+import io
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app.routes.api import existing_link_event
+from app.services.slug_jobs import JobQueueFull, get_job, get_or_start_job
+from app.services.url_validator import validate_url
+from app.utils.auth_decorators import authenticate_bearer
+
+MAX_BODY_SIZE = 64 * 1024
+
+JOB_EVENTS_PATH = re.compile(r"^/api/slug-jobs/([0-9a-f]{32})/events$")
+
+SSE_HEADERS = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+    (b"access-control-allow-origin", b"*"),
+]
+
+
+class SlugStreamingApp:
+    """
+    ASGI application for the async serving mode.
+
+    Slug-generation SSE streams are served natively on the event loop, so an
+    open stream costs a coroutine instead of a request thread. Generation
+    itself still runs on the slug job pool. Every other request is handed to
+    the Flask WSGI app unchanged.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http":
+            path = scope["path"]
+            method = scope["method"]
+
+            if path == "/api/generate-slugs" and method == "POST":
+                await self.generate_slugs(scope, receive, send)
+                return
+
+            match = JOB_EVENTS_PATH.match(path)
+            if match and method == "GET":
+                await self.stream_job(match.group(1), scope, receive, send)
+                return
+
+        await self.wsgi_app(scope, receive, send)
+
+    async def generate_slugs(self, scope, receive, send):
+        """
+        Async equivalent of api.generate_slugs. It never enters Flask's
+        request dispatch, so before_request hooks and error handlers do not
+        run; checks the route needs are repeated here.
+        """
+        body = await _read_body(receive)
+        if body is None:
+            await _send_json(send, 413, {"error": "Request body too large"})
+            return
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            data = {}
+
+        long_url = data.get("url") if isinstance(data, dict) else None
+        if not long_url:
+            await _send_json(send, 400, {"error": "URL is required"})
+            return
+
+        is_valid, error_message, normalized_url = validate_url(long_url)
+        if not is_valid:
+            await _send_json(send, 400, {"error": error_message})
+            return
+
+        if data.get("reuse_existing"):
+            error, event = await asyncio.to_thread(self._existing_link, scope, body)
+            if error:
+                await _send_json(send, *error)
+                return
+            if event:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": SSE_HEADERS,
+                    }
+                )
+                frame = f"id: 1\ndata: {json.dumps(event)}\n\n"
+                await send({"type": "http.response.body", "body": frame.encode()})
+                return
+
+        try:
+            job = get_or_start_job(normalized_url, self.flask_app)
+        except JobQueueFull:
+            await _send_json(
+                send, 503, {"error": "The server is busy. Please try again shortly."}
+            )
+            return
+
+        headers = SSE_HEADERS + [(b"x-slug-job-id", job.id.encode())]
+        await self._stream(job, 0, receive, send, headers)
+
+    def _existing_link(self, scope, body):
+        """
+        The WSGI route's reuse_existing lookup, run in a Flask request context
+        built from this request so bearer and session auth behave the same.
+        Returns (error, event): error is (status, payload) for a rejected
+        API key.
+        """
+        with self.flask_app.request_context(_wsgi_environ(scope, body)):
+            error = authenticate_bearer()
+            if error:
+                response, status = error
+                return (status, response.get_json()), None
+            return None, existing_link_event()
+
+    async def stream_job(self, job_id, scope, receive, send):
+        """Async equivalent of api.stream_slug_job, without the attach window."""
+        job = get_job(job_id)
+        if not job:
+            await _send_json(send, 404, {"success": False, "error": "Job not found"})
+            return
+
+        last_event_id = _last_event_id(scope)
+        if job.done and job.last_event_id <= last_event_id:
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await self._stream(job, last_event_id, receive, send, SSE_HEADERS)
+
+    async def _stream(self, job, last_event_id, receive, send, headers):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            async for item in job.astream(last_event_id):
+                if disconnected.done():
+                    return
+                if item is None:
+                    frame = ": keepalive\n\n"
+                else:
+                    event_id, event = item
+                    frame = f"id: {event_id}\ndata: {event}\n\n"
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": frame.encode(),
+                        "more_body": True,
+                    }
+                )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            disconnected.cancel()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _read_body(receive):
+    """Read the full request body, or None if it exceeds MAX_BODY_SIZE."""
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_SIZE:
+            return None
+        if not message.get("more_body"):
+            return body
+
+
+def _wsgi_environ(scope, body):
+    """WSGI environ for running Flask request code against an ASGI request."""
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin1"),
+        "PATH_INFO": scope["path"].encode().decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin1").upper().replace("-", "_")
+        value = value.decode("latin1")
+        if key == "CONTENT_LENGTH":
+            continue
+        if key != "CONTENT_TYPE":
+            key = f"HTTP_{key}"
+        if key in environ:
+            separator = "; " if key == "HTTP_COOKIE" else ","
+            value = f"{environ[key]}{separator}{value}"
+        environ[key] = value
+    return environ
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"access-control-allow-origin", b"*"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def _last_event_id(scope):
+    """Read the resume position from the Last-Event-ID header or query string."""
+    value = dict(scope.get("headers", [])).get(b"last-event-id", b"").decode()
+    if not value:
+        query = parse_qs(scope.get("query_string", b"").decode())
+        value = query.get("last_event_id", ["0"])[0]
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return 0
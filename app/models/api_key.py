@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from app import db
+
+
+class ApiKey(db.Model):
+    """
+    A user's API key for server-to-server clients. Only a SHA-256 hash of
+    the key is stored; the public prefix locates the row to verify against.
+    """
+
+    __tablename__ = "api_keys"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name = db.Column(db.String(100), nullable=False)
+    prefix = db.Column(db.String(16), unique=True, nullable=False, index=True)
+    key_hash = db.Column(db.String(64), nullable=False)
+    # Space-separated, e.g. "read write"
+    scopes = db.Column(db.String(100), nullable=False, default="read")
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Written in batches by the usage buffer, so it can lag by a flush interval
+    last_used_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship(
+        "User",
+        backref=db.backref(
+            "api_keys",
+            lazy="dynamic",
+            cascade="all, delete-orphan",
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ApiKey {self.prefix} for user_id={self.user_id}>"
@@ -1,7 +1,9 @@
-import re
 from datetime import datetime
 
+from sqlalchemy.orm import validates
+
 from app import db
+from app.services.social_platforms import detect_platform
 
 
 class BioPage(db.Model):
@@ -39,7 +41,8 @@ class BioPage(db.Model):
             return None
         if self.avatar_url.startswith(("http://", "https://", "/")):
             return self.avatar_url
-        return f"/api/avatar/{self.avatar_url}"
+        # 96px circle, so the 192px variant covers 2x displays
+        return f"/api/avatar/{self.avatar_url}?size=192"
 
     def __repr__(self):
         return f"<BioPage @{self.username}>"
@@ -59,39 +62,16 @@ class BioLink(db.Model):
     position = db.Column(db.Integer, default=0, nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     is_social = db.Column(db.Boolean, default=False, nullable=False)
+    social_platform = db.Column(db.String(20), nullable=True, index=True)
     click_count = db.Column(db.Integer, default=0, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
-    # Social media platform patterns
-    SOCIAL_PATTERNS = {
-        "twitter": r"(twitter\.com|x\.com)",
-        "linkedin": r"linkedin\.com",
-        "github": r"github\.com",
-        "instagram": r"instagram\.com",
-        "facebook": r"facebook\.com",
-        "youtube": r"youtube\.com",
-        "tiktok": r"tiktok\.com",
-        "discord": r"discord\.(gg|com)",
-        "telegram": r"t\.me",
-        "whatsapp": r"(wa\.me|whatsapp\.com)",
-        "snapchat": r"snapchat\.com",
-        "reddit": r"reddit\.com",
-        "pinterest": r"pinterest\.com",
-        "twitch": r"twitch\.tv",
-        "medium": r"medium\.com",
-    }
-
-    @property
-    def social_platform(self):
-        """Detect which social media platform this link belongs to."""
-        if not self.is_social:
-            return None
-
-        url_lower = self.url.lower()
-        for platform, pattern in self.SOCIAL_PATTERNS.items():
-            if re.search(pattern, url_lower):
-                return platform
-        return "other"
+    @validates("url")
+    def _set_social_platform(self, key, value):
+        """Classify the link once, when its URL is written."""
+        self.social_platform = detect_platform(value)
+        self.is_social = self.social_platform is not None
+        return value
 
     def __repr__(self):
         return f"<BioLink {self.title} -> {self.url[:50]}>"
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from app import db
+
+
+class BioLinkClick(db.Model):
+    """A single click on a bio link, written in batches by the click buffer."""
+
+    __tablename__ = "bio_link_clicks"
+
+    id = db.Column(db.Integer, primary_key=True)
+    bio_link_id = db.Column(
+        db.Integer,
+        db.ForeignKey("bio_links.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    clicked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    ip_hash = db.Column(db.String(64), nullable=True)
+    referrer = db.Column(db.Text, nullable=True)
+    device_type = db.Column(db.String(20), nullable=True)
+    browser = db.Column(db.String(100), nullable=True)
+
+    link = db.relationship(
+        "BioLink",
+        backref=db.backref(
+            "click_events",
+            lazy="dynamic",
+            cascade="all, delete-orphan",
+            passive_deletes=True,
+        ),
+    )
+
+    def __repr__(self):
+        return f"<BioLinkClick {self.id} for bio_link_id={self.bio_link_id}>"
+
+
+class BioLinkDailyStat(db.Model):
+    """Clicks per bio link per UTC day; analytics charts read only these rows."""
+
+    __tablename__ = "bio_link_daily_stats"
+
+    bio_link_id = db.Column(
+        db.Integer,
+        db.ForeignKey("bio_links.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = db.Column(db.Date, primary_key=True)
+    clicks = db.Column(db.Integer, default=0, nullable=False)
+
+    link = db.relationship(
+        "BioLink",
+        backref=db.backref(
+            "daily_stats",
+            lazy="dynamic",
+            cascade="all, delete-orphan",
+            passive_deletes=True,
+        ),
+    )
+
+    def __repr__(self):
+        return f"<BioLinkDailyStat {self.bio_link_id} {self.day}={self.clicks}>"
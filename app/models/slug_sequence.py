@@ -0,0 +1,13 @@
+from app import db
+
+
+class SlugSequence(db.Model):
+    """Named counters from which workers reserve blocks of short-code values."""
+
+    __tablename__ = "slug_sequences"
+
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SlugSequence {self.name}={self.next_value}>"
@@ -1,14 +1,25 @@
 from datetime import datetime
 
 from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import validates
 
 from app import db
+from app.services.url_cleaner import destination_hash
+
+# Leading characters of original_url covered by the destination prefix index
+DESTINATION_PREFIX_LENGTH = 200
 
 
 class URL(db.Model):
     """URL model for shortened links."""
 
     __tablename__ = "urls"
+    __table_args__ = (
+        db.Index("ix_urls_user_destination", "user_id", "destination_hash"),
+        # Keyset pagination order (see link_listing.list_user_links)
+        db.Index("ix_urls_user_created", "user_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     original_url = db.Column(db.Text, nullable=False)
@@ -17,6 +28,20 @@ class URL(db.Model):
     click_count = db.Column(db.Integer, default=0, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     expires_at = db.Column(db.DateTime, nullable=True, default=None)
+    destination_hash = db.Column(db.String(64), nullable=True)
+    # Page title from the scrape at creation time, for search and display
+    title = db.Column(db.String(300), nullable=True)
+
+    @validates("original_url")
+    def _set_destination_hash(self, key, value):
+        """Keep destination_hash in step with every write of original_url."""
+        self.destination_hash = destination_hash(value)
+        return value
+
+    @validates("title")
+    def _trim_title(self, key, value):
+        """Store scraped titles trimmed to the column, and blanks as None."""
+        return (value or "").strip()[:300] or None
 
     def increment_clicks(self):
         """Increment the click counter with error handling."""
@@ -31,6 +56,16 @@ class URL(db.Model):
                 )
             raise
 
+    @classmethod
+    def find_existing(cls, user_id, url):
+        """Return the user's live link to an equivalent destination, if any."""
+        candidates = (
+            cls.query.filter_by(user_id=user_id, destination_hash=destination_hash(url))
+            .order_by(cls.created_at.desc())
+            .all()
+        )
+        return next((link for link in candidates if not link.is_expired), None)
+
     @property
     def is_expired(self):
         """Check if this URL has expired."""
@@ -40,3 +75,21 @@ class URL(db.Model):
 
     def __repr__(self):
         return f"<URL {self.slug} -> {self.original_url[:50]}>"
+
+
+# Prefix search on slug and destination (see link_listing.search_filter).
+# The pattern ops let PostgreSQL use them for LIKE 'prefix%'.
+db.Index(
+    "ix_urls_user_slug_prefix",
+    URL.user_id,
+    URL.slug,
+    postgresql_ops={"slug": "varchar_pattern_ops"},
+)
+db.Index(
+    "ix_urls_user_destination_prefix",
+    URL.user_id,
+    func.substr(URL.original_url, 1, DESTINATION_PREFIX_LENGTH).label(
+        "destination_prefix"
+    ),
+    postgresql_ops={"destination_prefix": "text_pattern_ops"},
+)
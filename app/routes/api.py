@@ -1,17 +1,65 @@
+import hashlib
+import json
 import logging
+import mimetypes
 import re
 from datetime import datetime
-from io import BytesIO
 
-import qrcode
-from flask import Blueprint, Response, jsonify, request, send_file, stream_with_context
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    send_file,
+    stream_with_context,
+)
 from flask_login import current_user, login_required
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app import db
+from app.models.api_key import ApiKey
 from app.models.bio import BioLink, BioPage
 from app.models.url import URL
-from app.services.slug_generator import generate_slug_options
-from app.services.storage_service import delete_avatar, get_avatar, upload_avatar
+from app.services.ai_providers import get_provider
+from app.services.analytics_service import hash_ip
+from app.services.api_keys import create_api_key, serialize_api_key
+from app.services.bio_analytics import get_page_analytics, parse_days
+from app.services.bio_cache import invalidate_bio_page
+from app.services.bio_links import (
+    BioLinkNotFound,
+    apply_link_operations,
+    delete_link_clicks,
+    serialize_link,
+    set_link_positions,
+)
+from app.services.bulk_jobs import get_bulk_job, parse_url_list, start_bulk_job
+from app.services.click_buffer import get_click_buffer, link_exists
+from app.services.image_pipeline import pick_variant, read_upload
+from app.services.link_counts import get_link_count
+from app.services.link_listing import list_user_links, parse_limit
+from app.services.link_search import search_user_links
+from app.services.qr_service import (
+    DEFAULT_BOX_SIZE,
+    MAX_BOX_SIZE,
+    MIN_BOX_SIZE,
+    QR_FORMATS,
+    get_export_executor,
+    get_qr_code,
+    invalidate_qr_codes,
+    stream_qr_zip,
+)
+from app.services.slug_allocator import get_allocator
+from app.services.slug_generator import cached_page_title
+from app.services.slug_index import MAX_SLUG_LENGTH, SLUG_PATTERN, get_slug_index
+from app.services.slug_jobs import JobQueueFull, get_job, get_or_start_job
+from app.services.storage_service import (
+    delete_avatar,
+    get_avatar,
+    get_avatar_path,
+    upload_avatar,
+)
 from app.services.url_validator import validate_url
 from app.utils.auth_decorators import jwt_optional, subadmin_required
 
@@ -42,64 +90,231 @@ def _parse_expires_at(value):
         )
 
 
-def _is_social_media_url(url):
-    """Check if a URL is a social media platform."""
-    social_patterns = [
-        r"(twitter\.com|x\.com)",
-        r"linkedin\.com",
-        r"github\.com",
-        r"instagram\.com",
-        r"facebook\.com",
-        r"youtube\.com",
-        r"tiktok\.com",
-        r"discord\.(gg|com)",
-        r"t\.me",
-        r"(wa\.me|whatsapp\.com)",
-        r"snapchat\.com",
-        r"reddit\.com",
-        r"pinterest\.com",
-        r"twitch\.tv",
-        r"medium\.com",
-    ]
+def _request_user_id():
+    """Id of the caller, from a JWT (see jwt_optional) or the session."""
+    if getattr(request, "current_user", None):
+        return request.current_user.id
+    if current_user.is_authenticated:
+        return current_user.id
+    return None
 
-    url_lower = url.lower()
-    return any(re.search(pattern, url_lower) for pattern in social_patterns)
 
+def _link_payload(url_obj):
+    """Response fields describing a short link."""
+    return {
+        "url_id": url_obj.id,
+        "slug": url_obj.slug,
+        "short_url": request.host_url + url_obj.slug,
+        "original_url": url_obj.original_url,
+        "title": url_obj.title,
+        "expires_at": url_obj.expires_at.isoformat() + "Z"
+        if url_obj.expires_at
+        else None,
+        "is_expired": url_obj.is_expired,
+    }
+
+
+def _format_sse(item):
+    """Format a (event_id, data) pair from a slug job as an SSE frame."""
+    if item is None:
+        return ": keepalive\n\n"
+    event_id, data = item
+    return f"id: {event_id}\ndata: {data}\n\n"
+
+
+def _last_event_id():
+    """Read the resume position from the Last-Event-ID header or query string."""
+    value = request.headers.get("Last-Event-ID") or request.args.get(
+        "last_event_id", "0"
+    )
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return 0
 
-@bp.route("/generate-slugs", methods=["POST"])
-def generate_slugs():
+
+def existing_link_event():
     """
-    Generate AI-powered slug options for a URL.
-    Returns Server-Sent Events stream for real-time updates.
+    The "existing" slug event for the caller's link to the requested URL
+    when reuse_existing is set, else None. Shared by the WSGI route and the
+    ASGI stream (app.asgi), which calls it in an equivalent request context.
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
+    user_id = _request_user_id()
+    if not (user_id and data.get("reuse_existing") and data.get("url")):
+        return None
+
+    is_valid, _, normalized_url = validate_url(data["url"])
+    if not is_valid:
+        return None
+    existing = URL.find_existing(user_id, normalized_url)
+    if not existing:
+        return None
+    return {
+        "status": "existing",
+        "message": "You already have a short link for this page",
+        **_link_payload(existing),
+    }
+
+
+def _start_slug_job():
+    """Validate the request URL and attach to (or queue) its slug job.
+    Returns (job, error_response).
+    """
+    data = request.get_json(silent=True) or {}
     long_url = data.get("url")
 
     if not long_url:
-        return jsonify({"error": "URL is required"}), 400
+        return None, (jsonify({"error": "URL is required"}), 400)
 
     # Validate URL
     is_valid, error_message, normalized_url = validate_url(long_url)
     if not is_valid:
-        return jsonify({"error": error_message}), 400
+        return None, (jsonify({"error": error_message}), 400)
+
+    try:
+        # Concurrent requests for the same destination share one job
+        job = get_or_start_job(normalized_url, current_app._get_current_object())
+    except JobQueueFull:
+        return None, (
+            jsonify({"error": "The server is busy. Please try again shortly."}),
+            503,
+        )
+
+    return job, None
+
+
+@bp.route("/generate-slugs", methods=["POST"])
+@jwt_optional
+def generate_slugs():
+    """
+    Generate AI-powered slug options for a URL.
+    Returns Server-Sent Events stream for real-time updates.
+    With "reuse_existing", a signed-in caller who already shortened the
+    destination gets a single "existing" event instead. The stream is capped
+    like /slug-jobs/<id>/events; clients resume there with Last-Event-ID.
+    """
+    event = existing_link_event()
+    if event:
+        return Response(
+            _format_sse((1, json.dumps(event))),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    job, error_response = _start_slug_job()
+    if error_response:
+        return error_response
+
+    window = current_app.config.get("SLUG_JOB_STREAM_WINDOW", 25)
 
     def generate():
         """Stream generation process updates."""
-        try:
-            # Use the slug generator service with normalized URL
-            for update in generate_slug_options(normalized_url):
-                yield f"data: {update}\n\n"
-        except Exception as e:
-            db.session.rollback()
-            yield f"data: {{'error': '{str(e)}'}}\n\n"
+        for item in job.stream(window=window):
+            yield _format_sse(item)
 
     return Response(
         stream_with_context(generate()),
         mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Slug-Job-Id": job.id,
+            "X-Slug-Job-Events": f"/api/slug-jobs/{job.id}/events",
+        },
+    )
+
+
+@bp.route("/slug-jobs", methods=["POST"])
+def create_slug_job():
+    """Queue a slug generation job and return its id without waiting on it."""
+    job, error_response = _start_slug_job()
+    if error_response:
+        return error_response
+
+    return jsonify(
+        {
+            "success": True,
+            **job.to_dict(),
+            "events_url": f"/api/slug-jobs/{job.id}/events",
+        }
+    ), 202
+
+
+@bp.route("/slug-jobs/<job_id>", methods=["GET"])
+def get_slug_job(job_id):
+    """Poll a slug job. Returns buffered events newer than ?last_event_id."""
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    events = [
+        {"id": event_id, "data": json.loads(data)}
+        for event_id, data in job.events_after(_last_event_id())
+    ]
+    return jsonify({"success": True, **job.to_dict(), "events": events}), 200
+
+
+@bp.route("/slug-jobs/<job_id>/events", methods=["GET"])
+def stream_slug_job(job_id):
+    """
+    Attach to a slug job's event stream. Clients resume with Last-Event-ID;
+    each attach is capped so idle streams release their request thread.
+    """
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    last_event_id = _last_event_id()
+    if job.done and job.last_event_id <= last_event_id:
+        # Tells EventSource clients to stop reconnecting
+        return Response(status=204)
+
+    window = current_app.config.get("SLUG_JOB_STREAM_WINDOW", 25)
+
+    def generate():
+        yield "retry: 1000\n\n"
+        for item in job.stream(last_event_id, window=window):
+            yield _format_sse(item)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@bp.route("/slugs/check", methods=["GET"])
+def check_slug():
+    """
+    Typeahead availability check for a custom slug. Answers from the
+    in-memory slug index; the database is only consulted on create.
+    """
+    slug = request.args.get("prefix", "").strip().lower()
+
+    error = None
+    if not slug:
+        error = "Slug is required"
+    elif not re.match(SLUG_PATTERN, slug):
+        error = "Slug can only contain lowercase letters, numbers, and hyphens"
+    elif len(slug) > MAX_SLUG_LENGTH:
+        error = f"Slug must be {MAX_SLUG_LENGTH} characters or less"
+    if error:
+        return jsonify({"success": False, "valid": False, "error": error}), 400
+
+    index = get_slug_index()
+    available = slug not in index
+    return jsonify(
+        {
+            "success": True,
+            "valid": True,
+            "slug": slug,
+            "available": available,
+            "suggestions": [] if available else index.suggest(slug),
+        }
+    ), 200
+
+
 @bp.route("/create-short-url", methods=["POST"])
 @jwt_optional
 def create_short_url():
@@ -112,8 +327,9 @@ def create_short_url():
 
         long_url = data.get("url")
         slug = data.get("slug")
+        auto_slug = bool(data.get("auto_slug"))
 
-        if not long_url or not slug:
+        if not long_url or not (slug or auto_slug):
             return (
                 jsonify({"success": False, "error": "URL and slug are required"}),
                 400,
@@ -124,16 +340,21 @@ def create_short_url():
         if not is_valid:
             return jsonify({"success": False, "error": error_message}), 400
 
-        # Check if slug already exists
-        if URL.query.filter_by(slug=slug).first():
-            return jsonify({"success": False, "error": "Slug already taken"}), 400
+        user_id = _request_user_id()
 
-        # Support both JWT and session-based auth
-        user_id = None
-        if hasattr(request, "current_user") and request.current_user:
-            user_id = request.current_user.id
-        elif current_user.is_authenticated:
-            user_id = current_user.id
+        if user_id and data.get("reuse_existing"):
+            existing = URL.find_existing(user_id, normalized_url)
+            if existing:
+                return jsonify(
+                    {"success": True, "reused": True, **_link_payload(existing)}
+                ), 200
+
+        # Allocated codes are unique by construction, so only picked slugs
+        # need checking
+        if auto_slug:
+            slug = get_allocator().allocate()
+        elif URL.query.filter_by(slug=slug).first():
+            return jsonify({"success": False, "error": "Slug already taken"}), 400
 
         # Parse optional expiration (authenticated users only)
         expires_at = None
@@ -147,27 +368,29 @@ def create_short_url():
             slug=slug,
             user_id=user_id,
             expires_at=expires_at,
+            # Usually scraped moments ago by /generate-slugs
+            title=data.get("title") or cached_page_title(normalized_url),
         )
 
         db.session.add(new_url)
-        db.session.commit()
+        for attempt in range(3):
+            try:
+                db.session.commit()
+                break
+            except IntegrityError:
+                # Only an allocated code can be retried; a picked slug was taken
+                db.session.rollback()
+                if not auto_slug or attempt == 2:
+                    return jsonify(
+                        {"success": False, "error": "Slug already taken"}
+                    ), 400
+                slug = get_allocator().allocate()
+                new_url.slug = slug
+                db.session.add(new_url)
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "url_id": new_url.id,
-                    "slug": slug,
-                    "short_url": request.host_url + slug,
-                    "original_url": normalized_url,
-                    "expires_at": new_url.expires_at.isoformat() + "Z"
-                    if new_url.expires_at
-                    else None,
-                    "is_expired": new_url.is_expired,
-                }
-            ),
-            201,
-        )
+        return jsonify(
+            {"success": True, "reused": False, **_link_payload(new_url)}
+        ), 201
 
     except Exception:
         db.session.rollback()
@@ -254,6 +477,7 @@ def edit_slug(url_id):
                 url_obj.expires_at = expires_at
 
         db.session.commit()
+        invalidate_qr_codes(old_slug)
 
         return (
             jsonify(
@@ -286,11 +510,33 @@ def edit_slug(url_id):
         )
 
 
+def _qr_options():
+    """Read ?format= and ?size= for QR endpoints.
+    Returns (fmt, box_size, error_response).
+    """
+    fmt = request.args.get("format", "png").lower()
+    if fmt not in QR_FORMATS:
+        return (
+            None,
+            None,
+            (jsonify({"success": False, "error": "format must be png or svg"}), 400),
+        )
+
+    box_size = request.args.get("size", DEFAULT_BOX_SIZE, type=int)
+    if not MIN_BOX_SIZE <= box_size <= MAX_BOX_SIZE:
+        error = f"size must be between {MIN_BOX_SIZE} and {MAX_BOX_SIZE}"
+        return None, None, (jsonify({"success": False, "error": error}), 400)
+
+    return fmt, box_size, None
+
+
 @bp.route("/qrcode/<int:url_id>", methods=["GET"])
 @login_required
 def generate_qrcode(url_id):
-    """Generate QR code for a shortened URL."""
-    img_io = None
+    """
+    QR code for a shortened URL. Optional ?format=png|svg and ?size=<box px>.
+    Renders are cached per slug and revalidated with ETags.
+    """
     try:
         # Get the URL and verify ownership
         url_obj = URL.query.get_or_404(url_id)
@@ -299,40 +545,28 @@ def generate_qrcode(url_id):
         if url_obj.user_id != current_user.id:
             return jsonify({"success": False, "error": "Unauthorized"}), 403
 
-        # Generate the short URL
-        short_url = request.host_url + url_obj.slug
+        fmt, box_size, error_response = _qr_options()
+        if error_response:
+            return error_response
 
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
+        data, etag = get_qr_code(
+            url_obj.slug, request.host_url + url_obj.slug, box_size, fmt
         )
-        qr.add_data(short_url)
-        qr.make(fit=True)
-
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Save to BytesIO
-        img_io = BytesIO()
-        img.save(img_io, "PNG")
-        img_io.seek(0)
 
-        # Return image file
-        return send_file(
-            img_io,
-            mimetype="image/png",
-            as_attachment=True,
-            download_name=f"qrcode-{url_obj.slug}.png",
+        response = Response(data, mimetype=QR_FORMATS[fmt])
+        response.set_etag(etag)
+        # Keyed by link id, so a renamed slug must not be served from cache;
+        # no-cache makes the browser revalidate and the ETag answers with 304
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.headers["Content-Disposition"] = (
+            f'attachment; filename="qrcode-{url_obj.slug}.{fmt}"'
         )
+        return response.make_conditional(request)
 
     except Exception:
         db.session.rollback()
         logger.exception("Error generating QR code")
-        if img_io:
-            img_io.close()
         return jsonify(
             {
                 "success": False,
@@ -341,6 +575,153 @@ def generate_qrcode(url_id):
         ), 500
 
 
+@bp.route("/qrcode/export", methods=["GET", "POST"])
+@login_required
+def export_qrcodes():
+    """
+    Download QR codes for many links as one streamed ZIP. Takes url_ids as
+    a JSON list or ?ids=1,2,3; with neither, exports every link the user owns.
+    """
+    fmt, box_size, error_response = _qr_options()
+    if error_response:
+        return error_response
+
+    data = request.get_json(silent=True) or {}
+    url_ids = data.get("url_ids") or request.args.get("ids")
+    if isinstance(url_ids, str):
+        url_ids = url_ids.split(",")
+    try:
+        url_ids = [int(url_id) for url_id in url_ids or []]
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "url_ids must be integers"}), 400
+
+    max_links = current_app.config.get("QR_EXPORT_MAX_LINKS", 5000)
+    query = (
+        select(URL.slug)
+        .where(URL.user_id == current_user.id)
+        .order_by(URL.created_at.desc())
+    )
+    if url_ids:
+        query = query.where(URL.id.in_(url_ids))
+    slugs = db.session.scalars(query.limit(max_links + 1)).all()
+
+    if not slugs:
+        return jsonify({"success": False, "error": "No links to export"}), 404
+    if len(slugs) > max_links:
+        return jsonify(
+            {
+                "success": False,
+                "error": f"Exports are limited to {max_links} links at a time",
+            }
+        ), 400
+
+    app = current_app._get_current_object()
+    return Response(
+        stream_qr_zip(
+            slugs,
+            request.host_url,
+            get_export_executor(app),
+            window=app.config.get("QR_EXPORT_WORKERS", 4) * 2,
+            box_size=box_size,
+            fmt=fmt,
+        ),
+        mimetype="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="qrcodes.zip"'},
+    )
+
+
+def _bio_link_slugs(user_id):
+    """Slugs of the user's short links that are already on their bio page."""
+    host = request.host_url
+    urls = db.session.scalars(
+        select(BioLink.url)
+        .join(BioPage, BioPage.id == BioLink.bio_page_id)
+        .where(BioPage.user_id == user_id, BioLink.url.startswith(host))
+    )
+    return {url[len(host) :].strip("/") for url in urls}
+
+
+def _listed_link(url_obj):
+    return {
+        **_link_payload(url_obj),
+        "click_count": url_obj.click_count,
+        "created_at": url_obj.created_at.isoformat() + "Z",
+    }
+
+
+@bp.route("/links", methods=["GET"])
+@jwt_optional
+def list_links():
+    """
+    The caller's short links, newest first, one page at a time.
+    Query: ?limit=N (max 100), ?cursor=<next_cursor> for the next page or
+    ?before=<prev_cursor> for the previous one, ?q=<slug or destination
+    prefix>, ?exclude_bio=1 to skip links already on the caller's bio page.
+    """
+    user_id = _request_user_id()
+    if not user_id:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    exclude = ()
+    if request.args.get("exclude_bio") in ("1", "true"):
+        exclude = _bio_link_slugs(user_id)
+
+    prefix = request.args.get("q", "").strip() or None
+    try:
+        page = list_user_links(
+            user_id,
+            limit=parse_limit(request.args.get("limit")),
+            cursor=request.args.get("cursor"),
+            before=request.args.get("before"),
+            prefix=prefix,
+            exclude_slugs=exclude,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify(
+        {
+            "success": True,
+            "links": [_listed_link(link) for link in page.links],
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor,
+            # Unfiltered listings also report how many links there are
+            "total": None if prefix or exclude else get_link_count(user_id),
+        }
+    ), 200
+
+
+@bp.route("/links/search", methods=["GET"])
+@jwt_optional
+def search_links():
+    """
+    Ranked full-text search over the caller's links: slug, destination and
+    page title. Query: ?q=<words>, ?limit=N (max 100), ?cursor=<next_cursor>.
+    """
+    user_id = _request_user_id()
+    if not user_id:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        offset = int(request.args.get("cursor") or 0)
+        if offset < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid limit or cursor"}), 400
+
+    links, next_offset = search_user_links(
+        user_id, request.args.get("q", ""), limit=limit, offset=offset
+    )
+    return jsonify(
+        {
+            "success": True,
+            "links": [_listed_link(link) for link in links],
+            "next_cursor": None if next_offset is None else str(next_offset),
+        }
+    ), 200
+
+
 @bp.route("/analytics/<slug>", methods=["GET"])
 @jwt_optional
 def get_analytics(slug):
@@ -422,6 +803,9 @@ def edit_url(url_id):
 
         old_url = url_obj.original_url
         url_obj.original_url = normalized_url
+        if old_url != normalized_url:
+            # The old page's title no longer describes the link
+            url_obj.title = cached_page_title(normalized_url)
         db.session.commit()
 
         return (
@@ -450,6 +834,173 @@ def edit_url(url_id):
         )
 
 
+@bp.route("/bulk-jobs", methods=["POST"])
+@jwt_optional
+def create_bulk_job():
+    """
+    Shorten a list of URLs in the background.
+    Accepts JSON {"urls": [...]}, a CSV upload in "file", or a text/csv body.
+    """
+    user = _get_bio_user()
+    if not user:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    if "file" in request.files:
+        urls = parse_url_list(request.files["file"].read().decode("utf-8", "replace"))
+    elif request.mimetype == "text/csv":
+        urls = parse_url_list(request.get_data(as_text=True))
+    else:
+        data = request.get_json(silent=True) or {}
+        urls = data.get("urls")
+        if not isinstance(urls, list):
+            return jsonify(
+                {"success": False, "error": "A list of URLs is required"}
+            ), 400
+        urls = [str(url).strip() for url in urls if str(url).strip()]
+
+    if not urls:
+        return jsonify({"success": False, "error": "No URLs provided"}), 400
+
+    max_urls = current_app.config.get("BULK_MAX_URLS", 5000)
+    if len(urls) > max_urls:
+        return jsonify(
+            {
+                "success": False,
+                "error": f"A bulk job can contain at most {max_urls} URLs",
+            }
+        ), 400
+
+    job = start_bulk_job(
+        user.id, urls, request.host_url, current_app._get_current_object()
+    )
+    return jsonify({"success": True, **job.to_dict()}), 202
+
+
+def _get_owned_bulk_job(job_id):
+    """Return (job, error_response) for a bulk job owned by the caller."""
+    user = _get_bio_user()
+    if not user:
+        return None, (
+            jsonify({"success": False, "error": "Authentication required"}),
+            401,
+        )
+
+    job = get_bulk_job(job_id)
+    if not job or job.user_id != user.id:
+        return None, (jsonify({"success": False, "error": "Job not found"}), 404)
+    return job, None
+
+
+@bp.route("/bulk-jobs/<job_id>", methods=["GET"])
+@jwt_optional
+def get_bulk_job_status(job_id):
+    """Progress of a bulk shortening job."""
+    job, error_response = _get_owned_bulk_job(job_id)
+    if error_response:
+        return error_response
+    return jsonify({"success": True, **job.to_dict()}), 200
+
+
+@bp.route("/bulk-jobs/<job_id>/results.csv", methods=["GET"])
+@jwt_optional
+def download_bulk_job_results(job_id):
+    """Download the results of a bulk job as CSV (partial while running)."""
+    job, error_response = _get_owned_bulk_job(job_id)
+    if error_response:
+        return error_response
+
+    return Response(
+        job.results_csv(),
+        mimetype="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename=bulk-{job.id}.csv",
+        },
+    )
+
+
+@bp.route("/ai/metrics", methods=["GET"])
+@subadmin_required
+def ai_metrics():
+    """Per-model latency and token usage of the AI provider. Sub-admin only."""
+    provider = get_provider()
+    return jsonify(
+        {"success": True, "provider": provider.name, "models": provider.get_metrics()}
+    ), 200
+
+
+# --- API Key Endpoints ---
+
+
+def _key_manager_id():
+    """Keys are managed from a session or JWT login, never with another key."""
+    if getattr(request, "api_key", None):
+        return None
+    return _request_user_id()
+
+
+@bp.route("/api-keys", methods=["GET"])
+@jwt_optional
+def list_api_keys():
+    """The caller's API keys, newest first. Secrets are never returned."""
+    user_id = _key_manager_id()
+    if not user_id:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    keys = (
+        ApiKey.query.filter_by(user_id=user_id)
+        .order_by(ApiKey.created_at.desc(), ApiKey.id.desc())
+        .all()
+    )
+    return jsonify(
+        {"success": True, "api_keys": [serialize_api_key(key) for key in keys]}
+    ), 200
+
+
+@bp.route("/api-keys", methods=["POST"])
+@jwt_optional
+def issue_api_key():
+    """
+    Create an API key. Body: {"name": "...", "scopes": ["read", "write"]}.
+    The key itself is only shown in this response.
+    """
+    user_id = _key_manager_id()
+    if not user_id:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    data = request.get_json(silent=True) or {}
+    try:
+        api_key, key = create_api_key(user_id, data.get("name"), data.get("scopes"))
+        db.session.commit()
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception:
+        db.session.rollback()
+        logger.exception("Error creating API key")
+        return jsonify({"success": False, "error": "Failed to create API key"}), 500
+
+    return jsonify(
+        {"success": True, "key": key, "api_key": serialize_api_key(api_key)}
+    ), 201
+
+
+@bp.route("/api-keys/<int:key_id>", methods=["DELETE"])
+@jwt_optional
+def revoke_api_key(key_id):
+    """Revoke one of the caller's API keys."""
+    user_id = _key_manager_id()
+    if not user_id:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    api_key = ApiKey.query.filter_by(id=key_id, user_id=user_id).first()
+    if not api_key:
+        return jsonify({"success": False, "error": "Not found"}), 404
+
+    db.session.delete(api_key)
+    db.session.commit()
+    return jsonify({"success": True}), 200
+
+
 # --- Bio Page API Endpoints ---
 
 
@@ -592,6 +1143,7 @@ def update_bio():
     if not data:
         return jsonify({"success": False, "error": "Invalid request data"}), 400
 
+    old_username = page.username
     try:
         if "username" in data:
             new_username = data["username"].strip().lower()
@@ -619,6 +1171,7 @@ def update_bio():
             page.theme = data["theme"]
 
         db.session.commit()
+        invalidate_bio_page(old_username, page.username)
 
         return jsonify(
             {
@@ -654,6 +1207,10 @@ def upload_bio_avatar():
             {"success": False, "error": "Bio page not found. Create one first."}
         ), 404
 
+    # Refuse oversized bodies while parsing, before they are buffered
+    max_size = current_app.config.get("MAX_AVATAR_SIZE", 2 * 1024 * 1024)
+    request.max_content_length = max_size + 64 * 1024
+
     if "avatar" not in request.files:
         return jsonify({"success": False, "error": "No file uploaded"}), 400
 
@@ -662,7 +1219,7 @@ def upload_bio_avatar():
         return jsonify({"success": False, "error": "No file selected"}), 400
 
     try:
-        file_data = file.read()
+        file_data = read_upload(file.stream, max_size)
         old_avatar = page.avatar_url
 
         blob_name = upload_avatar(file_data, file.filename, file.content_type)
@@ -670,18 +1227,16 @@ def upload_bio_avatar():
         # Store blob name in database
         page.avatar_url = blob_name
         db.session.commit()
+        invalidate_bio_page(page.username)
 
         # Delete old avatar after successful update
         if old_avatar:
             delete_avatar(old_avatar)
 
-        # Return URL path for the avatar endpoint
-        avatar_url = f"/api/avatar/{blob_name}"
-
         return jsonify(
             {
                 "success": True,
-                "avatar_url": avatar_url,
+                "avatar_url": page.avatar_display_url,
             }
         ), 200
 
@@ -694,15 +1249,67 @@ def upload_bio_avatar():
         return jsonify({"success": False, "error": "Upload failed"}), 500
 
 
-@bp.route("/avatar/<path:blob_name>", methods=["GET"])
-def serve_avatar(blob_name):
-    """Serve avatar image from Google Cloud Storage."""
-    file_data, content_type = get_avatar(blob_name)
+AVATAR_MAX_AGE = 31536000  # a year; blob names are unique per upload
+
+
+def _avatar_response(name):
+    """
+    Response for one stored avatar file, or None if it does not exist.
+    Local files go out through send_file (sendfile where the server
+    supports it); both paths honour Range and conditional headers.
+    """
+    etag = hashlib.sha256(name.encode()).hexdigest()[:32]
 
+    path = get_avatar_path(name)
+    if path:
+        return send_file(
+            path,
+            mimetype=mimetypes.guess_type(name)[0],
+            conditional=True,
+            etag=etag,
+            # Without max_age, send_file marks the response no-cache
+            max_age=AVATAR_MAX_AGE,
+        )
+
+    file_data, content_type = get_avatar(name)
     if not file_data:
-        return jsonify({"error": "Avatar not found"}), 404
+        return None
+    response = Response(file_data, mimetype=content_type)
+    response.set_etag(etag)
+    return response.make_conditional(request, accept_ranges=True)
+
 
-    return Response(file_data, mimetype=content_type)
+@bp.route("/avatar/<path:blob_name>", methods=["GET"])
+def serve_avatar(blob_name):
+    """
+    Serve an avatar image. With ?size=<px>, serves the smallest resized
+    variant that covers it: WebP when the client accepts it, else JPEG.
+    Blob names are unique per upload, so responses are immutable and a
+    matching If-None-Match never reaches storage.
+    """
+    size = request.args.get("size", type=int)
+    name = blob_name
+    if size:
+        name = pick_variant(blob_name, size, "image/webp" in request.accept_mimetypes)
+
+    etag = hashlib.sha256(name.encode()).hexdigest()[:32]
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+    else:
+        response = _avatar_response(name)
+        if response is None and name != blob_name:
+            # Uploaded before variants existed
+            response = _avatar_response(blob_name)
+        if response is None:
+            return jsonify({"error": "Avatar not found"}), 404
+
+    if size:
+        response.vary.add("Accept")
+    response.cache_control.public = True
+    response.cache_control.max_age = AVATAR_MAX_AGE
+    response.cache_control.immutable = True
+    return response
 
 
 @bp.route("/bio/links", methods=["POST"])
@@ -736,18 +1343,16 @@ def create_bio_link():
         # Set position to end of list - use count for better performance
         link_count = BioLink.query.filter_by(bio_page_id=page.id).count()
 
-        # Auto-detect if this is a social media link
-        is_social = _is_social_media_url(url)
-
+        # The model classifies social links from the URL
         link = BioLink(
             bio_page_id=page.id,
             title=title,
             url=url,
             position=link_count,
-            is_social=is_social,
         )
         db.session.add(link)
         db.session.commit()
+        invalidate_bio_page(page.username)
 
         return jsonify(
             {
@@ -810,6 +1415,7 @@ def update_bio_link(link_id):
             link.is_active = bool(data["is_active"])
 
         db.session.commit()
+        invalidate_bio_page(page.username)
 
         return jsonify(
             {
@@ -848,8 +1454,11 @@ def delete_bio_link(link_id):
         return jsonify({"success": False, "error": "Link not found"}), 404
 
     try:
+        # Clicks go in bulk; the ORM cascade would load every one first
+        delete_link_clicks([link.id])
         db.session.delete(link)
         db.session.commit()
+        invalidate_bio_page(page.username)
         return jsonify({"success": True}), 200
 
     except Exception:
@@ -875,12 +1484,14 @@ def reorder_bio_links():
         return jsonify({"success": False, "error": "Order data required"}), 400
 
     try:
-        for item in data["order"]:
-            link = BioLink.query.filter_by(id=item["id"], bio_page_id=page.id).first()
-            if link:
-                link.position = item["position"]
+        positions = {int(item["id"]): int(item["position"]) for item in data["order"]}
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid order data"}), 400
 
+    try:
+        set_link_positions(page.id, positions)
         db.session.commit()
+        invalidate_bio_page(page.username)
         return jsonify({"success": True}), 200
 
     except Exception:
@@ -889,17 +1500,98 @@ def reorder_bio_links():
         return jsonify({"success": False, "error": "Failed to reorder links"}), 500
 
 
-@bp.route("/bio/links/<int:link_id>/click", methods=["POST"])
-def track_bio_link_click(link_id):
-    """Track a click on a bio link. Public endpoint, no auth required."""
-    link = BioLink.query.get(link_id)
-    if not link:
-        return jsonify({"success": False}), 404
+@bp.route("/bio/links/batch", methods=["POST"])
+@jwt_optional
+def batch_bio_links():
+    """
+    Apply several link edits in one transaction.
+    Expects JSON: {"operations": [
+        {"op": "create", "title": ..., "url": ..., "ref": "new-1"},
+        {"op": "update", "id": 1, "title": ..., "url": ..., "is_active": ...},
+        {"op": "delete", "id": 2},
+        {"op": "reorder", "ids": [3, "new-1", 1]}
+    ]}
+    Returns the page's links after the batch.
+    """
+    user = _get_bio_user()
+    if not user:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    page = BioPage.query.filter_by(user_id=user.id).first()
+    if not page:
+        return jsonify({"success": False, "error": "Not found"}), 404
+
+    data = request.get_json(silent=True) or {}
 
     try:
-        link.click_count += 1
+        links, created = apply_link_operations(page.id, data.get("operations"))
+        payload = [serialize_link(link) for link in links]
         db.session.commit()
-        return jsonify({"success": True}), 200
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 400
+    except BioLinkNotFound:
+        db.session.rollback()
+        return jsonify({"success": False, "error": "Link not found"}), 404
     except Exception:
         db.session.rollback()
-        return jsonify({"success": False}), 500
+        logger.exception("Error applying bio link batch")
+        return jsonify({"success": False, "error": "Failed to update links"}), 500
+
+    invalidate_bio_page(page.username)
+    return jsonify(
+        {
+            "success": True,
+            "links": payload,
+            "created": created,
+        }
+    ), 200
+
+
+@bp.route("/bio/links/<int:link_id>/click", methods=["POST"])
+def track_bio_link_click(link_id):
+    """
+    Track a click on a bio link. Public endpoint, no auth required.
+    Clicks are buffered and flushed in batches; only the link id check may
+    touch the DB, and known ids are cached.
+    Accepts an optional JSON body: {"referrer": "<bio page's document.referrer>"}
+    """
+    if not link_exists(link_id):
+        return jsonify({"success": False, "error": "Link not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    referrer = data.get("referrer") if isinstance(data, dict) else None
+    get_click_buffer().record(
+        link_id,
+        ip_hash=hash_ip(
+            request.remote_addr, current_app.config.get("IP_HASH_SALT", "default-salt")
+        ),
+        referrer=str(referrer)[:2048] if referrer else None,
+        user_agent=request.headers.get("User-Agent", ""),
+    )
+    return jsonify({"success": True}), 200
+
+
+@bp.route("/bio/analytics", methods=["GET"])
+@jwt_optional
+def get_bio_analytics():
+    """
+    Daily click counts for the caller's bio page and each of its links.
+    Query: ?days=N (default 30, max 365). Served from the daily rollups.
+    """
+    user = _get_bio_user()
+    if not user:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+
+    page = BioPage.query.filter_by(user_id=user.id).first()
+    if not page:
+        return jsonify({"success": False, "error": "Not found"}), 404
+
+    try:
+        days = parse_days(request.args.get("days"))
+    except ValueError:
+        return jsonify({"success": False, "error": "days must be a number"}), 400
+
+    return jsonify(
+        {"success": True, "analytics": get_page_analytics(page.id, days)}
+    ), 200
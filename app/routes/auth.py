@@ -1,10 +1,10 @@
-import os
 from datetime import datetime, timedelta
 
 import jwt
 from flask import Blueprint, jsonify, request
 
 from app.models.user import User
+from app.services.identity_cache import identity_for_token, jwt_secret
 
 bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
@@ -32,7 +32,7 @@ def api_login():
                 "email": user.email,
                 "exp": datetime.utcnow() + timedelta(days=30),
             },
-            os.getenv("SECRET_KEY", "dev-secret-key-change-in-production"),
+            jwt_secret(),
             algorithm="HS256",
         )
 
@@ -58,12 +58,7 @@ def verify_token():
     token = auth_header.split(" ")[1]
 
     try:
-        payload = jwt.decode(
-            token,
-            os.getenv("SECRET_KEY", "dev-secret-key-change-in-production"),
-            algorithms=["HS256"],
-        )
-        user = User.query.get(payload["user_id"])
+        user = identity_for_token(token)
 
         if user:
             return jsonify(
@@ -1,4 +1,3 @@
-import os
 from datetime import datetime
 
 import jwt
@@ -20,10 +19,18 @@ from app.models.bio import BioLink, BioPage
 from app.models.url import URL
 from app.models.user import User
 from app.services.analytics_service import record_click
+from app.services.bio_cache import cache_bio_page, get_cached_bio_page
 from app.services.email_service import send_password_reset_email
+from app.services.identity_cache import jwt_secret
+from app.services.link_counts import get_link_count
+from app.services.link_listing import LinkPage, list_user_links
+from app.services.link_search import search_user_links
+from app.services.qr_service import invalidate_qr_codes
 
 bp = Blueprint("web", __name__)
 
+DASHBOARD_PAGE_SIZE = 20
+
 
 @bp.route("/")
 def index():
@@ -33,24 +40,36 @@ def index():
 
 @bp.route("/@<username>")
 def bio_page(username):
-    """Public bio page."""
-    page = BioPage.query.filter_by(username=username).first_or_404()
-    all_links = (
-        BioLink.query.filter_by(bio_page_id=page.id, is_active=True)
-        .order_by(BioLink.position)
-        .all()
-    )
+    """Public bio page. Rendered HTML is cached until the page is edited."""
+    cached = get_cached_bio_page(username)
+    if cached:
+        html, etag = cached
+    else:
+        page = BioPage.query.filter_by(username=username).first_or_404()
+        all_links = (
+            BioLink.query.filter_by(bio_page_id=page.id, is_active=True)
+            .order_by(BioLink.position)
+            .all()
+        )
 
-    # Separate social and regular links
-    social_links = [link for link in all_links if link.is_social]
-    regular_links = [link for link in all_links if not link.is_social]
+        # Separate social and regular links
+        social_links = [link for link in all_links if link.is_social]
+        regular_links = [link for link in all_links if not link.is_social]
 
-    return render_template(
-        "bio_page.html",
-        page=page,
-        social_links=social_links,
-        regular_links=regular_links,
-    )
+        html = render_template(
+            "bio_page.html",
+            page=page,
+            social_links=social_links,
+            regular_links=regular_links,
+        )
+        etag = cache_bio_page(username, html)
+
+    response = Response(html, mimetype="text/html")
+    response.set_etag(etag)
+    # Browsers and proxies may keep it but must revalidate
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @bp.route("/link-expired/<slug>")
@@ -213,7 +232,7 @@ def extension_auth():
     try:
         payload = jwt.decode(
             token,
-            os.getenv("SECRET_KEY", "dev-secret-key-change-in-production"),
+            jwt_secret(),
             algorithms=["HS256"],
         )
         user = User.query.get(payload["user_id"])
@@ -253,20 +272,41 @@ def create():
 @bp.route("/dashboard")
 @login_required
 def dashboard():
-    """User dashboard showing their shortened URLs with pagination."""
-    page = request.args.get("page", 1, type=int)
-    per_page = 20
-    pagination = (
-        URL.query.filter_by(user_id=current_user.id)
-        .order_by(URL.created_at.desc())
-        .paginate(page=page, per_page=per_page, error_out=False)
-    )
-    urls = pagination.items
+    """
+    User dashboard showing their shortened URLs, newest first. Pages use
+    ?after=/?before= cursors rather than OFFSET, and the total comes from
+    the link count cache rather than a COUNT(*) per view. ?q= switches to
+    ranked full-text search results.
+    """
+    search = request.args.get("q", "").strip()
+    search_next_offset = None
+    try:
+        if search:
+            links, search_next_offset = search_user_links(
+                current_user.id,
+                search,
+                limit=DASHBOARD_PAGE_SIZE,
+                offset=max(request.args.get("offset", 0, type=int), 0),
+            )
+            link_page = LinkPage(links, None, None)
+        else:
+            link_page = list_user_links(
+                current_user.id,
+                limit=DASHBOARD_PAGE_SIZE,
+                cursor=request.args.get("after"),
+                before=request.args.get("before"),
+            )
+    except ValueError:
+        return redirect(url_for("web.dashboard"))
+
     bio_page = BioPage.query.filter_by(user_id=current_user.id).first()
     return render_template(
         "dashboard.html",
-        urls=urls,
-        pagination=pagination,
+        urls=link_page.links,
+        link_page=link_page,
+        total_links=get_link_count(current_user.id),
+        search=search,
+        search_next_offset=search_next_offset,
         bio_page=bio_page,
         now=datetime.utcnow(),
     )
@@ -278,7 +318,6 @@ def bio_editor():
     """Bio page editor."""
     page = BioPage.query.filter_by(user_id=current_user.id).first()
     links = []
-    used_urls = set()
 
     if page:
         links = (
@@ -287,26 +326,8 @@ def bio_editor():
             .all()
         )
 
-        # Collect already-used URLs (from briefen short links)
-        for link in links:
-            # Extract slug from briefen short URLs
-            if request.host_url.rstrip("/") in link.url:
-                slug = link.url.replace(request.host_url, "").strip("/")
-                used_urls.add(slug)
-
-    # Get all user URLs
-    all_user_urls = (
-        URL.query.filter_by(user_id=current_user.id)
-        .order_by(URL.created_at.desc())
-        .all()
-    )
-
-    # Filter out already-used URLs
-    user_urls = [url for url in all_user_urls if url.slug not in used_urls]
-
-    return render_template(
-        "bio_editor.html", page=page, links=links, user_urls=user_urls
-    )
+    # The link picker pages through the user's short links via /api/links
+    return render_template("bio_editor.html", page=page, links=links)
 
 
 @bp.route("/delete/<int:url_id>", methods=["POST"])
@@ -321,6 +342,7 @@ def delete_url(url_id):
 
     db.session.delete(url)
     db.session.commit()
+    invalidate_qr_codes(url.slug)
     flash("URL deleted successfully", "success")
     return redirect(url_for("web.dashboard"))
 
@@ -0,0 +1,326 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import google.generativeai as genai
+from flask import current_app
+
+
+class AIProviderError(Exception):
+    """Raised when a model call fails or misses its deadline."""
+
+
+class ModelMetrics:
+    """Rolling latency and token counters for one model."""
+
+    def __init__(self, window=200):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency, prompt_tokens=0, output_tokens=0, error=False):
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.prompt_tokens += prompt_tokens or 0
+            self.output_tokens += output_tokens or 0
+            self.latencies.append(latency)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            data = {
+                "calls": self.calls,
+                "errors": self.errors,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+            }
+
+        def percentile(p):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(len(latencies) * p))
+            return round(latencies[index] * 1000, 1)
+
+        data["latency_ms"] = {"p50": percentile(0.5), "p95": percentile(0.95)}
+        return data
+
+
+class AIProvider:
+    """
+    Base class for text generation providers.
+    Subclasses implement _complete and _stream; metrics are recorded here.
+    """
+
+    name = "base"
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+
+    def metrics_for(self, model):
+        with self._metrics_lock:
+            if model not in self._metrics:
+                self._metrics[model] = ModelMetrics()
+            return self._metrics[model]
+
+    def get_metrics(self):
+        with self._metrics_lock:
+            models = dict(self._metrics)
+        return {model: metrics.snapshot() for model, metrics in models.items()}
+
+    def complete(self, prompt, model, timeout=None):
+        """Return the full text response for a prompt."""
+        started = time.perf_counter()
+        try:
+            text, prompt_tokens, output_tokens = self._complete(
+                prompt, model, timeout or self.timeout
+            )
+        except Exception as e:
+            self.metrics_for(model).record(time.perf_counter() - started, error=True)
+            raise AIProviderError(f"{model} request failed: {e}") from e
+
+        self.metrics_for(model).record(
+            time.perf_counter() - started, prompt_tokens, output_tokens
+        )
+        return text
+
+    def stream(self, prompt, model, timeout=None):
+        """Yield text chunks of a streamed response."""
+        started = time.perf_counter()
+        usage = {}
+        try:
+            yield from self._stream(prompt, model, timeout or self.timeout, usage)
+        except Exception as e:
+            self.metrics_for(model).record(time.perf_counter() - started, error=True)
+            raise AIProviderError(f"{model} request failed: {e}") from e
+
+        self.metrics_for(model).record(
+            time.perf_counter() - started,
+            usage.get("prompt_tokens"),
+            usage.get("output_tokens"),
+        )
+
+    def _complete(self, prompt, model, timeout):
+        raise NotImplementedError
+
+    def _stream(self, prompt, model, timeout, usage):
+        raise NotImplementedError
+
+
+class GeminiProvider(AIProvider):
+    """Google Gemini, with one long-lived GenerativeModel per model name."""
+
+    name = "gemini"
+
+    def __init__(self, api_key, timeout=20):
+        super().__init__(timeout=timeout)
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not configured")
+
+        genai.configure(api_key=api_key)
+        self._models = {}
+        self._models_lock = threading.Lock()
+
+    def _model(self, name):
+        with self._models_lock:
+            if name not in self._models:
+                self._models[name] = genai.GenerativeModel(name)
+            return self._models[name]
+
+    @staticmethod
+    def _usage(response):
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return 0, 0
+        return usage.prompt_token_count, usage.candidates_token_count
+
+    def _complete(self, prompt, model, timeout):
+        response = self._model(model).generate_content(
+            prompt, request_options={"timeout": timeout}
+        )
+        return (response.text, *self._usage(response))
+
+    def _stream(self, prompt, model, timeout, usage):
+        response = self._model(model).generate_content(
+            prompt, stream=True, request_options={"timeout": timeout}
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        usage["prompt_tokens"], usage["output_tokens"] = self._usage(response)
+
+
+class StubProvider(AIProvider):
+    """
+    Local deterministic provider for tests and benchmarks. Builds slugs from
+    the prompt's title line, so the same prompt always gives the same answer.
+    """
+
+    name = "stub"
+
+    def __init__(self, timeout=20, latency=0.0):
+        super().__init__(timeout=timeout)
+        self.latency = latency
+
+    def _answer(self, prompt):
+        # Packed multi-page prompts get a JSON object of slug lists per page
+        pages = re.split(r"^\s*Page (\d+)\s*$", prompt, flags=re.MULTILINE)
+        if len(pages) > 1:
+            return json.dumps(
+                {
+                    index: self._answer(section).splitlines()
+                    for index, section in zip(pages[1::2], pages[2::2], strict=True)
+                }
+            )
+
+        match = re.search(r"Title:\s*(.*)", prompt)
+        words = re.findall(r"[a-z0-9]+", (match.group(1) if match else "").lower())
+        words = words[:6] or ["link"]
+        digest = hashlib.sha1(prompt.encode()).hexdigest()
+
+        slugs = [
+            "-".join(words[:3]),
+            "-".join(words[:2]),
+            "-".join(words),
+            f"{'-'.join(words[:2])}-{digest[:4]}",
+            f"{words[0]}-{digest[4:8]}",
+        ]
+        slug_lines = "\n".join(slug[:50] for slug in slugs)
+
+        if "SLUGS:" in prompt:
+            return (
+                f"THINKING: This page is about {' '.join(words)}.\n"
+                f"KEYWORDS: {', '.join(words)}\n"
+                f"SLUGS:\n{slug_lines}"
+            )
+        return slug_lines
+
+    def _complete(self, prompt, model, timeout):
+        if self.latency:
+            time.sleep(self.latency)
+        text = self._answer(prompt)
+        return text, len(prompt) // 4, len(text) // 4
+
+    def _stream(self, prompt, model, timeout, usage):
+        text, usage["prompt_tokens"], usage["output_tokens"] = self._complete(
+            prompt, model, timeout
+        )
+        yield from text.splitlines(keepends=True)
+
+
+# Calls one model may have running at once, including ones a hedge stopped
+# waiting for. Each of the (at most) HEDGE_MAX_MODELS models gets its own
+# slots and the pool has a worker per slot, so a new call never queues
+# behind calls to a hung model.
+HEDGE_SLOTS_PER_MODEL = 4
+HEDGE_MAX_MODELS = 2
+
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=HEDGE_SLOTS_PER_MODEL * HEDGE_MAX_MODELS,
+    thread_name_prefix="ai-hedge",
+)
+_hedge_in_flight = Counter()
+_hedge_lock = threading.Lock()
+
+
+def _release_hedge_slot(model):
+    with _hedge_lock:
+        _hedge_in_flight[model] -= 1
+
+
+def _submit_hedge(provider, prompt, model, timeout):
+    """Start a call to model on the hedge pool, or return None if it has no free slot."""
+    with _hedge_lock:
+        if _hedge_in_flight[model] >= HEDGE_SLOTS_PER_MODEL:
+            return None
+        _hedge_in_flight[model] += 1
+    future = _hedge_executor.submit(provider.complete, prompt, model, timeout)
+    future.add_done_callback(lambda _: _release_hedge_slot(model))
+    return future
+
+
+def hedged_complete(provider, prompt, models, is_usable, delay=0.0, timeout=None):
+    """
+    Send the prompt to each model in turn, `delay` seconds apart, and return
+    the first answer accepted by `is_usable`. A model whose slots are all
+    held by earlier calls is skipped. Raises AIProviderError if no answer is
+    usable.
+    """
+    timeout = timeout or provider.timeout
+    deadline = time.monotonic() + timeout
+    pending = set()
+    errors = []
+
+    try:
+        for index, model in enumerate(models):
+            is_last = index == len(models) - 1
+            future = _submit_hedge(provider, prompt, model, timeout)
+            if future is None:
+                errors.append(f"{model} has too many calls in flight")
+                if not is_last:
+                    continue
+            else:
+                pending.add(future)
+
+            while pending:
+                remaining = deadline - time.monotonic()
+                wait_for = remaining if is_last else min(delay, remaining)
+                if wait_for <= 0:
+                    break
+                done, pending = wait(
+                    pending, timeout=wait_for, return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for future in done:
+                    try:
+                        text = future.result()
+                    except AIProviderError as e:
+                        errors.append(str(e))
+                        continue
+                    if is_usable(text):
+                        return text
+    finally:
+        # Calls that have not started yet are dropped; running ones finish
+        # within `timeout` and release their slot
+        for future in pending:
+            future.cancel()
+
+    if time.monotonic() >= deadline:
+        raise AIProviderError(f"AI request timed out after {timeout}s")
+    raise AIProviderError("; ".join(errors) or "No usable AI response")
+
+
+def create_provider(config):
+    """Build the provider selected by AI_PROVIDER."""
+    name = config.get("AI_PROVIDER", "gemini")
+    timeout = config.get("AI_TIMEOUT", 20)
+
+    if name == "stub":
+        return StubProvider(timeout=timeout, latency=config.get("AI_STUB_LATENCY", 0))
+    if name == "gemini":
+        return GeminiProvider(config.get("GEMINI_API_KEY"), timeout=timeout)
+    raise ValueError(f"Unknown AI_PROVIDER: {name}")
+
+
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """Return the application's long-lived AI provider."""
+    app = current_app._get_current_object()
+    with _provider_lock:
+        provider = app.extensions.get("ai_provider")
+        if provider is None:
+            provider = create_provider(app.config)
+            app.extensions["ai_provider"] = provider
+    return provider
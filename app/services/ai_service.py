@@ -2,25 +2,57 @@ import json
 import re
 import time
 
-import google.generativeai as genai
 from flask import current_app
 
+from app.services.ai_providers import get_provider, hedged_complete
 
-def configure_gemini():
-    """Configure Gemini AI with API key."""
-    api_key = current_app.config.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not configured")
-    genai.configure(api_key=api_key)
 
+def parse_slug_lines(text, num_options=5):
+    """Clean model output into at most num_options valid slugs."""
+    slugs = []
+    for line in text.split("\n"):
+        slug = line.strip()
+        # Clean and validate slug format
+        slug = re.sub(r"[^a-z0-9-]", "", slug.lower())
+        slug = re.sub(r"-+", "-", slug)
+        slug = slug.strip("-")
 
-def generate_slugs_with_thinking(title, description, content, num_options=5):
+        if slug and len(slug) <= 50:
+            slugs.append(slug)
+
+    return slugs[:num_options]
+
+
+def _complete_slug_prompt(prompt, num_options):
+    """
+    Run a plain slug prompt. With AI_HEDGE enabled the fast model is asked
+    first and the richer model joins after AI_HEDGE_DELAY seconds; the first
+    answer that parses into slugs wins.
+    """
+    config = current_app.config
+    provider = get_provider()
+    fast_model = config.get("AI_FAST_MODEL", "gemini-2.0-flash-lite")
+
+    if not config.get("AI_HEDGE", False):
+        return parse_slug_lines(provider.complete(prompt, fast_model), num_options)
+
+    text = hedged_complete(
+        provider,
+        prompt,
+        [fast_model, config.get("AI_RICH_MODEL", "gemini-2.5-flash")],
+        is_usable=lambda answer: bool(parse_slug_lines(answer, num_options)),
+        delay=config.get("AI_HEDGE_DELAY", 1.5),
+    )
+    return parse_slug_lines(text, num_options)
+
+
+def generate_slugs_with_thinking(
+    title, description, content, num_options=5, keywords=None
+):
     """
     Use Gemini AI to generate slug options with chain-of-thought streaming.
     Yields thinking messages and final slugs.
     """
-    configure_gemini()
-
     yield json.dumps(
         {
             "type": "thinking",
@@ -50,14 +82,13 @@ def generate_slugs_with_thinking(title, description, content, num_options=5):
     )
     time.sleep(1)
 
-    model = genai.GenerativeModel("gemini-2.0-flash-lite")
-
     prompt = f"""
         You are a URL slug generator. Based on the following webpage information, generate {num_options} short, descriptive, SEO-friendly URL slugs.
 
         Title: {title}
         Description: {description}
-        Content preview: {content[:1000]}
+        Keywords: {", ".join(keywords or [])}
+        Content summary: {content[:1000]}
 
         Requirements:
         - Maximum 50 characters
@@ -78,21 +109,7 @@ def generate_slugs_with_thinking(title, description, content, num_options=5):
             }
         )
 
-        response = model.generate_content(prompt)
-        slugs_text = response.text.strip()
-
-        slugs = []
-        for line in slugs_text.split("\n"):
-            slug = line.strip()
-
-            slug = re.sub(r"[^a-z0-9-]", "", slug.lower())
-            slug = re.sub(r"-+", "-", slug)
-            slug = slug.strip("-")
-
-            if slug and len(slug) <= 50:
-                slugs.append(slug)
-
-        valid_slugs = slugs[:num_options]
+        valid_slugs = _complete_slug_prompt(prompt, num_options)
 
         yield json.dumps(
             {
@@ -107,21 +124,23 @@ def generate_slugs_with_thinking(title, description, content, num_options=5):
         raise Exception(f"AI generation failed: {str(e)}") from e
 
 
-def generate_slugs_with_ai_thinking(title, description, content, num_options=5):
+def generate_slugs_with_ai_thinking(
+    title, description, content, num_options=5, keywords=None
+):
     """
     Use Gemini AI to generate slug options with REAL AI-generated chain-of-thought.
     This uses Gemini's streaming API to get actual AI reasoning.
     """
-    configure_gemini()
-
-    model = genai.GenerativeModel("gemini-2.5-flash")
+    provider = get_provider()
+    model = current_app.config.get("AI_RICH_MODEL", "gemini-2.5-flash")
 
     prompt = f"""
         You are a URL slug generator. I want you to think out loud about the webpage and then generate {num_options} short URL slugs.
 
         Title: {title}
         Description: {description}
-        Content preview: {content[:1000]}
+        Keywords: {", ".join(keywords or [])}
+        Content summary: {content[:1000]}
 
         Please follow this format:
         1. First, share your observations about what this page is about (2-3 sentences)
@@ -146,15 +165,13 @@ def generate_slugs_with_ai_thinking(title, description, content, num_options=5):
     """
 
     try:
-        response = model.generate_content(prompt, stream=True)
-
         full_response = ""
         thinking_shown = False
         keywords_shown = False
 
-        for chunk in response:
-            if chunk.text:
-                full_response += chunk.text
+        for chunk in provider.stream(prompt, model):
+            if chunk:
+                full_response += chunk
 
                 if (
                     "THINKING:" in full_response
@@ -196,19 +213,10 @@ def generate_slugs_with_ai_thinking(title, description, content, num_options=5):
             )
             time.sleep(1)
 
-        slugs = []
+        valid_slugs = []
         if "SLUGS:" in full_response:
             slugs_section = full_response.split("SLUGS:")[1].strip()
-            for line in slugs_section.split("\n"):
-                slug = line.strip()
-                slug = re.sub(r"[^a-z0-9-]", "", slug.lower())
-                slug = re.sub(r"-+", "-", slug)
-                slug = slug.strip("-")
-
-                if slug and len(slug) <= 50:
-                    slugs.append(slug)
-
-        valid_slugs = slugs[:num_options]
+            valid_slugs = parse_slug_lines(slugs_section, num_options)
 
         yield json.dumps(
             {
@@ -224,21 +232,20 @@ def generate_slugs_with_ai_thinking(title, description, content, num_options=5):
         raise Exception(f"AI generation failed: {str(e)}") from e
 
 
-def generate_slugs_from_content(title, description, content, num_options=5):
+def generate_slugs_from_content(
+    title, description, content, num_options=5, keywords=None
+):
     """
     Use Gemini AI to generate slug options based on webpage content.
     Returns list of slug strings.
     """
-    configure_gemini()
-
-    model = genai.GenerativeModel("gemini-2.0-flash-lite")
-
     prompt = f"""
         You are a URL slug generator. Based on the following webpage information, generate {num_options} short, descriptive, SEO-friendly URL slugs.
 
         Title: {title}
         Description: {description}
-        Content preview: {content[:1000]}
+        Keywords: {", ".join(keywords or [])}
+        Content summary: {content[:1000]}
 
         Requirements:
         - Maximum 50 characters
@@ -252,22 +259,101 @@ def generate_slugs_from_content(title, description, content, num_options=5):
     """
 
     try:
-        response = model.generate_content(prompt)
-        slugs_text = response.text.strip()
+        return _complete_slug_prompt(prompt, num_options)
+
+    except Exception as e:
+        raise Exception(f"AI generation failed: {str(e)}") from e
+
+
+def _parse_packed_response(text, count, num_options):
+    """
+    Parse a packed response of the form {"0": [...], "1": [...]}.
+    Returns one slug list per page, or None where the entry is missing or malformed.
+    """
+    text = text.strip()
+    # Models sometimes wrap JSON in a markdown code fence
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        data = json.loads(text[start : end + 1]) if start != -1 else {}
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    results = []
+    for index in range(count):
+        entry = data.get(str(index))
+        if isinstance(entry, list) and all(isinstance(s, str) for s in entry):
+            slugs = parse_slug_lines("\n".join(entry), num_options)
+            results.append(slugs or None)
+        else:
+            results.append(None)
+    return results
+
+
+def generate_slugs_for_pages(pages, num_options=5):
+    """
+    Generate slugs for several pages with a single model call.
+    `pages` is a list of dicts with title, description, content and keywords.
+    Returns a list of slug lists in the same order. Entries the model got
+    wrong are retried one page at a time.
+    """
+    if not pages:
+        return []
+
+    sections = []
+    for index, page in enumerate(pages):
+        sections.append(
+            f"""Page {index}
+        Title: {page.get("title", "")}
+        Description: {page.get("description", "")}
+        Keywords: {", ".join(page.get("keywords") or [])}
+        Content summary: {(page.get("content") or "")[:400]}"""
+        )
+    pages_text = "\n\n        ".join(sections)
+
+    prompt = f"""
+        You are a URL slug generator. For each of the {len(pages)} webpages below, generate {num_options} short, descriptive, SEO-friendly URL slugs.
 
-        # Parse slugs from response
-        slugs = []
-        for line in slugs_text.split("\n"):
-            slug = line.strip()
-            # Clean and validate slug format
-            slug = re.sub(r"[^a-z0-9-]", "", slug.lower())
-            slug = re.sub(r"-+", "-", slug)
-            slug = slug.strip("-")
+        {pages_text}
 
-            if slug and len(slug) <= 50:
-                slugs.append(slug)
+        Requirements for every slug:
+        - Maximum 50 characters
+        - Only lowercase letters (a-z), numbers (0-9), and hyphens (-)
+        - No leading or trailing hyphens
+        - No consecutive hyphens
+        - Descriptive and memorable
+        - Slugs for the same page should be semantically different
 
-        return slugs[:num_options]
+        Return ONLY a JSON object mapping each page number (as a string) to its list of slugs, e.g. {{"0": ["slug-one", "slug-two"], "1": ["another-slug"]}}.
+    """
 
+    provider = get_provider()
+    model = current_app.config.get("AI_FAST_MODEL", "gemini-2.0-flash-lite")
+    try:
+        text = provider.complete(prompt, model)
     except Exception as e:
-        raise Exception(f"AI generation failed: {str(e)}") from e
+        current_app.logger.warning(f"Packed slug generation failed: {str(e)}")
+        text = ""
+
+    results = _parse_packed_response(text, len(pages), num_options)
+
+    for index, slugs in enumerate(results):
+        if slugs is not None:
+            continue
+        page = pages[index]
+        try:
+            results[index] = generate_slugs_from_content(
+                page.get("title", ""),
+                page.get("description", ""),
+                page.get("content", ""),
+                num_options=num_options,
+                keywords=page.get("keywords"),
+            )
+        except Exception as e:
+            current_app.logger.warning(f"Slug generation failed for page: {str(e)}")
+            results[index] = []
+
+    return results
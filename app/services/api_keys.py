@@ -0,0 +1,205 @@
+import atexit
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import bindparam, func, or_, select, update
+
+from app import db
+from app.models.api_key import ApiKey
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bk_"
+PREFIX_BYTES = 6  # 12 hex characters, indexed for lookup
+SECRET_BYTES = 32
+# "read" covers GET/HEAD/OPTIONS requests, "write" everything else
+SCOPES = ("read", "write")
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+MAX_KEYS_PER_USER = 20
+MAX_NAME_LENGTH = 100
+
+_buffer_lock = threading.Lock()
+
+AuthenticatedKey = namedtuple("AuthenticatedKey", "id user_id scopes")
+
+
+def hash_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def is_api_key(token):
+    return token.startswith(KEY_PREFIX)
+
+
+def required_scope(method):
+    return "read" if method in READ_METHODS else "write"
+
+
+def parse_scopes(value):
+    """Validate requested scopes; defaults to read-only. Raises ValueError."""
+    if value is None:
+        return ["read"]
+    if not isinstance(value, list) or not value:
+        raise ValueError("scopes must be a non-empty list")
+    unknown = [scope for scope in value if scope not in SCOPES]
+    if unknown:
+        raise ValueError(f"Unknown scopes: {', '.join(map(str, unknown))}")
+    return [scope for scope in SCOPES if scope in value]
+
+
+def create_api_key(user_id, name, scopes):
+    """
+    Add a new key for a user to the session. Returns (api_key, key); the
+    plaintext key is only ever available here.
+    """
+    name = (name or "").strip()
+    if not name or len(name) > MAX_NAME_LENGTH:
+        raise ValueError(f"name must be 1-{MAX_NAME_LENGTH} characters")
+    count = db.session.scalar(
+        select(func.count()).select_from(ApiKey).where(ApiKey.user_id == user_id)
+    )
+    if count >= MAX_KEYS_PER_USER:
+        raise ValueError(f"At most {MAX_KEYS_PER_USER} API keys per account")
+
+    prefix = secrets.token_hex(PREFIX_BYTES)
+    key = f"{KEY_PREFIX}{prefix}_{secrets.token_urlsafe(SECRET_BYTES)}"
+    api_key = ApiKey(
+        user_id=user_id,
+        name=name,
+        prefix=prefix,
+        key_hash=hash_key(key),
+        scopes=" ".join(parse_scopes(scopes)),
+    )
+    db.session.add(api_key)
+    return api_key, key
+
+
+def serialize_api_key(api_key):
+    return {
+        "id": api_key.id,
+        "name": api_key.name,
+        "prefix": KEY_PREFIX + api_key.prefix,
+        "scopes": api_key.scopes.split(),
+        "created_at": api_key.created_at.isoformat() + "Z",
+        "last_used_at": api_key.last_used_at.isoformat() + "Z"
+        if api_key.last_used_at
+        else None,
+    }
+
+
+def authenticate_api_key(key):
+    """
+    The AuthenticatedKey for a presented key, or None. One indexed lookup
+    by prefix, then a constant-time comparison of hashes; the use is
+    recorded in the usage buffer rather than written now.
+    """
+    prefix, _, secret = key[len(KEY_PREFIX) :].partition("_")
+    if not prefix or not secret:
+        return None
+
+    row = db.session.execute(
+        select(ApiKey.id, ApiKey.user_id, ApiKey.key_hash, ApiKey.scopes).where(
+            ApiKey.prefix == prefix
+        )
+    ).first()
+    if row is None or not hmac.compare_digest(row.key_hash, hash_key(key)):
+        return None
+
+    get_usage_buffer().touch(row.id)
+    return AuthenticatedKey(row.id, row.user_id, frozenset(row.scopes.split()))
+
+
+class UsageBuffer:
+    """
+    Latest use of each API key, written to last_used_at in one batched
+    UPDATE per interval, so busy clients don't write a row on every call.
+    """
+
+    def __init__(self, app, interval=60):
+        self.app = app
+        self.interval = interval
+        self._used = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def touch(self, key_id):
+        with self._lock:
+            self._used[key_id] = datetime.utcnow()
+
+    def pending(self):
+        """Buffered last-use times by key id."""
+        with self._lock:
+            return dict(self._used)
+
+    def flush(self):
+        """Write buffered last-use times. Returns the number of keys written."""
+        with self._flush_lock:
+            with self._lock:
+                used, self._used = self._used, {}
+            if not used:
+                return 0
+
+            keys = ApiKey.__table__
+            try:
+                with self.app.app_context(), db.engine.begin() as conn:
+                    conn.execute(
+                        update(keys)
+                        .where(keys.c.id == bindparam("key_id"))
+                        # Another worker may have written a later use already
+                        .where(
+                            or_(
+                                keys.c.last_used_at.is_(None),
+                                keys.c.last_used_at < bindparam("used_at"),
+                            )
+                        )
+                        .values(last_used_at=bindparam("used_at")),
+                        [
+                            {"key_id": key_id, "used_at": used_at}
+                            for key_id, used_at in used.items()
+                        ],
+                    )
+                return len(used)
+            except Exception:
+                logger.exception("Failed to record use of %d API keys", len(used))
+                # Keep them for the next attempt unless a newer use arrived
+                with self._lock:
+                    for key_id, used_at in used.items():
+                        self._used.setdefault(key_id, used_at)
+                return 0
+
+    def start(self):
+        """Flush every `interval` seconds on a daemon thread."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="api-key-usage-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+def get_usage_buffer():
+    """Return the application's API key usage buffer, starting its flusher."""
+    app = current_app._get_current_object()
+    with _buffer_lock:
+        buffer = app.extensions.get("api_key_usage")
+        if buffer is None:
+            buffer = UsageBuffer(
+                app, interval=app.config.get("API_KEY_USAGE_FLUSH_INTERVAL", 60)
+            )
+            app.extensions["api_key_usage"] = buffer
+            buffer.start()
+            atexit.register(buffer.flush)
+    return buffer
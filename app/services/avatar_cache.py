@@ -0,0 +1,136 @@
+import contextlib
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class _ByteLRU:
+    """LRU of bytes values bounded by their total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, size):
+        """Store value and return the (key, value) pairs evicted for room."""
+        if key in self._data:
+            self.size -= self._data.pop(key)[1]
+        self._data[key] = (value, size)
+        self.size += size
+
+        evicted = []
+        while self.size > self.max_bytes and len(self._data) > 1:
+            old_key, (old_value, old_size) = self._data.popitem(last=False)
+            self.size -= old_size
+            evicted.append((old_key, old_value))
+        return evicted
+
+    def pop(self, key):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+        return item
+
+
+class AvatarCache:
+    """
+    Two-tier cache of avatar bytes keyed by blob name: a small in-memory LRU
+    in front of a larger LRU directory on local disk. Blob names are unique
+    per upload and never rewritten, so entries never go stale.
+    """
+
+    def __init__(self, memory_bytes, disk_dir=None, disk_bytes=0):
+        self._memory = _ByteLRU(memory_bytes)
+        self._disk = _ByteLRU(disk_bytes)
+        self.disk_dir = disk_dir if disk_bytes else None
+        self._lock = threading.Lock()
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _path(self, blob_name):
+        digest = hashlib.sha256(blob_name.encode()).hexdigest()
+        return os.path.join(self.disk_dir, digest)
+
+    def _load_disk_index(self):
+        """Index files left by earlier runs, oldest access first."""
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_atime, entry.path, stat.st_size))
+        for _, path, size in sorted(entries):
+            self._evict_files(self._disk.set(path, path, size))
+
+    def _evict_files(self, evicted):
+        for path, _ in evicted:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+    def get(self, blob_name):
+        """Return (data, content_type) from memory or disk, or None."""
+        with self._lock:
+            item = self._memory.get(blob_name)
+        if item is not None:
+            return item[0]
+
+        if not self.disk_dir:
+            return None
+
+        # Other workers share the directory, so look at the file itself
+        path = self._path(blob_name)
+        try:
+            with open(path, "rb") as f:
+                content_type, _, data = f.read().partition(b"\n")
+        except OSError:
+            with self._lock:
+                self._disk.pop(path)
+            return None
+
+        value = (data, content_type.decode())
+        with self._lock:
+            self._memory.set(blob_name, value, len(data))
+            evicted = self._disk.set(path, path, len(data))
+        self._evict_files(evicted)
+        return value
+
+    def set(self, blob_name, data, content_type):
+        with self._lock:
+            self._memory.set(blob_name, (data, content_type), len(data))
+
+        if not self.disk_dir:
+            return
+
+        path = self._path(blob_name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(content_type.encode() + b"\n" + data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write avatar cache file: %s", e)
+            return
+
+        with self._lock:
+            evicted = self._disk.set(path, path, len(data))
+        self._evict_files(evicted)
+
+    def delete(self, blob_name):
+        with self._lock:
+            self._memory.pop(blob_name)
+            if self.disk_dir:
+                self._disk.pop(self._path(blob_name))
+        if self.disk_dir:
+            self._evict_files([(self._path(blob_name), None)])
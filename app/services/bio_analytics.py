@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models.bio import BioLink
+from app.models.bio_click import BioLinkDailyStat
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 365
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def add_daily_clicks(conn, daily):
+    """
+    Add {(link_id, day): clicks} to the daily rollups with one
+    INSERT ... ON CONFLICT DO UPDATE executemany.
+    """
+    if not daily:
+        return
+    table = BioLinkDailyStat.__table__
+    insert = _UPSERT_DIALECTS[conn.dialect.name](table)
+    statement = insert.on_conflict_do_update(
+        index_elements=[table.c.bio_link_id, table.c.day],
+        set_={"clicks": table.c.clicks + insert.excluded.clicks},
+    )
+    conn.execute(
+        statement,
+        [
+            {"bio_link_id": link_id, "day": day, "clicks": clicks}
+            for (link_id, day), clicks in daily.items()
+        ],
+    )
+
+
+def get_page_analytics(page_id, days=DEFAULT_DAYS):
+    """
+    Clicks per day for a bio page and each of its links over the last
+    `days` UTC days, read from the daily rollups only.
+    """
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    stats = BioLinkDailyStat.__table__
+
+    rows = db.session.execute(
+        select(stats.c.bio_link_id, stats.c.day, stats.c.clicks)
+        .join(BioLink.__table__, BioLink.id == stats.c.bio_link_id)
+        .where(BioLink.bio_page_id == page_id, stats.c.day >= since)
+        .order_by(stats.c.day)
+    ).all()
+    links = db.session.execute(
+        select(BioLink.id, BioLink.title, BioLink.click_count)
+        .where(BioLink.bio_page_id == page_id)
+        .order_by(BioLink.position, BioLink.id)
+    ).all()
+
+    per_day = {}
+    per_link = {link.id: [] for link in links}
+    for row in rows:
+        per_day[row.day] = per_day.get(row.day, 0) + row.clicks
+        per_link[row.bio_link_id].append(
+            {"date": row.day.isoformat(), "count": row.clicks}
+        )
+
+    return {
+        "days": days,
+        "since": since.isoformat(),
+        "total_clicks": sum(per_day.values()),
+        "clicks_over_time": [
+            {"date": day.isoformat(), "count": count} for day, count in per_day.items()
+        ],
+        "links": [
+            {
+                "id": link.id,
+                "title": link.title,
+                "click_count": link.click_count,
+                "clicks": sum(point["count"] for point in per_link[link.id]),
+                "clicks_over_time": per_link[link.id],
+            }
+            for link in links
+        ],
+    }
+
+
+def parse_days(value):
+    """Clamp a ?days= argument to 1..MAX_DAYS. Raises ValueError if not a number."""
+    if value in (None, ""):
+        return DEFAULT_DAYS
+    return max(1, min(int(value), MAX_DAYS))
@@ -0,0 +1,43 @@
+import hashlib
+import threading
+
+from flask import current_app
+
+from app.services.cache import TTLCache
+
+_cache_lock = threading.Lock()
+
+
+def _get_cache():
+    app = current_app._get_current_object()
+    with _cache_lock:
+        cache = app.extensions.get("bio_page_cache")
+        if cache is None:
+            cache = TTLCache(
+                maxsize=app.config.get("BIO_PAGE_CACHE_SIZE", 1024),
+                ttl=app.config.get("BIO_PAGE_CACHE_TTL", 60),
+            )
+            app.extensions["bio_page_cache"] = cache
+    return cache
+
+
+def get_cached_bio_page(username):
+    """Return (html, etag) for a rendered bio page, or None."""
+    return _get_cache().get(username)
+
+
+def cache_bio_page(username, html):
+    """Store a rendered bio page and return its etag."""
+    etag = hashlib.sha256(html.encode()).hexdigest()[:32]
+    _get_cache().set(username, (html, etag))
+    return etag
+
+
+def invalidate_bio_page(*usernames):
+    """
+    Drop rendered pages after a bio mutation. Other workers keep their copy
+    until BIO_PAGE_CACHE_TTL runs out.
+    """
+    cache = _get_cache()
+    for username in usernames:
+        cache.delete(username)
@@ -0,0 +1,210 @@
+from sqlalchemy import case, delete, func, insert, select, update
+
+from app import db
+from app.models.bio import BioLink
+from app.models.bio_click import BioLinkClick, BioLinkDailyStat
+from app.services.social_platforms import detect_platform
+
+MAX_TITLE_LENGTH = 100
+MAX_OPERATIONS = 200
+
+
+class BioLinkNotFound(LookupError):
+    """An operation referenced a link that is not on the page."""
+
+
+def _classify(url):
+    # Core statements skip BioLink's url validator, so classify here
+    platform = detect_platform(url)
+    return {"social_platform": platform, "is_social": platform is not None}
+
+
+def serialize_link(link):
+    return {
+        "id": link.id,
+        "title": link.title,
+        "url": link.url,
+        "position": link.position,
+        "is_active": link.is_active,
+        "is_social": link.is_social,
+        "social_platform": link.social_platform,
+        "click_count": link.click_count,
+    }
+
+
+def _parse_operations(operations):
+    """
+    Validate a batch without touching the database.
+    Returns (creates, updates, delete_ids, order) or raises ValueError.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(f"At most {MAX_OPERATIONS} operations per batch")
+
+    creates, updates, delete_ids, order = [], {}, set(), None
+    for op in operations:
+        if not isinstance(op, dict):
+            raise ValueError("Each operation must be an object")
+        kind = op.get("op")
+
+        if kind == "create":
+            title = str(op.get("title", "")).strip()
+            url = str(op.get("url", "")).strip()
+            if not title or not url:
+                raise ValueError("Title and URL are required")
+            if len(title) > MAX_TITLE_LENGTH:
+                raise ValueError("Title must be 100 characters or less")
+            ref = op.get("ref")
+            if ref is not None and not isinstance(ref, str):
+                raise ValueError("ref must be a string")
+            creates.append({"ref": ref, "title": title, "url": url})
+
+        elif kind == "update":
+            link_id = op.get("id")
+            if not isinstance(link_id, int):
+                raise ValueError("update requires an integer id")
+            changes = updates.setdefault(link_id, {})
+            if "title" in op:
+                title = str(op["title"]).strip()
+                if not title:
+                    raise ValueError("Title cannot be empty")
+                changes["title"] = title[:MAX_TITLE_LENGTH]
+            if "url" in op:
+                url = str(op["url"]).strip()
+                if not url:
+                    raise ValueError("URL cannot be empty")
+                changes["url"] = url
+                changes.update(_classify(url))
+            if "is_active" in op:
+                changes["is_active"] = bool(op["is_active"])
+
+        elif kind == "delete":
+            if not isinstance(op.get("id"), int):
+                raise ValueError("delete requires an integer id")
+            delete_ids.add(op["id"])
+
+        elif kind == "reorder":
+            order = op.get("ids")
+            if not isinstance(order, list):
+                raise ValueError("reorder requires an ids list")
+
+        else:
+            raise ValueError(f"Unknown operation: {kind}")
+
+    return creates, updates, delete_ids, order
+
+
+def set_link_positions(page_id, positions):
+    """
+    Apply {link_id: position} with one UPDATE ... CASE. Ids that are not on
+    the page are left alone; returns the number of links moved.
+    """
+    if not positions:
+        return 0
+    table = BioLink.__table__
+    result = db.session.execute(
+        update(table)
+        .where(table.c.bio_page_id == page_id, table.c.id.in_(positions))
+        .values(position=case(positions, value=table.c.id))
+    )
+    return result.rowcount
+
+
+def delete_link_clicks(link_ids):
+    """
+    Delete the click events and daily rollups of links about to be deleted,
+    with one statement per table. link_ids is a list or a select of ids.
+    The foreign keys cascade too, but SQLite only enforces them on request.
+    """
+    for child in (BioLinkClick.__table__, BioLinkDailyStat.__table__):
+        db.session.execute(delete(child).where(child.c.bio_link_id.in_(link_ids)))
+
+
+def apply_link_operations(page_id, operations):
+    """
+    Apply a batch of create/update/delete/reorder operations to a page's
+    links inside the caller's transaction. Deletes run first, then updates,
+    creates (appended in order) and finally the reorder, whose ids may also
+    name a create's "ref". The statement count is the same for 1 link or 200.
+
+    Returns (links, created) where created maps refs to new link ids.
+    Raises ValueError for malformed input and BioLinkNotFound for ids that
+    are not on the page.
+    """
+    creates, updates, delete_ids, order = _parse_operations(operations)
+    table = BioLink.__table__
+    on_page = table.c.bio_page_id == page_id
+
+    if delete_ids:
+        delete_link_clicks(
+            select(table.c.id).where(on_page, table.c.id.in_(delete_ids))
+        )
+        result = db.session.execute(
+            delete(table).where(on_page, table.c.id.in_(delete_ids))
+        )
+        if result.rowcount != len(delete_ids):
+            raise BioLinkNotFound("Link not found")
+
+    updates = {link_id: changes for link_id, changes in updates.items() if changes}
+    if updates:
+        if delete_ids & updates.keys():
+            raise ValueError("Cannot update a link that is being deleted")
+        values = {}
+        for column in ("title", "url", "social_platform", "is_social", "is_active"):
+            mapping = {
+                link_id: changes[column]
+                for link_id, changes in updates.items()
+                if column in changes
+            }
+            if mapping:
+                values[column] = case(mapping, value=table.c.id, else_=table.c[column])
+        result = db.session.execute(
+            update(table).where(on_page, table.c.id.in_(updates)).values(values)
+        )
+        if result.rowcount != len(updates):
+            raise BioLinkNotFound("Link not found")
+
+    created = {}
+    if creates:
+        start = db.session.scalar(
+            select(func.count()).select_from(table).where(on_page)
+        )
+        rows = [
+            {
+                "bio_page_id": page_id,
+                "title": item["title"],
+                "url": item["url"],
+                "position": start + index,
+                **_classify(item["url"]),
+            }
+            for index, item in enumerate(creates)
+        ]
+        # Positions are unique within the batch, so they identify the new
+        # rows without forcing insertmanyvalues into row-at-a-time ordering.
+        inserted = db.session.execute(
+            insert(table).returning(table.c.id, table.c.position), rows
+        )
+        new_ids = {position: link_id for link_id, position in inserted}
+        created = {
+            item["ref"]: new_ids[start + index]
+            for index, item in enumerate(creates)
+            if item["ref"] is not None
+        }
+
+    if order is not None:
+        try:
+            ids = [created[i] if i in created else int(i) for i in order]
+        except (TypeError, ValueError) as e:
+            raise ValueError("reorder ids must be link ids or create refs") from e
+        positions = {link_id: index for index, link_id in enumerate(ids)}
+        if set_link_positions(page_id, positions) != len(positions):
+            raise BioLinkNotFound("Link not found")
+
+    links = db.session.scalars(
+        select(BioLink)
+        .where(BioLink.bio_page_id == page_id)
+        .order_by(BioLink.position, BioLink.id)
+        .execution_options(populate_existing=True)
+    ).all()
+    return links, created
@@ -0,0 +1,289 @@
+import csv
+import io
+import logging
+import re
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.url import URL
+from app.services.slug_generator import fetch_page_metadata, suggest_slugs_batch
+from app.services.url_validator import validate_url
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ["original_url", "short_url", "slug", "status", "error"]
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class BulkJob:
+    """A bulk shortening run over a list of URLs, with per-URL results."""
+
+    def __init__(self, user_id, urls, host_url):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.urls = urls
+        self.host_url = host_url
+        self.status = "queued"
+        self.results = []
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def add_result(self, original_url, slug=None, error=None):
+        with self._lock:
+            self.results.append(
+                {
+                    "original_url": original_url,
+                    "short_url": self.host_url + slug if slug else "",
+                    "slug": slug or "",
+                    "status": "created" if slug else "failed",
+                    "error": error or "",
+                }
+            )
+
+    def to_dict(self):
+        with self._lock:
+            succeeded = sum(1 for r in self.results if r["status"] == "created")
+            processed = len(self.results)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": len(self.urls),
+            "processed": processed,
+            "succeeded": succeeded,
+            "failed": processed - succeeded,
+            "results_url": f"/api/bulk-jobs/{self.id}/results.csv",
+        }
+
+    def results_csv(self):
+        """Yield the results as CSV text, one row at a time."""
+        with self._lock:
+            results = list(self.results)
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.getvalue():
+            yield buffer.getvalue()
+
+
+def parse_url_list(csv_text):
+    """
+    Extract URLs from CSV text. Uses the "url" column when there is a header
+    row, otherwise the first column.
+    """
+    rows = list(csv.reader(io.StringIO(csv_text)))
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    column = 0
+    if "url" in header:
+        column = header.index("url")
+        rows = rows[1:]
+
+    return [
+        row[column].strip() for row in rows if len(row) > column and row[column].strip()
+    ]
+
+
+def _fallback_slug(title):
+    """Readable slug from the page title with a random suffix."""
+    words = re.findall(r"[a-z0-9]+", (title or "").lower())[:3] or ["link"]
+    return f"{'-'.join(words)[:40]}-{secrets.token_hex(3)}"
+
+
+def _prepare_url(url, app):
+    """Validate and scrape one URL. Runs on the pool."""
+    with app.app_context():
+        is_valid, error_message, normalized_url = validate_url(url)
+        if not is_valid:
+            return {"original_url": url, "error": error_message}
+
+        scraped_data = fetch_page_metadata(normalized_url)
+        if not scraped_data["success"]:
+            # Still shorten the link, just without AI suggestions
+            return {"original_url": normalized_url, "candidates": [], "title": ""}
+
+        return {
+            "original_url": normalized_url,
+            "scraped_data": scraped_data,
+            "candidates": [],
+            "title": scraped_data.get("title", ""),
+        }
+
+
+def _suggest_pack(pack, app):
+    """Fill in slug candidates for a pack of scraped pages with one AI call."""
+    with app.app_context():
+        try:
+            suggestions = suggest_slugs_batch(
+                [(item["original_url"], item["scraped_data"]) for item in pack]
+            )
+        except Exception as e:
+            logger.warning("Bulk slug suggestion failed: %s", e)
+            return
+        for item, slugs in zip(pack, suggestions, strict=True):
+            item["candidates"] = slugs or []
+
+
+def _insert_one(job, url_obj):
+    """Insert a single link, retrying with a fresh fallback slug on collision."""
+    for _ in range(3):
+        db.session.add(url_obj)
+        try:
+            db.session.commit()
+            job.add_result(url_obj.original_url, slug=url_obj.slug)
+            return
+        except IntegrityError:
+            db.session.rollback()
+            url_obj = URL(
+                original_url=url_obj.original_url,
+                slug=_fallback_slug(url_obj.slug),
+                user_id=url_obj.user_id,
+                title=url_obj.title,
+            )
+    job.add_result(url_obj.original_url, error="Could not allocate a slug")
+
+
+def _create_links(job, prepared):
+    """Pick the best available slug per URL and insert the chunk in one batch."""
+    candidates = {slug for item in prepared for slug in item.get("candidates", [])}
+    taken = set()
+    if candidates:
+        taken = {
+            slug
+            for (slug,) in db.session.query(URL.slug).filter(URL.slug.in_(candidates))
+        }
+
+    new_urls = []
+    for item in prepared:
+        if item.get("error"):
+            job.add_result(item["original_url"], error=item["error"])
+            continue
+
+        slug = next(
+            (c for c in item["candidates"] if c not in taken),
+            None,
+        ) or _fallback_slug(item["title"])
+        taken.add(slug)
+        new_urls.append(
+            URL(
+                original_url=item["original_url"],
+                slug=slug,
+                user_id=job.user_id,
+                title=item.get("title"),
+            )
+        )
+
+    if not new_urls:
+        return
+
+    db.session.add_all(new_urls)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A slug was claimed concurrently; fall back to row-by-row inserts
+        db.session.rollback()
+        for url_obj in new_urls:
+            _insert_one(
+                job,
+                URL(
+                    original_url=url_obj.original_url,
+                    slug=url_obj.slug,
+                    user_id=url_obj.user_id,
+                    title=url_obj.title,
+                ),
+            )
+        return
+
+    for url_obj in new_urls:
+        job.add_result(url_obj.original_url, slug=url_obj.slug)
+
+
+def _run_bulk_job(job, app):
+    """
+    Process a job chunk by chunk: scrape in parallel, ask the model for slugs
+    AI_PACK_SIZE pages at a time, then batch insert.
+    """
+    job.status = "running"
+    batch_size = app.config.get("BULK_INSERT_BATCH", 100)
+    concurrency = app.config.get("BULK_SCRAPE_CONCURRENCY", 8)
+    pack_size = max(app.config.get("AI_PACK_SIZE", 8), 1)
+
+    try:
+        with (
+            app.app_context(),
+            ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="bulk-scrape"
+            ) as pool,
+        ):
+            for start in range(0, len(job.urls), batch_size):
+                chunk = job.urls[start : start + batch_size]
+                prepared = list(pool.map(lambda url: _prepare_url(url, app), chunk))
+
+                # Several pages share each model call
+                scraped = [item for item in prepared if item.get("scraped_data")]
+                packs = [
+                    scraped[i : i + pack_size]
+                    for i in range(0, len(scraped), pack_size)
+                ]
+                list(pool.map(lambda pack: _suggest_pack(pack, app), packs))
+
+                _create_links(job, prepared)
+        job.status = "done"
+    except Exception:
+        logger.exception("Bulk job %s failed", job.id)
+        job.status = "failed"
+    finally:
+        job.finished_at = time.monotonic()
+
+
+def _get_executor(app):
+    """Return the bulk job pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("BULK_JOB_WORKERS", 2),
+                thread_name_prefix="bulk-job",
+            )
+        return _executor
+
+
+def start_bulk_job(user_id, urls, host_url, app):
+    """Queue a bulk shortening job and return it."""
+    job = BulkJob(user_id, urls, host_url)
+
+    with _jobs_lock:
+        cutoff = time.monotonic() - app.config.get("BULK_JOB_RETENTION", 24 * 3600)
+        for job_id in [
+            job_id
+            for job_id, existing in _jobs.items()
+            if existing.finished_at is not None and existing.finished_at < cutoff
+        ]:
+            del _jobs[job_id]
+        _jobs[job.id] = job
+
+    _get_executor(app).submit(_run_bulk_job, job, app)
+    return job
+
+
+def get_bulk_job(job_id):
+    """Look up a bulk job by id. Returns None if unknown or expired."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
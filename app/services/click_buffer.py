@@ -0,0 +1,189 @@
+import atexit
+import logging
+import threading
+from collections import Counter, namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from flask import current_app
+from sqlalchemy import bindparam, insert, select, update
+
+from app import db
+from app.models.bio import BioLink
+from app.models.bio_click import BioLinkClick
+from app.services.analytics_service import parse_device_info
+from app.services.bio_analytics import add_daily_clicks
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_buffer_lock = threading.Lock()
+_known_links_lock = threading.Lock()
+
+
+ClickEvent = namedtuple("ClickEvent", "link_id clicked_at ip_hash referrer user_agent")
+
+
+def _write_clicks(conn, events):
+    links = BioLink.__table__
+    counts = Counter(event.link_id for event in events)
+    # Links deleted since the click have nothing to count against
+    known = set(conn.scalars(select(links.c.id).where(links.c.id.in_(counts))))
+    events = [event for event in events if event.link_id in known]
+    if not events:
+        return 0
+
+    conn.execute(
+        update(links)
+        .where(links.c.id == bindparam("link_id"))
+        .values(click_count=links.c.click_count + bindparam("clicks")),
+        [{"link_id": link_id, "clicks": counts[link_id]} for link_id in known],
+    )
+
+    parse_device = lru_cache(maxsize=256)(parse_device_info)
+    rows = []
+    for event in events:
+        device_type, browser = parse_device(event.user_agent)
+        rows.append(
+            {
+                "bio_link_id": event.link_id,
+                "clicked_at": event.clicked_at,
+                "ip_hash": event.ip_hash,
+                "referrer": event.referrer,
+                "device_type": device_type,
+                "browser": browser,
+            }
+        )
+    conn.execute(insert(BioLinkClick.__table__), rows)
+
+    add_daily_clicks(
+        conn, Counter((event.link_id, event.clicked_at.date()) for event in events)
+    )
+    return len(known)
+
+
+def _known_links():
+    app = current_app._get_current_object()
+    with _known_links_lock:
+        cache = app.extensions.get("bio_link_ids")
+        if cache is None:
+            cache = TTLCache(
+                maxsize=app.config.get("BIO_LINK_ID_CACHE_SIZE", 10000),
+                ttl=app.config.get("BIO_LINK_ID_CACHE_TTL", 300),
+            )
+            app.extensions["bio_link_ids"] = cache
+    return cache
+
+
+def link_exists(link_id):
+    """
+    Whether a bio link id is real. Hits are cached so repeat clicks skip the
+    database; misses are not, so a newly created link is never refused.
+    """
+    cache = _known_links()
+    if cache.get(link_id):
+        return True
+    exists = db.session.scalar(select(BioLink.id).where(BioLink.id == link_id))
+    if exists is None:
+        return False
+    cache.set(link_id, True)
+    return True
+
+
+class ClickBuffer:
+    """
+    In-memory bio link clicks, written to the database in batches: atomic
+    click_count increments, the raw click events and the daily rollups, all
+    in one transaction instead of one read-modify-write per click.
+
+    At most max_pending clicks are held; beyond that they are dropped and
+    counted in `dropped`, so a stalled database can't exhaust memory.
+    """
+
+    def __init__(self, app, interval=5, max_pending=10000):
+        self.app = app
+        self.interval = interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._events = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def record(self, link_id, ip_hash=None, referrer=None, user_agent=None):
+        """Buffer a click. Returns False if the buffer was full and it was dropped."""
+        event = ClickEvent(link_id, datetime.utcnow(), ip_hash, referrer, user_agent)
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                self.dropped += 1
+                accepted = False
+            else:
+                self._events.append(event)
+                accepted = True
+            full = len(self._events) >= self.max_pending
+        if full:
+            self._wake.set()
+        return accepted
+
+    def pending(self):
+        """Buffered click counts by link id."""
+        with self._lock:
+            return dict(Counter(event.link_id for event in self._events))
+
+    def flush(self):
+        """Write buffered clicks. Returns the number of links updated."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+
+            try:
+                with self.app.app_context(), db.engine.begin() as conn:
+                    return _write_clicks(conn, events)
+            except Exception:
+                logger.exception("Failed to flush %d bio link clicks", len(events))
+                # Keep the clicks for the next attempt, within the cap
+                with self._lock:
+                    self._events[:0] = events
+                    overflow = len(self._events) - self.max_pending
+                    if overflow > 0:
+                        del self._events[:overflow]
+                        self.dropped += overflow
+                if overflow > 0:
+                    logger.warning("Dropped %d buffered bio link clicks", overflow)
+                return 0
+
+    def start(self):
+        """Flush every `interval` seconds on a daemon thread."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="bio-click-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+def get_click_buffer():
+    """Return the application's click buffer, starting its flusher on first use."""
+    app = current_app._get_current_object()
+    with _buffer_lock:
+        buffer = app.extensions.get("bio_click_buffer")
+        if buffer is None:
+            buffer = ClickBuffer(
+                app,
+                interval=app.config.get("BIO_CLICK_FLUSH_INTERVAL", 5),
+                max_pending=app.config.get("BIO_CLICK_MAX_PENDING", 10000),
+            )
+            app.extensions["bio_click_buffer"] = buffer
+            buffer.start()
+            # Don't lose the last few seconds of clicks on shutdown
+            atexit.register(buffer.flush)
+    return buffer
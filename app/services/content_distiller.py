@@ -0,0 +1,189 @@
+import json
+import re
+
+CHARS_PER_TOKEN = 4
+
+# Elements that never hold the main content of a page
+_BOILERPLATE_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "nav",
+    "footer",
+    "header",
+    "aside",
+    "form",
+    "button",
+    "iframe",
+]
+
+# class/id fragments of cookie banners, menus and other chrome
+_BOILERPLATE_HINTS = re.compile(
+    r"cookie|consent|gdpr|banner|menu|navbar|sidebar|footer|subscribe|newsletter"
+    r"|modal|popup|share|social|comment|related|promo|advert|breadcrumb",
+    re.IGNORECASE,
+)
+
+# Hints that mark chrome even when a content hint also matches, as in
+# class="cookie-consent-content"
+_ALWAYS_BOILERPLATE_HINTS = re.compile(r"cookie|consent|gdpr", re.IGNORECASE)
+
+_CONTENT_HINTS = re.compile(
+    r"article|content|entry|main|post|story|text|body", re.IGNORECASE
+)
+
+
+def _meta(soup, **attrs):
+    tag = soup.find("meta", attrs=attrs)
+    if tag and tag.get("content"):
+        return tag["content"].strip()
+    return ""
+
+
+def _json_ld_items(soup):
+    """Yield every JSON-LD object on the page, flattening @graph lists."""
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            item = stack.pop(0)
+            if not isinstance(item, dict):
+                continue
+            if isinstance(item.get("@graph"), list):
+                stack.extend(item["@graph"])
+            yield item
+
+
+def _as_keywords(value):
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if isinstance(value, str):
+        return [k.strip() for k in value.split(",") if k.strip()]
+    return []
+
+
+def extract_metadata(soup):
+    """
+    Collect structured metadata: Open Graph, Twitter cards, meta keywords and
+    JSON-LD headline/description/keywords. Must run before scripts are removed.
+    """
+    metadata = {
+        "title": _meta(soup, property="og:title") or _meta(soup, name="twitter:title"),
+        "description": _meta(soup, property="og:description")
+        or _meta(soup, name="description")
+        or _meta(soup, name="twitter:description"),
+        "keywords": _as_keywords(_meta(soup, name="keywords")),
+    }
+
+    for item in _json_ld_items(soup):
+        headline = item.get("headline") or item.get("name")
+        if not metadata["title"] and isinstance(headline, str):
+            metadata["title"] = headline.strip()
+        description = item.get("description")
+        if not metadata["description"] and isinstance(description, str):
+            metadata["description"] = description.strip()
+        metadata["keywords"].extend(_as_keywords(item.get("keywords")))
+
+    # Keep the first occurrence of each keyword
+    unique = {}
+    for keyword in metadata["keywords"]:
+        unique.setdefault(keyword.lower(), keyword)
+    metadata["keywords"] = list(unique.values())
+    return metadata
+
+
+def _strip_boilerplate(soup):
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.attrs is None:
+            continue
+        hints = " ".join(tag.get("class", [])) + " " + (tag.get("id") or "")
+        if tag.name in ("html", "body", "main", "article"):
+            continue
+        if _ALWAYS_BOILERPLATE_HINTS.search(hints) or (
+            _BOILERPLATE_HINTS.search(hints) and not _CONTENT_HINTS.search(hints)
+        ):
+            tag.decompose()
+
+
+def _score_block(block):
+    """Readability-style score: paragraph text, commas, minus link density."""
+    paragraphs = block.find_all(["p", "li", "blockquote", "pre"])
+    text = " ".join(p.get_text(" ", strip=True) for p in paragraphs)
+    if len(text) < 25:
+        return 0, text
+
+    link_text = sum(len(a.get_text(strip=True)) for a in block.find_all("a"))
+    link_density = link_text / max(len(text), 1)
+
+    score = len(text) / 100 + text.count(",")
+    hints = " ".join(block.get("class", [])) + " " + (block.get("id") or "")
+    if block.name in ("article", "main") or _CONTENT_HINTS.search(hints):
+        score += 25
+    return score * (1 - min(link_density, 0.9)), text
+
+
+def main_content_text(soup):
+    """Return the text of the block that most looks like the main content."""
+    _strip_boilerplate(soup)
+
+    best_score, best_text = 0, ""
+    for block in soup.find_all(["article", "main", "section", "div"]):
+        score, text = _score_block(block)
+        if score > best_score:
+            best_score, best_text = score, text
+
+    if not best_text:
+        body = soup.body or soup
+        best_text = body.get_text(separator=" ", strip=True)
+    return re.sub(r"\s+", " ", best_text).strip()
+
+
+def truncate_to_budget(text, token_budget):
+    """Cut text to roughly token_budget tokens, preferring sentence boundaries."""
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    boundary = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+    if boundary > max_chars // 2:
+        return cut[: boundary + 1]
+    return cut.rsplit(" ", 1)[0]
+
+
+def distill_page(soup, token_budget=200):
+    """
+    Reduce a parsed page to compact prompt material: metadata first, then a
+    token-budgeted summary of the main content. Mutates the soup.
+    Returns dict with title, description, keywords and content.
+    """
+    metadata = extract_metadata(soup)
+
+    title = metadata["title"]
+    if not title and soup.title and soup.title.string:
+        title = soup.title.string.strip()
+    if not title and soup.find("h1"):
+        title = soup.find("h1").get_text().strip()
+
+    description = metadata["description"]
+    keywords = metadata["keywords"][:10]
+
+    # Whatever the title and description already say needs no repeating
+    remaining = token_budget - (len(title) + len(description)) // CHARS_PER_TOKEN
+    content = truncate_to_budget(main_content_text(soup), max(remaining, 50))
+
+    return {
+        "title": title,
+        "description": description,
+        "keywords": keywords,
+        "content": content,
+    }
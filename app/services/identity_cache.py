@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+
+import jwt
+from flask import current_app
+from flask_login import UserMixin
+from sqlalchemy import inspect
+
+from app import db
+from app.models.user import User
+from app.services.cache import TTLCache
+from app.services.session_hooks import apply_on_commit
+
+# Columns copied into Identity; changing one drops the cached copy
+IDENTITY_FIELDS = ("email", "is_subadmin", "password_hash")
+_cache_lock = threading.Lock()
+
+
+class Identity(UserMixin):
+    """Read-only snapshot of the user fields request handlers rely on."""
+
+    def __init__(self, id, email, is_subadmin):
+        self.id = id
+        self.email = email
+        self.is_subadmin = is_subadmin
+
+    def __repr__(self):
+        return f"<Identity {self.email}>"
+
+
+def _get_cache():
+    app = current_app._get_current_object()
+    with _cache_lock:
+        cache = app.extensions.get("identity_cache")
+        if cache is None:
+            cache = TTLCache(
+                maxsize=app.config.get("IDENTITY_CACHE_SIZE", 10000),
+                ttl=app.config.get("IDENTITY_CACHE_TTL", 60),
+            )
+            app.extensions["identity_cache"] = cache
+    return cache
+
+
+def jwt_secret():
+    return current_app.config["SECRET_KEY"]
+
+
+def get_identity(user_id):
+    """
+    Identity for a user id, or None if there is no such user. Cached until
+    a commit changes one of IDENTITY_FIELDS or deletes the user, or for
+    IDENTITY_CACHE_TTL seconds.
+    """
+    cache = _get_cache()
+    identity = cache.get(("user", user_id))
+    if identity is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        identity = Identity(user.id, user.email, user.is_subadmin)
+        cache.set(("user", user_id), identity)
+    return identity
+
+
+def identity_for_token(token):
+    """
+    Identity for a bearer JWT. Raises jwt.InvalidTokenError (or its
+    ExpiredSignatureError subclass) for a bad token. A verified token is
+    remembered by hash until it expires, so repeat calls skip decoding.
+    """
+    cache = _get_cache()
+    key = ("token", hashlib.sha256(token.encode()).hexdigest())
+    user_id = cache.get(key)
+    if user_id is None:
+        payload = jwt.decode(token, jwt_secret(), algorithms=["HS256"])
+        user_id = payload["user_id"]
+        ttl = cache.ttl
+        if "exp" in payload:
+            ttl = min(ttl, payload["exp"] - time.time())
+        if ttl > 0:
+            cache.set(key, user_id, ttl=ttl)
+    return get_identity(user_id)
+
+
+def _changed_users(session):
+    """Users whose cached identity this flush invalidated."""
+    changed = [obj.id for obj in session.deleted if isinstance(obj, User)]
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[field].history.has_changes() for field in IDENTITY_FIELDS):
+            changed.append(obj.id)
+    return changed
+
+
+def _invalidate_identities(user_ids):
+    cache = current_app.extensions.get("identity_cache")
+    if cache is None:
+        return
+    for user_id in set(user_ids):
+        cache.delete(("user", user_id))
+
+
+apply_on_commit("identity_changes", _changed_users, _invalidate_identities)
@@ -0,0 +1,88 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+AVATAR_SIZES = (96, 192, 512)
+DEFAULT_AVATAR_SIZE = 192
+FALLBACK_SIZE = 192
+VARIANTS = [(size, "webp") for size in AVATAR_SIZES] + [(FALLBACK_SIZE, "jpg")]
+
+ALLOWED_FORMATS = {"JPEG", "PNG", "GIF", "WEBP"}
+MAX_PIXELS = 40_000_000
+CHUNK_SIZE = 64 * 1024
+
+
+def read_upload(stream, max_size):
+    """Read an upload in chunks, giving up as soon as it exceeds max_size."""
+    buffer = BytesIO()
+    while chunk := stream.read(CHUNK_SIZE):
+        buffer.write(chunk)
+        if buffer.tell() > max_size:
+            raise ValueError(
+                f"Image too large. Maximum size: {max_size // (1024 * 1024)}MB"
+            )
+    return buffer.getvalue()
+
+
+def variant_name(blob_name, size, fmt):
+    """Blob name of a resized variant, stored next to the original."""
+    stem = blob_name.rsplit(".", 1)[0]
+    return f"{stem}_{size}.{fmt}"
+
+
+def pick_variant(blob_name, size, accepts_webp):
+    """
+    Name of the variant to serve for a requested display size: the smallest
+    WebP at least that large, or the JPEG fallback for older clients.
+    """
+    if not accepts_webp:
+        return variant_name(blob_name, FALLBACK_SIZE, "jpg")
+    fitting = [s for s in AVATAR_SIZES if s >= size] or [AVATAR_SIZES[-1]]
+    return variant_name(blob_name, fitting[0], "webp")
+
+
+def build_avatar_variants(data):
+    """
+    Decode an uploaded image once and return {(size, fmt): bytes} with
+    square WebP renditions at each AVATAR_SIZES and a JPEG fallback.
+    Raises ValueError for anything that is not a supported image.
+    """
+    try:
+        image = Image.open(BytesIO(data))
+        if image.format not in ALLOWED_FORMATS:
+            raise ValueError(f"Unsupported image format: {image.format}")
+        if image.width * image.height > MAX_PIXELS:
+            raise ValueError("Image dimensions too large")
+        image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ValueError("Could not read image") from e
+
+    # Animated GIFs keep their first frame
+    image = ImageOps.exif_transpose(image)
+    # Palette images mark a transparent colour in info rather than a band
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    # Crop to a centred square once; each size is scaled from the next larger
+    side = min(image.width, image.height, AVATAR_SIZES[-1])
+    current = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+
+    variants = {}
+    for size in sorted(AVATAR_SIZES, reverse=True):
+        if current.width > size:
+            current = current.resize((size, size), Image.Resampling.LANCZOS)
+
+        output = BytesIO()
+        current.save(output, "WEBP", quality=80, method=4)
+        variants[(size, "webp")] = output.getvalue()
+
+        if size == FALLBACK_SIZE:
+            flat = current
+            if current.mode == "RGBA":
+                flat = Image.new("RGB", current.size, "white")
+                flat.paste(current, mask=current.getchannel("A"))
+            output = BytesIO()
+            flat.save(output, "JPEG", quality=85, optimize=True, progressive=True)
+            variants[(size, "jpg")] = output.getvalue()
+
+    return variants
@@ -0,0 +1,59 @@
+import threading
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app import db
+from app.models.url import URL
+from app.services.cache import TTLCache
+from app.services.session_hooks import apply_on_commit
+
+_cache_lock = threading.Lock()
+
+
+def _get_cache():
+    app = current_app._get_current_object()
+    with _cache_lock:
+        cache = app.extensions.get("link_count_cache")
+        if cache is None:
+            cache = TTLCache(
+                maxsize=app.config.get("LINK_COUNT_CACHE_SIZE", 10000),
+                ttl=app.config.get("LINK_COUNT_CACHE_TTL", 300),
+            )
+            app.extensions["link_count_cache"] = cache
+    return cache
+
+
+def get_link_count(user_id):
+    """
+    Number of links a user owns. Cached until a commit creates or deletes
+    one of their links, or for LINK_COUNT_CACHE_TTL seconds.
+    """
+    cache = _get_cache()
+    count = cache.get(user_id)
+    if count is None:
+        count = db.session.scalar(
+            select(func.count()).select_from(URL).where(URL.user_id == user_id)
+        )
+        cache.set(user_id, count)
+    return count
+
+
+def _link_owners(session):
+    """Users whose link count this flush changed."""
+    return [
+        obj.user_id
+        for obj in (*session.new, *session.deleted)
+        if isinstance(obj, URL) and obj.user_id is not None
+    ]
+
+
+def _invalidate_link_counts(user_ids):
+    cache = current_app.extensions.get("link_count_cache")
+    if cache is None:
+        return
+    for user_id in set(user_ids):
+        cache.delete(user_id)
+
+
+apply_on_commit("link_count_users", _link_owners, _invalidate_link_counts)
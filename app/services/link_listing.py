@@ -0,0 +1,114 @@
+import base64
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import func, or_, tuple_
+
+from app.models.url import DESTINATION_PREFIX_LENGTH, URL
+
+LinkPage = namedtuple("LinkPage", "links next_cursor prev_cursor")
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(url):
+    """Opaque cursor pointing just past `url` in newest-first order."""
+    raw = f"{url.created_at.isoformat()}|{url.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return (created_at, id) from a cursor. Raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, url_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(url_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _destination_prefixes(prefix):
+    if "://" in prefix:
+        return [prefix]
+    return [
+        f"{scheme}{www}{prefix}"
+        for scheme in ("https://", "http://")
+        for www in ("", "www.")
+    ]
+
+
+def _like_prefix(column, prefix):
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.like(escaped + "%", escape="\\")
+
+
+def search_filter(prefix):
+    """
+    Links whose slug or destination starts with `prefix`. Plain LIKE 'x%'
+    patterns so PostgreSQL can use the *_pattern_ops prefix indexes.
+    """
+    destination = func.substr(URL.original_url, 1, DESTINATION_PREFIX_LENGTH)
+    return or_(
+        _like_prefix(URL.slug, prefix.lower()),
+        *(
+            _like_prefix(destination, candidate[:DESTINATION_PREFIX_LENGTH])
+            for candidate in _destination_prefixes(prefix)
+        ),
+    )
+
+
+def list_user_links(
+    user_id,
+    limit=DEFAULT_PAGE_SIZE,
+    cursor=None,
+    before=None,
+    prefix=None,
+    exclude_slugs=(),
+):
+    """
+    One page of a user's links, newest first, using keyset pagination on
+    (created_at, id) so deep pages cost the same as the first. Pass the
+    previous page's next_cursor as `cursor`, or its prev_cursor as `before`.
+    Returns a LinkPage; a cursor is None when there is nothing that way.
+    """
+    key = tuple_(URL.created_at, URL.id)
+    query = URL.query.filter(URL.user_id == user_id)
+    if prefix:
+        query = query.filter(search_filter(prefix))
+    if exclude_slugs:
+        query = query.filter(URL.slug.not_in(exclude_slugs))
+
+    if before:
+        # Walk backwards from the cursor, then flip into display order
+        rows = (
+            query.filter(key > decode_cursor(before))
+            .order_by(URL.created_at, URL.id)
+            .limit(limit + 1)
+            .all()
+        )
+        links = rows[:limit][::-1]
+        has_newer, has_older = len(rows) > limit, True
+    else:
+        if cursor:
+            query = query.filter(key < decode_cursor(cursor))
+        rows = (
+            query.order_by(URL.created_at.desc(), URL.id.desc()).limit(limit + 1).all()
+        )
+        links = rows[:limit]
+        has_newer, has_older = bool(cursor), len(rows) > limit
+
+    if not links:
+        return LinkPage([], None, None)
+    return LinkPage(
+        links,
+        encode_cursor(links[-1]) if has_older else None,
+        encode_cursor(links[0]) if has_newer else None,
+    )
+
+
+def parse_limit(value):
+    """Clamp a ?limit= argument to 1..MAX_PAGE_SIZE. Raises ValueError if not a number."""
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
@@ -0,0 +1,115 @@
+import re
+
+from flask import current_app
+from sqlalchemy import inspect, text
+
+from app import db
+from app.models.url import URL
+from app.services.link_listing import search_filter
+
+DEFAULT_RESULTS = 20
+MAX_RESULTS = 100
+# Ranked results past this depth aren't worth paging to
+MAX_OFFSET = 1000
+
+
+def search_terms(query):
+    """Lowercased word tokens of a search box query."""
+    return re.findall(r"\w+", (query or "").lower())[:8]
+
+
+def _sqlite_ids(user_id, terms, limit, offset):
+    # Ranked in tiers, slug matches first, then title, then destination only,
+    # newest first within a tier. bm25() over every match of a common word
+    # cost more than twice as much on a 100k-link account (see benchmarks).
+    words = " AND ".join(f'"{term}"*' for term in terms)
+    owner = f'user_id : "{user_id}"'
+    return db.session.scalars(
+        text(
+            "SELECT rowid FROM ("
+            " SELECT rowid, 0 AS tier FROM urls_fts WHERE urls_fts MATCH :slug"
+            " UNION ALL"
+            " SELECT rowid, 1 FROM urls_fts WHERE urls_fts MATCH :title"
+            " UNION ALL"
+            " SELECT rowid, 2 FROM urls_fts WHERE urls_fts MATCH :destination"
+            ") ORDER BY tier, rowid DESC LIMIT :limit OFFSET :offset"
+        ),
+        {
+            "slug": f"{owner} AND slug : ({words})",
+            "title": f"{owner} AND {{slug title}} : ({words}) NOT slug : ({words})",
+            "destination": f"{owner} AND {{slug original_url title}} : ({words}) "
+            f"NOT {{slug title}} : ({words})",
+            "limit": limit,
+            "offset": offset,
+        },
+    ).all()
+
+
+def _postgresql_ids(user_id, terms, limit, offset):
+    return db.session.scalars(
+        text(
+            "SELECT id FROM urls, to_tsquery('simple', :query) AS query "
+            "WHERE user_id = :user_id AND search_vector @@ query "
+            "ORDER BY ts_rank(search_vector, query) DESC, id DESC "
+            "LIMIT :limit OFFSET :offset"
+        ),
+        {
+            "query": " & ".join(f"{term}:*" for term in terms),
+            "user_id": user_id,
+            "limit": limit,
+            "offset": offset,
+        },
+    ).all()
+
+
+def _fallback_ids(user_id, terms, limit, offset):
+    # Databases without a text index get prefix matching, newest first
+    query = URL.query.filter(URL.user_id == user_id)
+    for term in terms:
+        query = query.filter(search_filter(term))
+    rows = query.order_by(URL.created_at.desc(), URL.id.desc())
+    return [url.id for url in rows.limit(limit).offset(offset)]
+
+
+def _get_searcher():
+    """
+    Ranked search over the text index migration 5e2d7b9c4a18 builds
+    (urls_fts on SQLite, urls.search_vector on PostgreSQL), or prefix
+    matching where it hasn't run.
+    """
+    app = current_app._get_current_object()
+    searcher = app.extensions.get("link_searcher")
+    if searcher is None:
+        inspector = inspect(db.engine)
+        dialect = db.engine.dialect.name
+        searcher = _fallback_ids
+        if dialect == "sqlite" and inspector.has_table("urls_fts"):
+            searcher = _sqlite_ids
+        elif dialect == "postgresql" and any(
+            column["name"] == "search_vector"
+            for column in inspector.get_columns("urls")
+        ):
+            searcher = _postgresql_ids
+        app.extensions["link_searcher"] = searcher
+    return searcher
+
+
+def search_user_links(user_id, query, limit=DEFAULT_RESULTS, offset=0):
+    """
+    A user's links matching every word of `query` as a prefix of a word in
+    the slug, destination or stored page title, best match first: links
+    whose slug matches, then their title, then only their destination.
+    Returns (links, next_offset); next_offset is None after the last page.
+    """
+    terms = search_terms(query)
+    if not terms or offset >= MAX_OFFSET:
+        return [], None
+
+    ids = _get_searcher()(user_id, terms, limit + 1, offset)
+    more = len(ids) > limit
+    ids = ids[:limit]
+
+    by_id = {url.id: url for url in URL.query.filter(URL.id.in_(ids))}
+    links = [by_id[url_id] for url_id in ids if url_id in by_id]
+    next_offset = offset + limit if more and offset + limit < MAX_OFFSET else None
+    return links, next_offset
@@ -0,0 +1,181 @@
+import hashlib
+import io
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import BytesIO
+
+import qrcode
+
+from app.services.cache import TTLCache
+
+QR_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+DEFAULT_BOX_SIZE = 10
+MIN_BOX_SIZE = 2
+MAX_BOX_SIZE = 40
+
+# slug -> {(short_url, box_size, fmt): (data, etag)}, so a slug's variants
+# can be dropped together when it changes
+_qr_cache = TTLCache(maxsize=2048, ttl=24 * 3600)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _qr_matrix(short_url):
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=1,
+        border=4,
+    )
+    qr.add_data(short_url)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def _render_png(short_url, box_size):
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=4,
+    )
+    qr.add_data(short_url)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+    img_io = BytesIO()
+    img.save(img_io, "PNG")
+    return img_io.getvalue()
+
+
+def _render_svg(short_url, box_size):
+    """Write the module matrix as one path, merging horizontal runs."""
+    matrix = _qr_matrix(short_url)
+    size = len(matrix)
+
+    path = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < size and row[x]:
+                x += 1
+            path.append(f"M{start},{y}h{x - start}v1h-{x - start}z")
+
+    pixels = size * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" '
+        f'height="{pixels}" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path d="{"".join(path)}" fill="#000"/></svg>'
+    ).encode()
+
+
+def render_qr_code(short_url, box_size=DEFAULT_BOX_SIZE, fmt="png"):
+    """Render a QR code for the URL as PNG or SVG bytes."""
+    if fmt == "svg":
+        return _render_svg(short_url, box_size)
+    return _render_png(short_url, box_size)
+
+
+def get_qr_code(slug, short_url, box_size=DEFAULT_BOX_SIZE, fmt="png"):
+    """
+    Return (data, etag) for a link's QR code, rendering it only on a cache
+    miss. The output depends on nothing but the arguments.
+    """
+    variants = _qr_cache.get(slug)
+    if variants is None:
+        variants = {}
+        _qr_cache.set(slug, variants)
+
+    key = (short_url, box_size, fmt)
+    cached = variants.get(key)
+    if cached is None:
+        data = render_qr_code(short_url, box_size, fmt)
+        cached = (data, hashlib.sha1(data).hexdigest())
+        variants[key] = cached
+    return cached
+
+
+def invalidate_qr_codes(slug):
+    """Forget every cached QR code for a slug."""
+    _qr_cache.delete(slug)
+
+
+def get_export_executor(app):
+    """Return the QR export render pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("QR_EXPORT_WORKERS", 4),
+                thread_name_prefix="qr-export",
+            )
+        return _executor
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink for ZipFile that hands back whatever was written."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_qr_zip(
+    slugs, host_url, executor, window=8, box_size=DEFAULT_BOX_SIZE, fmt="png"
+):
+    """
+    Yield a ZIP archive of QR codes for the given slugs, chunk by chunk.
+    At most `window` renders are in flight on the executor, and each entry
+    is written as soon as its render finishes, so memory stays flat.
+    """
+    sink = _ZipStream()
+    # PNG is already compressed; SVG text shrinks a lot
+    compression = zipfile.ZIP_DEFLATED if fmt == "svg" else zipfile.ZIP_STORED
+    pending = deque()
+    slugs = iter(slugs)
+
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=compression) as archive:
+            while True:
+                for slug in slugs:
+                    future = executor.submit(
+                        render_qr_code, host_url + slug, box_size, fmt
+                    )
+                    pending.append((slug, future))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+
+                wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[1].done()]:
+                    pending.remove(item)
+                    slug, future = item
+                    archive.writestr(f"qrcode-{slug}.{fmt}", future.result())
+                    yield sink.drain()
+
+        yield sink.drain()
+    finally:
+        # Client went away mid-download
+        for _, future in pending:
+            future.cancel()
@@ -0,0 +1,31 @@
+from flask import has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def apply_on_commit(key, collect, apply):
+    """
+    Keep a per-process structure in step with this worker's commits.
+
+    After each flush, collect(session) returns the changes it saw; they
+    accumulate in session.info[key]. After a commit, apply(changes) runs if
+    there is an app context. A rollback discards them. Other workers'
+    commits never reach this process, so each caller also needs a TTL or
+    periodic reload.
+    """
+
+    @event.listens_for(Session, "after_flush")
+    def collect_changes(session, flush_context):
+        changes = collect(session)
+        if changes:
+            session.info.setdefault(key, []).extend(changes)
+
+    @event.listens_for(Session, "after_commit")
+    def apply_changes(session):
+        changes = session.info.pop(key, None)
+        if changes and has_app_context():
+            apply(changes)
+
+    @event.listens_for(Session, "after_rollback")
+    def discard_changes(session):
+        session.info.pop(key, None)
@@ -0,0 +1,104 @@
+import threading
+
+from flask import current_app
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.slug_sequence import SlugSequence
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CODE_LENGTH = 6
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+
+# Coprime with CODE_SPACE, so multiplying by it permutes the code space and
+# consecutive sequence values map to unrelated-looking codes.
+_SCRAMBLE = 1_580_030_173
+
+SEQUENCE_NAME = "urls"
+
+
+def encode_base62(value, length=CODE_LENGTH):
+    """Encode a non-negative integer as a fixed-length base62 string."""
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[remainder])
+    return "".join(reversed(chars))
+
+
+def code_for(value):
+    """Map a sequence value to its short code. Distinct values give distinct codes."""
+    return encode_base62((value * _SCRAMBLE) % CODE_SPACE)
+
+
+class SlugAllocator:
+    """
+    Issues unique short codes without querying for collisions.
+
+    Each process reserves a block of sequence values from the slug_sequences
+    table in one statement, then hands them out from memory. Codes without
+    an uppercase letter are skipped, so they can never clash with AI or
+    custom slugs, which are lowercase.
+    """
+
+    def __init__(self, block_size=1000):
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def allocate(self):
+        with self._lock:
+            while True:
+                if self._next >= self._end:
+                    self._reserve_block()
+                code = code_for(self._next)
+                self._next += 1
+                if any(char.isupper() for char in code):
+                    return code
+
+    def _reserve_block(self):
+        """Claim the next block_size values in a transaction of its own."""
+        table = SlugSequence.__table__
+        with db.engine.begin() as conn:
+            end = conn.execute(
+                update(table)
+                .where(table.c.name == SEQUENCE_NAME)
+                .values(next_value=table.c.next_value + self.block_size)
+                .returning(table.c.next_value)
+            ).scalar()
+
+            if end is None:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(
+                            insert(table).values(
+                                name=SEQUENCE_NAME, next_value=self.block_size
+                            )
+                        )
+                    end = self.block_size
+                except IntegrityError:
+                    # Another worker created the row first
+                    end = conn.execute(
+                        update(table)
+                        .where(table.c.name == SEQUENCE_NAME)
+                        .values(next_value=table.c.next_value + self.block_size)
+                        .returning(table.c.next_value)
+                    ).scalar()
+
+        if end >= CODE_SPACE:
+            raise RuntimeError("Short code space exhausted")
+        self._next, self._end = end - self.block_size, end
+
+
+def get_allocator():
+    """Return the application's slug allocator."""
+    app = current_app._get_current_object()
+    allocator = app.extensions.get("slug_allocator")
+    if allocator is None:
+        allocator = app.extensions.setdefault(
+            "slug_allocator",
+            SlugAllocator(block_size=app.config.get("SLUG_ALLOCATOR_BLOCK", 1000)),
+        )
+    return allocator
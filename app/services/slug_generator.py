@@ -4,11 +4,70 @@ from flask import current_app
 
 from app.models.url import URL
 from app.services.ai_service import (
+    generate_slugs_for_pages,
     generate_slugs_with_ai_thinking,
     generate_slugs_with_thinking,
 )
+from app.services.cache import TTLCache
+from app.services.url_cleaner import normalize_destination
 from app.services.web_scraper import scrape_webpage
 
+# Scraped metadata and AI suggestions, keyed by normalized destination
+_page_cache = TTLCache(maxsize=4096)
+_suggestion_cache = TTLCache(maxsize=4096)
+
+
+def fetch_page_metadata(url):
+    """Scrape a page, reusing a recent successful scrape of the same destination."""
+    key = normalize_destination(url)
+    scraped_data = _page_cache.get(key)
+    if scraped_data is not None:
+        return scraped_data
+
+    scraped_data = scrape_webpage(url)
+    if scraped_data["success"]:
+        _page_cache.set(
+            key, scraped_data, ttl=current_app.config.get("PAGE_CACHE_TTL", 3600)
+        )
+    return scraped_data
+
+
+def cached_page_title(url):
+    """Title from a recent scrape of this destination, without fetching it."""
+    scraped_data = _page_cache.get(normalize_destination(url))
+    return (scraped_data or {}).get("title") or None
+
+
+def remember_suggestions(url, slugs):
+    """Cache AI slug suggestions for a destination, keeping earlier ones first."""
+    key = normalize_destination(url)
+    merged = list(_suggestion_cache.get(key, []))
+    merged.extend(slug for slug in slugs if slug not in merged)
+    _suggestion_cache.set(
+        key, merged, ttl=current_app.config.get("PAGE_CACHE_TTL", 3600)
+    )
+
+
+def suggest_slugs_batch(pages, num_options=5):
+    """
+    Return AI slug suggestions for several scraped pages without streaming
+    progress. `pages` is a list of (url, scraped_data) pairs. Cached
+    suggestions are reused and the rest are packed into one AI call.
+    """
+    results = [_suggestion_cache.get(normalize_destination(url)) for url, _ in pages]
+    missing = [index for index, slugs in enumerate(results) if not slugs]
+
+    if missing:
+        generated = generate_slugs_for_pages(
+            [pages[index][1] for index in missing], num_options=num_options
+        )
+        for index, slugs in zip(missing, generated, strict=True):
+            results[index] = slugs
+            if slugs:
+                remember_suggestions(pages[index][0], slugs)
+
+    return results
+
 
 def generate_slug_options(url):
     """
@@ -21,7 +80,7 @@ def generate_slug_options(url):
     yield json.dumps(
         {"status": "progress", "message": "🌐 Fetching webpage content..."}
     )
-    scraped_data = scrape_webpage(url)
+    scraped_data = fetch_page_metadata(url)
 
     if not scraped_data["success"]:
         error_type = scraped_data.get("error_type", "unknown")
@@ -55,6 +114,7 @@ def generate_slug_options(url):
                 scraped_data["description"],
                 scraped_data["content"],
                 num_options=options_per_batch,
+                keywords=scraped_data.get("keywords"),
             ):
                 update_data = json.loads(ai_update)
 
@@ -68,6 +128,8 @@ def generate_slug_options(url):
             if not ai_slugs:
                 continue
 
+            remember_suggestions(url, ai_slugs)
+
             # Check availability
             yield json.dumps(
                 {
@@ -0,0 +1,235 @@
+import bisect
+import logging
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+
+from app import db
+from app.models.url import URL
+from app.services.session_hooks import apply_on_commit
+
+logger = logging.getLogger(__name__)
+
+SLUG_PATTERN = r"^[a-z0-9-]+$"
+MAX_SLUG_LENGTH = 50
+
+
+class SlugIndex:
+    """
+    Sorted in-memory list of every slug in use, searchable by prefix.
+
+    Commits made by this process are applied as they happen; a periodic
+    reload picks up slugs written by other workers.
+    """
+
+    def __init__(self, refresh_interval=300):
+        self.refresh_interval = refresh_interval
+        self._slugs = []
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # Changes applied while a reload's query runs, replayed onto its result
+        self._pending = None
+
+    @property
+    def is_loaded(self):
+        return self._loaded_at is not None
+
+    @property
+    def is_stale(self):
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.refresh_interval
+        )
+
+    def load(self, slugs):
+        slugs = set(slugs)
+        with self._lock:
+            for action, slug in self._pending or ():
+                if action == "add":
+                    slugs.add(slug)
+                else:
+                    slugs.discard(slug)
+            self._pending = None
+            self._slugs = sorted(slugs)
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, fetch):
+        """
+        Reload from fetch(), waiting for any reload already in progress and
+        skipping this one if that left the index fresh.
+        """
+        self._refresh_lock.acquire()
+        if not self.is_stale:
+            self._refresh_lock.release()
+            return
+        self._reload(fetch)
+
+    def refresh_in_background(self, fetch):
+        """
+        Reload from fetch() on a daemon thread while callers keep reading
+        the current copy. Returns False if a reload is already running.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        threading.Thread(
+            target=self._reload_logging_errors,
+            args=(fetch,),
+            name="slug-index-refresh",
+            daemon=True,
+        ).start()
+        return True
+
+    def _reload(self, fetch):
+        """Run with _refresh_lock held; releases it."""
+        try:
+            with self._lock:
+                self._pending = []
+            try:
+                slugs = fetch()
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            self.load(slugs)
+        finally:
+            self._refresh_lock.release()
+
+    def _reload_logging_errors(self, fetch):
+        try:
+            self._reload(fetch)
+        except Exception:
+            # Still stale, so the next request starts another attempt
+            logger.exception("Failed to reload the slug index")
+
+    def add(self, slug):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("add", slug))
+            index = bisect.bisect_left(self._slugs, slug)
+            if index == len(self._slugs) or self._slugs[index] != slug:
+                self._slugs.insert(index, slug)
+
+    def discard(self, slug):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("discard", slug))
+            index = bisect.bisect_left(self._slugs, slug)
+            if index < len(self._slugs) and self._slugs[index] == slug:
+                del self._slugs[index]
+
+    def __contains__(self, slug):
+        with self._lock:
+            index = bisect.bisect_left(self._slugs, slug)
+            return index < len(self._slugs) and self._slugs[index] == slug
+
+    def __len__(self):
+        with self._lock:
+            return len(self._slugs)
+
+    def with_prefix(self, prefix, limit=10):
+        """Return up to `limit` slugs starting with prefix, in sorted order."""
+        with self._lock:
+            index = bisect.bisect_left(self._slugs, prefix)
+            matches = []
+            while (
+                index < len(self._slugs)
+                and len(matches) < limit
+                and self._slugs[index].startswith(prefix)
+            ):
+                matches.append(self._slugs[index])
+                index += 1
+            return matches
+
+    def suggest(self, slug, count=3):
+        """Nearest free variants of a slug: slug-2, slug-3, ..."""
+        base = slug.strip("-")[: MAX_SLUG_LENGTH - 4] or "link"
+        # One range scan finds every numbered variant already taken
+        taken = set(self.with_prefix(f"{base}-", limit=1000))
+        suggestions = []
+        number = 2
+        while len(suggestions) < count and number < 1000:
+            candidate = f"{base}-{number}"
+            if candidate not in taken:
+                suggestions.append(candidate)
+            number += 1
+        return suggestions
+
+
+def _reserved_paths(app):
+    """First path segments of the app's own routes, which shadow slugs."""
+    reserved = set()
+    for rule in app.url_map.iter_rules():
+        segment = rule.rule.lstrip("/").split("/", 1)[0]
+        if segment and "<" not in segment:
+            reserved.add(segment)
+    return reserved
+
+
+def _all_slugs(app):
+    return [*db.session.scalars(select(URL.slug)), *_reserved_paths(app)]
+
+
+def _fetch_in_background(app):
+    def fetch():
+        with app.app_context():
+            return _all_slugs(app)
+
+    return fetch
+
+
+def get_slug_index():
+    """
+    Return the application's slug index. The first call loads it; later,
+    when it goes stale, one background thread reloads it while requests
+    keep answering from the current copy.
+    """
+    app = current_app._get_current_object()
+    index = app.extensions.get("slug_index")
+    if index is None:
+        index = app.extensions.setdefault(
+            "slug_index",
+            SlugIndex(refresh_interval=app.config.get("SLUG_INDEX_REFRESH", 300)),
+        )
+
+    if not index.is_loaded:
+        index.refresh(lambda: _all_slugs(app))
+    elif index.is_stale:
+        index.refresh_in_background(_fetch_in_background(app))
+    return index
+
+
+@event.listens_for(URL.slug, "set", active_history=True)
+def _load_previous_slug(target, value, oldvalue, initiator):
+    """Registered with active_history so a rename's history includes the old slug."""
+    return value
+
+
+def _slug_changes(session):
+    """Slugs added or removed by this flush, in order."""
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, URL):
+            changes.append(("add", obj.slug))
+    for obj in session.dirty:
+        if isinstance(obj, URL):
+            history = inspect(obj).attrs.slug.history
+            changes.extend(("discard", slug) for slug in history.deleted or ())
+            changes.extend(("add", slug) for slug in history.added or ())
+    for obj in session.deleted:
+        if isinstance(obj, URL):
+            changes.append(("discard", obj.slug))
+    return changes
+
+
+def _apply_slug_changes(changes):
+    index = current_app.extensions.get("slug_index")
+    if index is None:
+        return
+    for action, slug in changes:
+        getattr(index, action)(slug)
+
+
+apply_on_commit("slug_index_changes", _slug_changes, _apply_slug_changes)
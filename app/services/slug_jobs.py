@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.slug_generator import generate_slug_options
+from app.services.url_cleaner import normalize_destination
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_INTERVAL = 15
+
+_jobs = {}
+_inflight = {}
+_registry_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class JobQueueFull(Exception):
+    """Raised when too many slug jobs are already queued or running."""
+
+
+class SlugJob:
+    """
+    A slug generation running on the job pool, shared by every caller asking
+    for the same URL. Progress events are numbered and kept in a ring buffer
+    so subscribers can detach and resume from the last event they saw.
+    """
+
+    def __init__(self, key, url, buffer_size=100):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.url = url
+        self.status = "queued"
+        self.finished_at = None
+        self.events = deque(maxlen=buffer_size)
+        self.last_event_id = 0
+        self._condition = threading.Condition()
+        self._listeners = set()
+
+    @property
+    def done(self):
+        return self.status == "done"
+
+    def publish(self, event):
+        """Record a progress event and wake up every subscriber."""
+        with self._condition:
+            self.last_event_id += 1
+            self.events.append((self.last_event_id, event))
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def finish(self):
+        """Mark the job as complete so subscribers stop waiting."""
+        with self._condition:
+            self.status = "done"
+            self.finished_at = time.monotonic()
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def events_after(self, last_event_id=0):
+        """Return buffered (event_id, event) pairs newer than last_event_id."""
+        with self._condition:
+            return [item for item in self.events if item[0] > last_event_id]
+
+    def stream(self, last_event_id=0, keepalive=KEEPALIVE_INTERVAL, window=None):
+        """
+        Yield (event_id, event) pairs newer than last_event_id as they arrive.
+        Yields None when nothing arrived within `keepalive` seconds. Stops when
+        the job is done or after `window` seconds so the caller can detach.
+        """
+        deadline = time.monotonic() + window if window else None
+
+        while True:
+            with self._condition:
+                if self.last_event_id <= last_event_id and not self.done:
+                    timeout = keepalive
+                    if deadline:
+                        timeout = max(0, min(timeout, deadline - time.monotonic()))
+                    self._condition.wait(timeout=timeout)
+                pending = [item for item in self.events if item[0] > last_event_id]
+                finished = self.done
+
+            if pending:
+                yield from pending
+                last_event_id = pending[-1][0]
+            elif finished:
+                return
+            else:
+                yield None
+
+            if deadline and time.monotonic() >= deadline:
+                return
+
+    async def astream(self, last_event_id=0, keepalive=KEEPALIVE_INTERVAL):
+        """
+        Async counterpart of stream() for the ASGI serving path. Waiting
+        subscribers hold no thread; the worker wakes them through the loop.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def listener():
+            loop.call_soon_threadsafe(wake.set)
+
+        with self._condition:
+            self._listeners.add(listener)
+        try:
+            while True:
+                wake.clear()
+                pending = self.events_after(last_event_id)
+                if pending:
+                    for item in pending:
+                        yield item
+                    last_event_id = pending[-1][0]
+                    continue
+                if self.done:
+                    return
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=keepalive)
+                except TimeoutError:
+                    yield None
+        finally:
+            with self._condition:
+                self._listeners.discard(listener)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "last_event_id": self.last_event_id,
+        }
+
+
+def _get_executor(app):
+    """Return the dedicated worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("SLUG_JOB_WORKERS", 4),
+                thread_name_prefix="slug-job",
+            )
+        return _executor
+
+
+def _prune_finished(retention):
+    """Forget finished jobs older than the retention window."""
+    cutoff = time.monotonic() - retention
+    expired = [
+        job_id
+        for job_id, job in _jobs.items()
+        if job.finished_at is not None and job.finished_at < cutoff
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _run_job(job, app):
+    """Run the generation for a job inside an application context."""
+    job.status = "running"
+    try:
+        with app.app_context():
+            for update in generate_slug_options(job.url):
+                job.publish(update)
+    except Exception as e:
+        logger.exception("Slug generation failed for %s", job.url)
+        job.publish(
+            json.dumps(
+                {
+                    "status": "error",
+                    "message": f"AI generation error: {str(e)}. Please try again.",
+                    "error_type": "ai_error",
+                }
+            )
+        )
+    finally:
+        with _registry_lock:
+            if _inflight.get(job.key) is job:
+                del _inflight[job.key]
+        job.finish()
+
+
+def get_or_start_job(url, app):
+    """
+    Return the in-flight job for this URL, queueing one if none is running.
+    Concurrent callers with equivalent URLs share a single scrape and AI call.
+    Raises JobQueueFull when the pool already has too many pending jobs.
+    """
+    key = normalize_destination(url)
+
+    with _registry_lock:
+        _prune_finished(app.config.get("SLUG_JOB_RETENTION", 300))
+
+        job = _inflight.get(key)
+        if job is not None:
+            return job
+
+        if len(_inflight) >= app.config.get("SLUG_JOB_MAX_PENDING", 100):
+            raise JobQueueFull("Too many slug generations in progress")
+
+        job = SlugJob(key, url, buffer_size=app.config.get("SLUG_JOB_BUFFER", 100))
+        _inflight[key] = job
+        _jobs[job.id] = job
+
+    _get_executor(app).submit(_run_job, job, app)
+    return job
+
+
+def get_job(job_id):
+    """Look up a job by id. Returns None if unknown or expired."""
+    with _registry_lock:
+        return _jobs.get(job_id)
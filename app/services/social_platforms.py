@@ -0,0 +1,50 @@
+from urllib.parse import urlsplit
+
+# Registrable host -> platform. Subdomains (www., m., ...) match by suffix.
+SOCIAL_HOSTS = {
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "linkedin.com": "linkedin",
+    "github.com": "github",
+    "instagram.com": "instagram",
+    "facebook.com": "facebook",
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+    "tiktok.com": "tiktok",
+    "discord.gg": "discord",
+    "discord.com": "discord",
+    "t.me": "telegram",
+    "wa.me": "whatsapp",
+    "whatsapp.com": "whatsapp",
+    "snapchat.com": "snapchat",
+    "reddit.com": "reddit",
+    "pinterest.com": "pinterest",
+    "twitch.tv": "twitch",
+    "medium.com": "medium",
+}
+
+SOCIAL_PLATFORMS = frozenset(SOCIAL_HOSTS.values())
+
+
+def _hostname(url):
+    if "://" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url.strip()).hostname
+    except ValueError:
+        return None
+    return host.rstrip(".") if host else None
+
+
+def detect_platform(url):
+    """
+    Social platform a URL points at, or None. Walks the hostname's suffixes
+    ("m.youtube.com", "youtube.com", "com") against SOCIAL_HOSTS.
+    """
+    host = _hostname(url or "")
+    while host:
+        platform = SOCIAL_HOSTS.get(host)
+        if platform:
+            return platform
+        _, _, host = host.partition(".")
+    return None
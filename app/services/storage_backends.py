@@ -0,0 +1,123 @@
+import contextlib
+import mimetypes
+import os
+import threading
+
+from google.api_core.exceptions import NotFound
+from google.cloud import storage
+
+
+class StorageBackend:
+    """
+    Where uploaded files live. Subclasses implement save, load and delete;
+    backends that keep files on local disk also return a path from
+    local_path so they can be served straight from the filesystem.
+    """
+
+    # Remote backends benefit from the local avatar cache
+    cache_locally = False
+
+    def save(self, name, data, content_type):
+        raise NotImplementedError
+
+    def load(self, name):
+        """Return (data, content_type), or (None, None) if missing."""
+        raise NotImplementedError
+
+    def delete(self, name):
+        raise NotImplementedError
+
+    def local_path(self, name):
+        """Filesystem path of an existing file, if the backend has one."""
+        return None
+
+
+class GCSBackend(StorageBackend):
+    """Google Cloud Storage bucket, with one long-lived client."""
+
+    cache_locally = True
+
+    def __init__(self, bucket_name, project=None):
+        self.bucket_name = bucket_name
+        self.project = project
+        self._bucket = None
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self):
+        with self._lock:
+            if self._bucket is None:
+                client = storage.Client(project=self.project)
+                self._bucket = client.bucket(self.bucket_name)
+            return self._bucket
+
+    def save(self, name, data, content_type):
+        self.bucket.blob(name).upload_from_string(data, content_type=content_type)
+
+    def load(self, name):
+        blob = self.bucket.blob(name)
+        try:
+            data = blob.download_as_bytes()
+        except NotFound:
+            return None, None
+        return data, blob.content_type or mimetypes.guess_type(name)[0]
+
+    def delete(self, name):
+        with contextlib.suppress(NotFound):
+            self.bucket.blob(name).delete()
+
+
+class LocalBackend(StorageBackend):
+    """Files in a local directory; content types come from the extension."""
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, name):
+        path = os.path.realpath(os.path.join(self.root, name))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Invalid storage path: {name}")
+        return path
+
+    def save(self, name, data, content_type):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load(self, name):
+        path = self.local_path(name)
+        if not path:
+            return None, None
+        with open(path, "rb") as f:
+            return f.read(), mimetypes.guess_type(name)[0]
+
+    def delete(self, name):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path(name))
+
+    def local_path(self, name):
+        try:
+            path = self._path(name)
+        except ValueError:
+            return None
+        return path if os.path.isfile(path) else None
+
+
+def create_backend(config, default_local_dir="uploads"):
+    """
+    Build the backend selected by STORAGE_BACKEND ("gcs" or "local").
+    Returns None when GCS is selected but no bucket is configured.
+    """
+    name = config.get("STORAGE_BACKEND", "gcs")
+
+    if name == "local":
+        return LocalBackend(config.get("LOCAL_STORAGE_DIR") or default_local_dir)
+    if name == "gcs":
+        if not config.get("GCS_BUCKET_NAME"):
+            return None
+        return GCSBackend(config["GCS_BUCKET_NAME"], config.get("GCS_PROJECT_ID"))
+    raise ValueError(f"Unknown STORAGE_BACKEND: {name}")
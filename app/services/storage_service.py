@@ -1,19 +1,59 @@
 import logging
+import mimetypes
+import os
+import tempfile
+import threading
 import uuid
 
 from flask import current_app
-from google.cloud import storage
+
+from app.services.avatar_cache import AvatarCache
+from app.services.image_pipeline import VARIANTS, build_avatar_variants, variant_name
+from app.services.storage_backends import create_backend
 
 logger = logging.getLogger(__name__)
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+VARIANT_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+
+_extensions_lock = threading.Lock()
+
+
+def get_storage_backend():
+    """Return the application's storage backend, or None if unconfigured."""
+    app = current_app._get_current_object()
+    with _extensions_lock:
+        if "storage_backend" not in app.extensions:
+            app.extensions["storage_backend"] = create_backend(
+                app.config, os.path.join(app.instance_path, "uploads")
+            )
+        return app.extensions["storage_backend"]
+
+
+def get_avatar_cache():
+    """Return the application's avatar byte cache."""
+    app = current_app._get_current_object()
+    with _extensions_lock:
+        cache = app.extensions.get("avatar_cache")
+        if cache is None:
+            cache = AvatarCache(
+                memory_bytes=app.config.get("AVATAR_MEMORY_CACHE_BYTES", 16 << 20),
+                disk_dir=app.config.get("AVATAR_DISK_CACHE_DIR")
+                or os.path.join(tempfile.gettempdir(), "briefen-avatars"),
+                disk_bytes=app.config.get("AVATAR_DISK_CACHE_BYTES", 256 << 20),
+            )
+            app.extensions["avatar_cache"] = cache
+    return cache
 
 
 def upload_avatar(file_data, filename, content_type):
-    """Upload avatar image to Google Cloud Storage."""
-    bucket_name = current_app.config.get("GCS_BUCKET_NAME")
-    if not bucket_name:
-        raise RuntimeError("GCS_BUCKET_NAME not configured")
+    """
+    Store an avatar image and its resized variants.
+    Returns the blob name of the original.
+    """
+    backend = get_storage_backend()
+    if backend is None:
+        raise RuntimeError("Avatar storage not configured")
 
     if content_type not in ALLOWED_IMAGE_TYPES:
         raise ValueError(
@@ -26,55 +66,76 @@ def upload_avatar(file_data, filename, content_type):
             f"Image too large. Maximum size: {max_size // (1024 * 1024)}MB"
         )
 
+    variants = build_avatar_variants(file_data)
+
     ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "jpg"
     blob_name = f"avatars/{uuid.uuid4().hex}.{ext}"
 
-    client = storage.Client(project=current_app.config.get("GCS_PROJECT_ID"))
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(blob_name)
+    uploads = [(blob_name, file_data, content_type)] + [
+        (variant_name(blob_name, size, fmt), data, VARIANT_TYPES[fmt])
+        for (size, fmt), data in variants.items()
+    ]
 
-    blob.upload_from_string(file_data, content_type=content_type)
+    for name, data, data_type in uploads:
+        backend.save(name, data, data_type)
+        if backend.cache_locally:
+            # The uploader's own page is usually the next request for it
+            get_avatar_cache().set(name, data, data_type)
 
     return blob_name
 
 
-def get_avatar(blob_name):
-    """Retrieve an avatar image from Google Cloud Storage."""
-    bucket_name = current_app.config.get("GCS_BUCKET_NAME")
-    if not bucket_name or not blob_name:
-        return None, None
+def get_avatar_path(blob_name):
+    """Local filesystem path of an avatar, when the backend keeps one."""
+    backend = get_storage_backend()
+    if backend is None or not blob_name:
+        return None
+    return backend.local_path(blob_name)
 
-    try:
-        client = storage.Client(project=current_app.config.get("GCS_PROJECT_ID"))
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
 
-        if not blob.exists():
-            return None, None
+def get_avatar(blob_name):
+    """
+    Retrieve an avatar image, from the local cache when possible and from
+    the storage backend otherwise. Returns (data, content_type).
+    """
+    backend = get_storage_backend()
+    if backend is None or not blob_name:
+        return None, None
 
-        file_data = blob.download_as_bytes()
-        content_type = blob.content_type or "image/jpeg"
+    cache = get_avatar_cache() if backend.cache_locally else None
+    if cache:
+        cached = cache.get(blob_name)
+        if cached:
+            return cached
 
-        return file_data, content_type
+    try:
+        file_data, content_type = backend.load(blob_name)
     except Exception as e:
-        logger.warning(f"Failed to retrieve avatar from GCS: {e}")
+        logger.warning(f"Failed to retrieve avatar from storage: {e}")
+        return None, None
+    if file_data is None:
         return None, None
 
+    content_type = content_type or mimetypes.guess_type(blob_name)[0] or "image/jpeg"
+    if cache:
+        cache.set(blob_name, file_data, content_type)
+    return file_data, content_type
+
 
 def delete_avatar(blob_name):
-    """Delete an avatar image from Google Cloud Storage."""
+    """Delete an avatar image and its variants."""
     if not blob_name:
         return
 
-    bucket_name = current_app.config.get("GCS_BUCKET_NAME")
-    if not bucket_name:
+    backend = get_storage_backend()
+    if backend is None:
         return
 
-    try:
-        client = storage.Client(project=current_app.config.get("GCS_PROJECT_ID"))
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        blob.delete()
-
-    except Exception as e:
-        logger.warning(f"Failed to delete avatar from GCS: {e}")
+    names = [blob_name] + [variant_name(blob_name, size, fmt) for size, fmt in VARIANTS]
+    for name in names:
+        if backend.cache_locally:
+            get_avatar_cache().delete(name)
+        try:
+            backend.delete(name)
+        except Exception as e:
+            logger.warning(f"Failed to delete avatar from storage: {e}")
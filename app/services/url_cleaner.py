@@ -1,3 +1,4 @@
+import hashlib
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 FUNCTIONAL_PARAMS = {
@@ -71,3 +72,43 @@ def remove_tracking_parameters(url):
         )
     except Exception:
         return url
+
+
+def normalize_destination(url):
+    """
+    Canonicalize a destination URL so equivalent links compare equal.
+    Strips tracking parameters, lowercases scheme and host, drops default
+    ports, fragments and trailing slashes, and sorts the query string.
+    """
+    if not url:
+        return url
+
+    url = remove_tracking_parameters(url)
+
+    try:
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        host = (parsed.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+
+        port = parsed.port
+        if port and not (
+            (scheme == "http" and port == 80) or (scheme == "https" and port == 443)
+        ):
+            host = f"{host}:{port}"
+
+        path = parsed.path.rstrip("/")
+        query = urlencode(
+            sorted(parse_qs(parsed.query, keep_blank_values=True).items()),
+            doseq=True,
+        )
+
+        return urlunparse((scheme, host, path, parsed.params, query, ""))
+    except ValueError:
+        return url
+
+
+def destination_hash(url):
+    """SHA-256 hex digest of the normalized destination, for dedup lookups."""
+    return hashlib.sha256(normalize_destination(url).encode()).hexdigest()
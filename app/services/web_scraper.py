@@ -5,6 +5,8 @@ from bs4 import BeautifulSoup
 from flask import current_app
 from requests.exceptions import ConnectionError, HTTPError, Timeout, TooManyRedirects
 
+from app.services.content_distiller import distill_page
+
 _PLACEHOLDER_PATTERNS = [
     "enable javascript",
     "js-disabled",
@@ -135,21 +137,15 @@ def scrape_webpage(url: str, timeout: int = 15) -> dict:
 
             soup = BeautifulSoup(response.text, "html.parser")
 
-            title = ""
-            if soup.title:
-                title = soup.title.string.strip() if soup.title.string else ""
-            if not title and soup.find("h1"):
-                title = soup.find("h1").get_text().strip()
-
-            description = ""
-            meta_desc = soup.find("meta", attrs={"name": "description"})
-            if meta_desc and meta_desc.get("content"):
-                description = meta_desc["content"].strip()
-
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-
-            main_text = soup.get_text(separator=" ", strip=True)[:1000]
+            # Prefer structured metadata and the main content block over raw
+            # page text, which tends to start with cookie banners and menus
+            distilled = distill_page(
+                soup,
+                token_budget=current_app.config.get("AI_CONTENT_TOKEN_BUDGET", 200),
+            )
+            title = distilled["title"]
+            description = distilled["description"]
+            main_text = distilled["content"]
 
             if not title and not description and len(main_text) < 50:
                 return {
@@ -163,6 +159,7 @@ def scrape_webpage(url: str, timeout: int = 15) -> dict:
                 "title": title,
                 "description": description,
                 "content": main_text,
+                "keywords": distilled["keywords"],
                 "url": url,
                 "fallback_used": fallback_used,
             }
@@ -89,18 +89,10 @@ generateBtn.addEventListener('click', async () => {
     resultSection.classList.add('hidden');
     generateBtn.disabled = true;
 
-    // Create EventSource for Server-Sent Events
-    const eventSource = new EventSource('/api/generate-slugs?' + new URLSearchParams({
-        url: url
-    }));
-
-    // Note: We're using GET with query params for SSE compatibility
-    // Let's update to use POST with proper SSE
-    eventSource.close(); // Close the GET attempt
-
-    // Use fetch with streaming for POST
+    // Queue the generation, then follow its event stream. EventSource
+    // reconnects on its own and resumes from the last event it received.
     try {
-        const response = await fetch('/api/generate-slugs', {
+        const response = await fetch('/api/slug-jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -108,23 +100,31 @@ generateBtn.addEventListener('click', async () => {
             body: JSON.stringify({ url: url })
         });
 
-        const reader = response.body.getReader();
-        const decoder = new TextDecoder();
-
-        while (true) {
-            const { done, value } = await reader.read();
-            if (done) break;
+        const job = await response.json();
+        if (!response.ok) {
+            showError(job.error || 'Something went wrong. Please try again.');
+            generateBtn.disabled = false;
+            return;
+        }
 
-            const chunk = decoder.decode(value);
-            const lines = chunk.split('\n');
+        const eventSource = new EventSource(job.events_url);
 
-            for (const line of lines) {
-                if (line.startsWith('data: ')) {
-                    const data = JSON.parse(line.substring(6));
-                    handleUpdate(data);
-                }
+        eventSource.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data.status === 'success' || data.status === 'error') {
+                eventSource.close();
             }
-        }
+            handleUpdate(data);
+        };
+
+        // While CONNECTING the browser is still retrying; CLOSED means the
+        // server refused to resume (job gone or finished without a result)
+        eventSource.onerror = () => {
+            if (eventSource.readyState === EventSource.CLOSED) {
+                showError('Lost connection while generating slugs. Please try again.');
+                generateBtn.disabled = false;
+            }
+        };
     } catch (error) {
         statusMessage.textContent = 'Error: ' + error.message;
         generateBtn.disabled = false;
@@ -296,6 +296,40 @@ cancelEditBtn.addEventListener('click', () => {
     editSection.classList.add('hidden');
     editSlugBtn.classList.remove('hidden');
     editSlugInput.value = '';
+    slugAvailability.textContent = '';
+});
+
+// Live availability check while typing a custom slug
+const slugAvailability = document.getElementById('slug-availability');
+let slugCheckTimer = null;
+
+editSlugInput.addEventListener('input', () => {
+    clearTimeout(slugCheckTimer);
+    const slug = editSlugInput.value.trim();
+    slugAvailability.textContent = '';
+
+    if (!slug || slug === selectedSlug) return;
+
+    slugCheckTimer = setTimeout(async () => {
+        try {
+            const response = await fetch(`/api/slugs/check?prefix=${encodeURIComponent(slug)}`);
+            const data = await response.json();
+            if (editSlugInput.value.trim() !== slug) return;
+
+            if (!data.success) {
+                slugAvailability.textContent = data.error;
+            } else if (data.available) {
+                slugAvailability.textContent = `✓ "${slug}" is available`;
+            } else {
+                const alternatives = data.suggestions.length
+                    ? ` Try: ${data.suggestions.join(', ')}`
+                    : '';
+                slugAvailability.textContent = `✗ "${slug}" is taken.${alternatives}`;
+            }
+        } catch (error) {
+            slugAvailability.textContent = '';
+        }
+    }, 250);
 });
 
 // Save edited slug
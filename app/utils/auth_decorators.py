@@ -1,36 +1,58 @@
-import os
+from contextlib import suppress
 from functools import wraps
 
 import jwt
 from flask import jsonify, request
 from flask_login import current_user
 
-from app.models.user import User
+from app.services.api_keys import authenticate_api_key, is_api_key, required_scope
+from app.services.identity_cache import get_identity, identity_for_token
+
+
+def authenticate_bearer():
+    """
+    Attach the caller of a bearer JWT or API key to request.current_user
+    (and the key to request.api_key). Returns an error response for an API
+    key that fails to verify or lacks the request's scope, else None.
+    """
+    auth_header = request.headers.get("Authorization")
+    request.current_user = None
+    request.api_key = None
+
+    if not (auth_header and auth_header.startswith("Bearer ")):
+        return None
+    token = auth_header.split(" ")[1]
+
+    if not is_api_key(token):
+        with suppress(jwt.InvalidTokenError):
+            request.current_user = identity_for_token(token)
+        return None
+
+    api_key = authenticate_api_key(token)
+    if not api_key:
+        return jsonify({"success": False, "error": "Invalid API key"}), 401
+    scope = required_scope(request.method)
+    if scope not in api_key.scopes:
+        return jsonify(
+            {"success": False, "error": f"API key lacks the '{scope}' scope"}
+        ), 403
+    request.current_user = get_identity(api_key.user_id)
+    request.api_key = api_key
+    return None
 
 
 def jwt_optional(f):
-    """Decorator for optional JWT authentication - attaches user if token is valid."""
+    """
+    Decorator for optional bearer authentication - attaches the user if the
+    JWT or API key is valid (see authenticate_bearer). An API key that fails
+    to verify is rejected rather than treated as anonymous.
+    """
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get("Authorization")
-        request.current_user = None
-
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-
-            try:
-                payload = jwt.decode(
-                    token,
-                    os.getenv("SECRET_KEY", "dev-secret-key-change-in-production"),
-                    algorithms=["HS256"],
-                )
-                user = User.query.get(payload["user_id"])
-                if user:
-                    request.current_user = user
-            except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
-                pass
-
+        error = authenticate_bearer()
+        if error:
+            return error
         return f(*args, **kwargs)
 
     return decorated_function
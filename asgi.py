@@ -0,0 +1,5 @@
+from app.asgi import SlugStreamingApp
+from main import app
+
+# Async serving mode: uvicorn asgi:application
+application = SlugStreamingApp(app)
@@ -0,0 +1,135 @@
+"""
+Latency of ranked full-text link search for one large account.
+
+Fills a SQLite database with --links links for one user (and as many for
+another user), then times search_user_links for a few query shapes.
+
+    python -m benchmarks.link_search --links 100000
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert, text
+
+from app import create_app, db
+from app.models.url import URL
+from app.models.user import User
+from app.services.link_search import search_user_links
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "migrations/versions/5e2d7b9c4a18_add_url_title_and_search_index.py"
+)
+
+WORDS = (
+    "launch",
+    "notes",
+    "docs",
+    "pricing",
+    "blog",
+    "guide",
+    "talk",
+    "video",
+    "release",
+    "api",
+    "design",
+    "postgres",
+    "python",
+    "flask",
+    "search",
+    "index",
+    "github",
+    "youtube",
+    "newsletter",
+    "podcast",
+)
+HOSTS = ("github.com", "youtube.com", "example.com", "medium.com", "docs.dev")
+QUERIES = ("github", "postgres guide", "re", "launch-42", "nothing")
+
+
+def make_config(database_uri):
+    class BenchConfig:
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SECRET_KEY = "bench"
+
+    return BenchConfig
+
+
+def _rows(user_id, count, rng):
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        words = rng.sample(WORDS, 3)
+        yield {
+            "slug": f"{words[0]}-{user_id}-{i}",
+            "original_url": f"https://{rng.choice(HOSTS)}/{words[1]}/{i}",
+            "title": " ".join(words).title(),
+            "user_id": user_id,
+            "click_count": 0,
+            "created_at": start + timedelta(seconds=i),
+        }
+
+
+def _build_search_index():
+    """Create urls_fts with the migration's DDL, as `flask db upgrade` would."""
+    spec = importlib.util.spec_from_file_location("search_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    for statement in migration.SQLITE_DDL:
+        db.session.execute(text(statement))
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--links", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(f"sqlite:///{os.path.join(tmp, 'bench.db')}"))
+        with app.app_context():
+            db.create_all()
+            _build_search_index()
+            users = [
+                User(email=f"bench{i}@example.com", password_hash="x") for i in range(2)
+            ]
+            db.session.add_all(users)
+            db.session.commit()
+
+            started = time.perf_counter()
+            for user in users:
+                rows = list(_rows(user.id, args.links, rng))
+                for offset in range(0, len(rows), 5000):
+                    db.session.execute(insert(URL), rows[offset : offset + 5000])
+            db.session.commit()
+            print(
+                f"indexed {2 * args.links} links "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+            user_id = users[0].id
+            for query in QUERIES:
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    links, _ = search_user_links(user_id, query)
+                    timings.append((time.perf_counter() - started) * 1000)
+                print(
+                    f"{query!r:18} {len(links):3} results  "
+                    f"median {statistics.median(timings):6.1f} ms  "
+                    f"max {max(timings):6.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
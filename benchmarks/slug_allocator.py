@@ -0,0 +1,59 @@
+"""
+Throughput of short-code creation with the slug allocator.
+
+Measures raw code allocation, and end-to-end POST /api/create-short-url
+with auto_slug against a SQLite database, one insert per request.
+
+    python -m benchmarks.slug_allocator --count 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app, db
+from app.services.slug_allocator import SlugAllocator
+
+
+def make_config(database_uri):
+    class BenchConfig:
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SECRET_KEY = "bench"
+        SLUG_ALLOCATOR_BLOCK = 1000
+
+    return BenchConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(f"sqlite:///{os.path.join(tmp, 'bench.db')}"))
+        with app.app_context():
+            db.create_all()
+
+            allocator = SlugAllocator(block_size=1000)
+            started = time.perf_counter()
+            for _ in range(args.count):
+                allocator.allocate()
+            elapsed = time.perf_counter() - started
+            print(f"allocate():           {args.count / elapsed:10.0f} codes/s")
+
+        client = app.test_client()
+        started = time.perf_counter()
+        for i in range(args.count):
+            response = client.post(
+                "/api/create-short-url",
+                json={"url": f"https://example.com/{i}", "auto_slug": True},
+            )
+            assert response.status_code == 201, response.get_json()
+        elapsed = time.perf_counter() - started
+        print(f"create-short-url API: {args.count / elapsed:10.0f} links/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Load test for concurrent /api/generate-slugs streams.
+
+Compares the threaded WSGI path (a fixed pool of request threads, as with
+`gunicorn --threads 8`) against the ASGI serving mode. Slug generation is
+replaced by a fake that sleeps for --duration seconds, so the numbers measure
+stream capacity rather than scraping or Gemini latency.
+
+    python -m benchmarks.sse_capacity --clients 400 --pages 20 --duration 1
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app, db
+from app.asgi import SlugStreamingApp
+from app.services import slug_jobs
+
+
+class BenchConfig:
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    SECRET_KEY = "bench"
+    SLUG_JOB_WORKERS = 64
+    SLUG_JOB_MAX_PENDING = 10_000
+
+
+class StreamGauge:
+    """Tracks how many streams are open at once."""
+
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+
+    def exit(self):
+        with self._lock:
+            self.open -= 1
+
+
+def fake_generator(duration):
+    def generate(url):
+        yield json.dumps({"status": "progress", "message": "Fetching..."})
+        time.sleep(duration)
+        yield json.dumps({"status": "success", "slugs": ["a", "b", "c"]})
+
+    return generate
+
+
+def run_wsgi(app, clients, pages, threads):
+    gauge = StreamGauge()
+
+    def one_client(i):
+        with app.test_client() as client:
+            response = client.post(
+                "/api/generate-slugs",
+                json={"url": f"https://example.com/page-{i % pages}"},
+                buffered=False,
+            )
+            gauge.enter()
+            for _ in response.response:
+                pass
+            gauge.exit()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one_client, range(clients)))
+    return time.perf_counter() - started, gauge.peak
+
+
+async def run_asgi(app, clients, pages):
+    asgi_app = SlugStreamingApp(app)
+    gauge = StreamGauge()
+
+    async def one_client(i):
+        body = json.dumps({"url": f"https://example.com/page-{i % pages}"}).encode()
+        done = asyncio.Event()
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                gauge.enter()
+            elif not message.get("more_body"):
+                gauge.exit()
+                done.set()
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/generate-slugs",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json")],
+        }
+        await asgi_app(scope, receive, send)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_client(i) for i in range(clients)))
+    return time.perf_counter() - started, gauge.peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=400)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    slug_jobs.generate_slug_options = fake_generator(args.duration)
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+
+    wsgi_time, wsgi_peak = run_wsgi(app, args.clients, args.pages, args.threads)
+    asgi_time, asgi_peak = asyncio.run(run_asgi(app, args.clients, args.pages))
+
+    print(f"{args.clients} clients, {args.pages} distinct URLs, {args.duration}s jobs")
+    print(
+        f"  WSGI ({args.threads} threads): {wsgi_time:6.2f}s, peak open streams {wsgi_peak}"
+    )
+    print(f"  ASGI (event loop):  {asgi_time:6.2f}s, peak open streams {asgi_peak}")
+
+
+if __name__ == "__main__":
+    main()
@@ -52,10 +52,15 @@ async function startShorteningProcess() {
   selectedSlug = '';
 
   try {
+    const headers = { 'Content-Type': 'application/json' };
+    if (authToken) {
+      headers['Authorization'] = `Bearer ${authToken}`;
+    }
+
     const response = await fetch(`${API_BASE}/generate-slugs`, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ url: currentUrl })
+      headers,
+      body: JSON.stringify({ url: currentUrl, reuse_existing: true })
     });
 
     if (!response.ok) {
@@ -69,53 +74,80 @@ async function startShorteningProcess() {
       throw new Error(errorMessage);
     }
 
-    const reader = response.body.getReader();
-    const decoder = new TextDecoder();
-    let buffer = '';
-
-    while (true) {
-      const { done, value } = await reader.read();
-      if (done) break;
-
-      buffer += decoder.decode(value, { stream: true });
-      const lines = buffer.split('\n');
-      buffer = lines.pop() || '';
-
-      for (const line of lines) {
-        if (line.startsWith('data: ')) {
-          const jsonStr = line.slice(6).trim();
-          if (!jsonStr) continue;
+    // The server caps each stream; pick up where it left off until the job ends
+    const eventsUrl = response.headers.get('X-Slug-Job-Events');
+    let lastEventId = await readSlugEvents(response);
+    while (lastEventId !== null && eventsUrl) {
+      const resumed = await fetch(`${API_BASE}${eventsUrl.replace(/^\/api/, '')}`, {
+        headers: { 'Last-Event-ID': String(lastEventId) }
+      });
+      if (resumed.status === 204 || !resumed.ok) break;
+      const next = await readSlugEvents(resumed);
+      lastEventId = next === null ? null : Math.max(lastEventId, next);
+    }
+  } catch (error) {
+    showError(error.message);
+  }
+}
 
-          try {
-            const data = JSON.parse(jsonStr);
+// Reads one slug SSE stream. Returns null once a final event was handled,
+// otherwise the last event id seen so the caller can resume.
+async function readSlugEvents(response) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let lastEventId = 0;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) return lastEventId;
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() || '';
+
+    for (const line of lines) {
+      if (line.startsWith('id: ')) {
+        lastEventId = parseInt(line.slice(4), 10) || lastEventId;
+      } else if (line.startsWith('data: ')) {
+        const jsonStr = line.slice(6).trim();
+        if (!jsonStr) continue;
+
+        try {
+          const data = JSON.parse(jsonStr);
+
+          if (data.status === 'error' || data.error) {
+            throw new Error(data.message || data.error || 'Unknown error occurred');
+          }
 
-            if (data.status === 'error' || data.error) {
-              throw new Error(data.message || data.error || 'Unknown error occurred');
-            }
+          if (data.message) {
+            document.getElementById('status-text').textContent = data.message;
+          }
 
-            if (data.message) {
-              document.getElementById('status-text').textContent = data.message;
-            }
+          if (data.status === 'existing') {
+            document.getElementById('short-url').textContent = data.short_url;
+            document.getElementById('original-url').textContent = data.original_url;
+            showContainer('result');
+            return null;
+          }
 
-            if (data.status === 'success' && data.slugs) {
-              slugOptions = data.slugs;
-              if (slugOptions.length > 0) {
-                displaySlugOptions(slugOptions);
-                showContainer('slug-selection');
-              } else {
-                throw new Error('No available slugs generated');
-              }
-            }
-          } catch (parseError) {
-            if (parseError.message && !parseError.message.includes('JSON')) {
-              throw parseError;
+          if (data.status === 'success' && data.slugs) {
+            slugOptions = data.slugs;
+            if (slugOptions.length > 0) {
+              displaySlugOptions(slugOptions);
+              showContainer('slug-selection');
+              return null;
+            } else {
+              throw new Error('No available slugs generated');
             }
           }
+        } catch (parseError) {
+          if (parseError.message && !parseError.message.includes('JSON')) {
+            throw parseError;
+          }
         }
       }
     }
-  } catch (error) {
-    showError(error.message);
   }
 }
 
@@ -23,15 +23,47 @@ class Config:
 
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+    AI_PROVIDER = os.getenv("AI_PROVIDER", "gemini")  # "gemini" or "stub"
+    AI_FAST_MODEL = os.getenv("AI_FAST_MODEL", "gemini-2.0-flash-lite")
+    AI_RICH_MODEL = os.getenv("AI_RICH_MODEL", "gemini-2.5-flash")
+    AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "20"))
+    AI_HEDGE = os.getenv("AI_HEDGE", "true").lower() == "true"
+    AI_HEDGE_DELAY = float(os.getenv("AI_HEDGE_DELAY", "1.5"))
+    AI_STUB_LATENCY = float(os.getenv("AI_STUB_LATENCY", "0"))
+    AI_CONTENT_TOKEN_BUDGET = int(os.getenv("AI_CONTENT_TOKEN_BUDGET", "200"))
+    AI_PACK_SIZE = int(os.getenv("AI_PACK_SIZE", "8"))  # pages per batched AI call
+
     RATELIMIT_STORAGE_URL = os.getenv("RATELIMIT_STORAGE_URL", "memory://")
     RATELIMIT_DEFAULT = os.getenv("RATELIMIT_DEFAULT", "100 per hour")
 
     MAX_SLUG_LENGTH = 50
+    SLUG_ALLOCATOR_BLOCK = int(os.getenv("SLUG_ALLOCATOR_BLOCK", "1000"))
+    SLUG_INDEX_REFRESH = int(os.getenv("SLUG_INDEX_REFRESH", "300"))
+    # Seconds a user's cached link total may lag writes from other workers
+    LINK_COUNT_CACHE_TTL = int(os.getenv("LINK_COUNT_CACHE_TTL", "300"))
+    # Seconds a user's cached identity may lag changes made by other workers
+    IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", "60"))
+    QR_EXPORT_WORKERS = int(os.getenv("QR_EXPORT_WORKERS", "4"))
+    QR_EXPORT_MAX_LINKS = int(os.getenv("QR_EXPORT_MAX_LINKS", "5000"))
     SLUG_GENERATION_BATCHES = 3
     SLUG_OPTIONS_PER_BATCH = 5
 
     AI_THINKING_MODE = os.getenv("AI_THINKING_MODE", "ai_generated")
 
+    SLUG_JOB_WORKERS = int(os.getenv("SLUG_JOB_WORKERS", "4"))
+    SLUG_JOB_MAX_PENDING = int(os.getenv("SLUG_JOB_MAX_PENDING", "100"))
+    SLUG_JOB_BUFFER = 100
+    SLUG_JOB_RETENTION = 300  # seconds a finished job stays resumable
+    SLUG_JOB_STREAM_WINDOW = 25  # seconds an SSE attach holds a request thread
+
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "3600"))
+
+    BULK_JOB_WORKERS = int(os.getenv("BULK_JOB_WORKERS", "2"))
+    BULK_SCRAPE_CONCURRENCY = int(os.getenv("BULK_SCRAPE_CONCURRENCY", "8"))
+    BULK_MAX_URLS = int(os.getenv("BULK_MAX_URLS", "5000"))
+    BULK_INSERT_BATCH = 100
+    BULK_JOB_RETENTION = 24 * 3600  # seconds results stay downloadable
+
     TWITTER_FALLBACKS = os.getenv("TWITTER_FALLBACKS", "nitter.net").split(",")
 
     TEXT_PROXY_URL = os.getenv("TEXT_PROXY_URL", "https://r.jina.ai/http://")
@@ -45,7 +77,27 @@ class Config:
 
     GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME")
     GCS_PROJECT_ID = os.getenv("GCS_PROJECT_ID")
+    # "gcs" (default) or "local"; local files go in LOCAL_STORAGE_DIR,
+    # defaulting to instance/uploads
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "gcs")
+    LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR")
     MAX_AVATAR_SIZE = 2 * 1024 * 1024  # 2MB
+    BIO_PAGE_CACHE_TTL = int(os.getenv("BIO_PAGE_CACHE_TTL", "60"))
+    BIO_PAGE_CACHE_SIZE = int(os.getenv("BIO_PAGE_CACHE_SIZE", "1024"))
+    # Seconds between bio click counter flushes; 0 disables the flusher thread
+    BIO_CLICK_FLUSH_INTERVAL = float(os.getenv("BIO_CLICK_FLUSH_INTERVAL", "5"))
+    BIO_CLICK_MAX_PENDING = int(os.getenv("BIO_CLICK_MAX_PENDING", "10000"))
+    # Seconds between batched writes of API keys' last_used_at
+    API_KEY_USAGE_FLUSH_INTERVAL = float(
+        os.getenv("API_KEY_USAGE_FLUSH_INTERVAL", "60")
+    )
+    AVATAR_MEMORY_CACHE_BYTES = int(
+        os.getenv("AVATAR_MEMORY_CACHE_BYTES", str(16 * 1024 * 1024))
+    )
+    AVATAR_DISK_CACHE_DIR = os.getenv("AVATAR_DISK_CACHE_DIR")
+    AVATAR_DISK_CACHE_BYTES = int(
+        os.getenv("AVATAR_DISK_CACHE_BYTES", str(256 * 1024 * 1024))
+    )
 
     MAILGUN_API_KEY = os.getenv("MAILGUN_API_KEY")
     MAILGUN_DOMAIN = os.getenv("MAILGUN_DOMAIN", "mail.briefen.me")
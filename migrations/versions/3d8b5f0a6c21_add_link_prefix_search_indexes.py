@@ -0,0 +1,33 @@
+"""Add prefix search indexes on urls slug and destination
+
+Revision ID: 3d8b5f0a6c21
+Revises: e7a4c2d9f813
+Create Date: 2026-10-18 15:12:38.417092
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8b5f0a6c21'
+down_revision = 'e7a4c2d9f813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Pattern ops so LIKE 'prefix%' can use the index under any collation
+        op.execute('CREATE INDEX ix_urls_user_slug_prefix ON urls (user_id, slug varchar_pattern_ops)')
+        op.execute('CREATE INDEX ix_urls_user_destination_prefix ON urls '
+                   '(user_id, substr(original_url, 1, 200) text_pattern_ops)')
+    else:
+        op.create_index('ix_urls_user_slug_prefix', 'urls', ['user_id', 'slug'], unique=False)
+        op.create_index('ix_urls_user_destination_prefix', 'urls',
+                        ['user_id', sa.text('substr(original_url, 1, 200)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_urls_user_destination_prefix', table_name='urls')
+    op.drop_index('ix_urls_user_slug_prefix', table_name='urls')
@@ -0,0 +1,32 @@
+"""Add slug_sequences table for the short code allocator
+
+Revision ID: 40786bd4dca4
+Revises: c810fce09bf0
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '40786bd4dca4'
+down_revision = 'c810fce09bf0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # main.py runs db.create_all() at startup, which may have made it already
+    if sa.inspect(op.get_bind()).has_table('slug_sequences'):
+        return
+
+    op.create_table('slug_sequences',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('slug_sequences')
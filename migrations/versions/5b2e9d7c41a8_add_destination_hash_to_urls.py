@@ -0,0 +1,99 @@
+"""Add destination_hash to urls for destination dedup
+
+Revision ID: 5b2e9d7c41a8
+Revises: 40786bd4dca4
+Create Date: 2026-10-18 11:02:17.553940
+
+"""
+import hashlib
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e9d7c41a8'
+down_revision = '40786bd4dca4'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+# Frozen copy of app.services.url_cleaner as of this revision, so the
+# migration keeps running however that module changes later
+FUNCTIONAL_PARAMS = {
+    'id', 'article_id', 'post_id', 'video_id', 'product_id', 'item_id', 'p',
+    'page', 'post', 'v', 'watch', 'tab', 'section', 'category', 'sort', 'order',
+    'filter', 'search', 'q', 'query', 'keywords', 'offset', 'limit', 'start',
+    'variant', 'color', 'size', 'quantity', 'sku', 'asin', 'action', 'mode',
+    'view', 'format', 't', 'time', 'timestamp', 'version', 'feature', 'ab_test',
+}
+
+
+def _remove_tracking_parameters(url):
+    try:
+        parsed = urlparse(url)
+        query_params = parse_qs(parsed.query, keep_blank_values=True)
+        cleaned = {k: v for k, v in query_params.items() if k.lower() in FUNCTIONAL_PARAMS}
+        new_query = urlencode(cleaned, doseq=True) if cleaned else ''
+        return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params,
+                           new_query, parsed.fragment))
+    except Exception:
+        return url
+
+
+def _normalize_destination(url):
+    if not url:
+        return url
+    url = _remove_tracking_parameters(url)
+    try:
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        host = (parsed.hostname or '').lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        port = parsed.port
+        if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+            host = f'{host}:{port}'
+        path = parsed.path.rstrip('/')
+        query = urlencode(sorted(parse_qs(parsed.query, keep_blank_values=True).items()), doseq=True)
+        return urlunparse((scheme, host, path, parsed.params, query, ''))
+    except ValueError:
+        return url
+
+
+def destination_hash(url):
+    return hashlib.sha256(_normalize_destination(url).encode()).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('urls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('destination_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_urls_user_destination', ['user_id', 'destination_hash'], unique=False)
+
+    # Backfill existing rows in id order, one batch at a time
+    conn = op.get_bind()
+    urls = sa.table('urls', sa.column('id', sa.Integer), sa.column('original_url', sa.Text),
+                    sa.column('destination_hash', sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(urls.c.id, urls.c.original_url)
+            .where(urls.c.id > last_id)
+            .order_by(urls.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            urls.update().where(urls.c.id == sa.bindparam('row_id')),
+            [{'row_id': row.id, 'destination_hash': destination_hash(row.original_url)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('urls', schema=None) as batch_op:
+        batch_op.drop_index('ix_urls_user_destination')
+        batch_op.drop_column('destination_hash')
@@ -0,0 +1,79 @@
+"""Add urls.title and a full-text search index over urls
+
+Revision ID: 5e2d7b9c4a18
+Revises: a61e0c4b7d92
+Create Date: 2026-10-18 17:12:44.208117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2d7b9c4a18'
+down_revision = 'a61e0c4b7d92'
+branch_labels = None
+depends_on = None
+
+SQLITE_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS urls_fts USING fts5(
+        slug, original_url, title, user_id,
+        content='urls', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS urls_fts_insert AFTER INSERT ON urls BEGIN
+        INSERT INTO urls_fts(rowid, slug, original_url, title, user_id)
+        VALUES (new.id, new.slug, new.original_url, new.title, new.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS urls_fts_delete AFTER DELETE ON urls BEGIN
+        INSERT INTO urls_fts(urls_fts, rowid, slug, original_url, title, user_id)
+        VALUES ('delete', old.id, old.slug, old.original_url, old.title, old.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS urls_fts_update
+    AFTER UPDATE OF slug, original_url, title, user_id ON urls BEGIN
+        INSERT INTO urls_fts(urls_fts, rowid, slug, original_url, title, user_id)
+        VALUES ('delete', old.id, old.slug, old.original_url, old.title, old.user_id);
+        INSERT INTO urls_fts(rowid, slug, original_url, title, user_id)
+        VALUES (new.id, new.slug, new.original_url, new.title, new.user_id);
+    END""",
+    # Index the links that already exist
+    "INSERT INTO urls_fts(urls_fts) VALUES ('rebuild')",
+)
+
+POSTGRESQL_DDL = (
+    """ALTER TABLE urls ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(slug, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(title, '')), 'B') ||
+        setweight(to_tsvector('simple',
+            regexp_replace(original_url, '[^[:alnum:]]+', ' ', 'g')), 'C')
+    ) STORED""",
+    "CREATE INDEX ix_urls_search_vector ON urls USING GIN (search_vector)",
+)
+
+
+def upgrade():
+    with op.batch_alter_table('urls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('title', sa.String(length=300), nullable=True))
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        for statement in POSTGRESQL_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('urls_fts_insert', 'urls_fts_delete', 'urls_fts_update'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS urls_fts')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_urls_search_vector')
+        op.execute('ALTER TABLE urls DROP COLUMN IF EXISTS search_vector')
+
+    # ALTER in place: rebuilding urls on SQLite would lose the expression
+    # index ix_urls_user_destination_prefix, which reflection can't copy
+    with op.batch_alter_table('urls', schema=None, recreate='never') as batch_op:
+        batch_op.drop_column('title')
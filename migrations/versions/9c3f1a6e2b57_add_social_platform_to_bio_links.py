@@ -0,0 +1,82 @@
+"""Add social_platform to bio_links, classified at write time
+
+Revision ID: 9c3f1a6e2b57
+Revises: 5b2e9d7c41a8
+Create Date: 2026-10-18 13:41:05.218734
+
+"""
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3f1a6e2b57'
+down_revision = '5b2e9d7c41a8'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+# Frozen copy of app.services.social_platforms as of this revision, so the
+# migration keeps running however that module changes later
+SOCIAL_HOSTS = {
+    'twitter.com': 'twitter', 'x.com': 'twitter', 'linkedin.com': 'linkedin',
+    'github.com': 'github', 'instagram.com': 'instagram', 'facebook.com': 'facebook',
+    'youtube.com': 'youtube', 'youtu.be': 'youtube', 'tiktok.com': 'tiktok',
+    'discord.gg': 'discord', 'discord.com': 'discord', 't.me': 'telegram',
+    'wa.me': 'whatsapp', 'whatsapp.com': 'whatsapp', 'snapchat.com': 'snapchat',
+    'reddit.com': 'reddit', 'pinterest.com': 'pinterest', 'twitch.tv': 'twitch',
+    'medium.com': 'medium',
+}
+
+
+def detect_platform(url):
+    url = url or ''
+    if '://' not in url:
+        url = '//' + url
+    try:
+        host = urlsplit(url.strip()).hostname
+    except ValueError:
+        return None
+    host = host.rstrip('.') if host else None
+    while host:
+        platform = SOCIAL_HOSTS.get(host)
+        if platform:
+            return platform
+        _, _, host = host.partition('.')
+    return None
+
+
+def upgrade():
+    with op.batch_alter_table('bio_links', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('social_platform', sa.String(length=20), nullable=True))
+        batch_op.create_index(batch_op.f('ix_bio_links_social_platform'), ['social_platform'], unique=False)
+
+    # Backfill existing rows in id order, one batch at a time
+    conn = op.get_bind()
+    links = sa.table('bio_links', sa.column('id', sa.Integer), sa.column('url', sa.Text),
+                     sa.column('is_social', sa.Boolean), sa.column('social_platform', sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(links.c.id, links.c.url)
+            .where(links.c.id > last_id)
+            .order_by(links.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            platform = detect_platform(row.url)
+            params.append({'row_id': row.id, 'social_platform': platform, 'is_social': platform is not None})
+        conn.execute(links.update().where(links.c.id == sa.bindparam('row_id')), params)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('bio_links', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bio_links_social_platform'))
+        batch_op.drop_column('social_platform')
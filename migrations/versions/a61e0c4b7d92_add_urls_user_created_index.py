@@ -0,0 +1,25 @@
+"""Add urls (user_id, created_at, id) index for keyset pagination
+
+Revision ID: a61e0c4b7d92
+Revises: 3d8b5f0a6c21
+Create Date: 2026-10-18 15:58:20.736415
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a61e0c4b7d92'
+down_revision = '3d8b5f0a6c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('urls', schema=None) as batch_op:
+        batch_op.create_index('ix_urls_user_created', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('urls', schema=None) as batch_op:
+        batch_op.drop_index('ix_urls_user_created')
@@ -0,0 +1,46 @@
+"""Add api_keys for server-to-server clients
+
+Revision ID: b4f81d3e6a05
+Revises: 5e2d7b9c4a18
+Create Date: 2026-10-18 18:03:17.592840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f81d3e6a05'
+down_revision = '5e2d7b9c4a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # main.py runs db.create_all() at startup, which may have made it already
+    if sa.inspect(op.get_bind()).has_table('api_keys'):
+        return
+
+    op.create_table('api_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('prefix', sa.String(length=16), nullable=False),
+    sa.Column('key_hash', sa.String(length=64), nullable=False),
+    sa.Column('scopes', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('api_keys', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_api_keys_prefix'), ['prefix'], unique=True)
+        batch_op.create_index(batch_op.f('ix_api_keys_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('api_keys', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_api_keys_user_id'))
+        batch_op.drop_index(batch_op.f('ix_api_keys_prefix'))
+
+    op.drop_table('api_keys')
@@ -0,0 +1,59 @@
+"""Add bio link click events and daily rollups
+
+Revision ID: e7a4c2d9f813
+Revises: 9c3f1a6e2b57
+Create Date: 2026-10-18 14:26:51.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a4c2d9f813'
+down_revision = '9c3f1a6e2b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # main.py runs db.create_all() at startup, which may have made these already
+    existing = sa.inspect(op.get_bind())
+    if not existing.has_table('bio_link_clicks'):
+        _create_bio_link_clicks()
+    if not existing.has_table('bio_link_daily_stats'):
+        _create_bio_link_daily_stats()
+
+
+def _create_bio_link_clicks():
+    op.create_table('bio_link_clicks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bio_link_id', sa.Integer(), nullable=False),
+    sa.Column('clicked_at', sa.DateTime(), nullable=False),
+    sa.Column('ip_hash', sa.String(length=64), nullable=True),
+    sa.Column('referrer', sa.Text(), nullable=True),
+    sa.Column('device_type', sa.String(length=20), nullable=True),
+    sa.Column('browser', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['bio_link_id'], ['bio_links.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('bio_link_clicks', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_bio_link_clicks_bio_link_id'), ['bio_link_id'], unique=False)
+
+
+def _create_bio_link_daily_stats():
+    op.create_table('bio_link_daily_stats',
+    sa.Column('bio_link_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('clicks', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['bio_link_id'], ['bio_links.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('bio_link_id', 'day')
+    )
+
+
+def downgrade():
+    op.drop_table('bio_link_daily_stats')
+    with op.batch_alter_table('bio_link_clicks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bio_link_clicks_bio_link_id'))
+
+    op.drop_table('bio_link_clicks')
@@ -15,6 +15,9 @@ class TestConfig:
     GCS_BUCKET_NAME = None
     GCS_PROJECT_ID = None
     RATELIMIT_ENABLED = False
+    AI_PROVIDER = "stub"
+    BIO_CLICK_FLUSH_INTERVAL = 0
+    API_KEY_USAGE_FLUSH_INTERVAL = 0
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from app.services.ai_providers import (
+    HEDGE_SLOTS_PER_MODEL,
+    AIProviderError,
+    StubProvider,
+    get_provider,
+    hedged_complete,
+)
+from app.services.ai_service import (
+    _parse_packed_response,
+    generate_slugs_for_pages,
+    generate_slugs_from_content,
+    parse_slug_lines,
+)
+
+
+class SlowFastProvider(StubProvider):
+    """Stub whose fast model is slow, to exercise hedging."""
+
+    def _complete(self, prompt, model, timeout):
+        if model == "fast":
+            time.sleep(0.5)
+            return "fast-answer", 1, 1
+        if model == "broken":
+            raise RuntimeError("boom")
+        return "rich-answer", 1, 1
+
+
+def test_stub_provider_is_deterministic(app):
+    slugs = generate_slugs_from_content("Flask Testing Guide", "", "")
+    assert slugs == generate_slugs_from_content("Flask Testing Guide", "", "")
+    assert slugs[0] == "flask-testing-guide"
+    assert get_provider().get_metrics()["gemini-2.0-flash-lite"]["calls"] >= 1
+
+
+def test_hedged_request_takes_first_usable_answer():
+    provider = SlowFastProvider()
+    text = hedged_complete(
+        provider, "prompt", ["fast", "rich"], is_usable=bool, delay=0.05
+    )
+    assert text == "rich-answer"
+    assert provider.get_metrics()["rich"]["calls"] == 1
+
+
+def test_hedged_request_raises_when_nothing_usable():
+    provider = SlowFastProvider()
+    with pytest.raises(AIProviderError):
+        hedged_complete(provider, "prompt", ["broken"], is_usable=bool, timeout=1)
+
+
+def test_hung_model_does_not_delay_later_requests():
+    release = threading.Event()
+
+    class HangingProvider(StubProvider):
+        def _complete(self, prompt, model, timeout):
+            if model == "hung":
+                release.wait(timeout=10)
+            return "answer", 1, 1
+
+    provider = HangingProvider()
+    try:
+        for _ in range(HEDGE_SLOTS_PER_MODEL * 3):
+            started = time.monotonic()
+            text = hedged_complete(
+                provider, "prompt", ["hung", "ok"], is_usable=bool, delay=0.02
+            )
+            assert text == "answer"
+            assert time.monotonic() - started < 0.5
+        assert provider.get_metrics()["ok"]["calls"] == HEDGE_SLOTS_PER_MODEL * 3
+    finally:
+        release.set()
+
+
+def test_parse_slug_lines_cleans_output():
+    assert parse_slug_lines("My-Slug!\n--double--dash\n\n", 5) == [
+        "my-slug",
+        "double-dash",
+    ]
+
+
+def test_packed_pages_use_one_model_call(app):
+    pages = [{"title": f"Campaign page {i}"} for i in range(6)]
+    results = generate_slugs_for_pages(pages)
+
+    assert [slugs[0] for slugs in results] == [f"campaign-page-{i}" for i in range(6)]
+    assert get_provider().get_metrics()["gemini-2.0-flash-lite"]["calls"] == 1
+
+
+def test_packed_response_tolerates_malformed_entries():
+    text = '```json\n{"0": ["Good Slug"], "1": "not-a-list", "2": []}\n```'
+    assert _parse_packed_response(text, 4, 5) == [["goodslug"], None, None, None]
+    assert _parse_packed_response("no json here", 2, 5) == [None, None]
@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.api_key import ApiKey
+from app.models.url import URL
+from app.services.api_keys import get_usage_buffer, hash_key
+
+
+@pytest.fixture
+def issued(auth_client):
+    def issue(scopes):
+        response = auth_client.post(
+            "/api/api-keys", json={"name": "backend", "scopes": scopes}
+        )
+        assert response.status_code == 201
+        return response.get_json()
+
+    yield issue
+    # Write buffered uses while the tables still exist
+    get_usage_buffer().flush()
+
+
+def _bearer(key):
+    return {"Authorization": f"Bearer {key}"}
+
+
+def test_keys_are_stored_hashed_and_listed_without_secrets(auth_client, issued):
+    body = issued(["read"])
+    key = body["key"]
+    stored = ApiKey.query.one()
+    assert stored.key_hash == hash_key(key) and key not in stored.key_hash
+    assert key.startswith(body["api_key"]["prefix"] + "_")
+
+    listed = auth_client.get("/api/api-keys").get_json()["api_keys"]
+    assert listed == [body["api_key"]]
+    for invalid in ({"scopes": ["read"]}, {"name": "x", "scopes": ["admin"]}):
+        assert auth_client.post("/api/api-keys", json=invalid).status_code == 400
+
+
+def test_scopes_and_verification(client, auth_client, issued):
+    read_key = issued(["read"])["key"]
+    write_key = issued(["read", "write"])["key"]
+    auth_client.get("/logout")
+
+    assert client.get("/api/links", headers=_bearer(read_key)).status_code == 200
+    create = {"url": "https://example.com", "slug": "by-key"}
+    denied = client.post(
+        "/api/create-short-url", json=create, headers=_bearer(read_key)
+    )
+    assert denied.status_code == 403
+    allowed = client.post(
+        "/api/create-short-url", json=create, headers=_bearer(write_key)
+    )
+    assert allowed.get_json()["success"] is True
+
+    forged = read_key[:-4] + "AAAA"
+    assert client.get("/api/links", headers=_bearer(forged)).status_code == 401
+    # A key can't be used to mint or list other keys
+    assert client.get("/api/api-keys", headers=_bearer(write_key)).status_code == 401
+
+
+def test_last_used_is_written_in_batches(app, client, db, issued):
+    body = issued(["read"])
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        for _ in range(5):
+            client.get("/api/links", headers=_bearer(body["key"]))
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    assert not any(s.lstrip().upper().startswith("UPDATE") for s in statements)
+
+    buffer = get_usage_buffer()
+    assert list(buffer.pending()) == [body["api_key"]["id"]]
+    assert buffer.flush() == 1
+    db.session.expire_all()
+    assert ApiKey.query.one().last_used_at is not None
+
+
+def test_unverified_keys_are_rejected_on_optional_auth_endpoints(client, issued):
+    real = issued(["read", "write"])["key"]
+    create = {"url": "https://example.com", "slug": "forged"}
+    for forged in ("bk_deadbeef0000_notarealsecret", real[:-4] + "AAAA", "bk_"):
+        response = client.post(
+            "/api/create-short-url", json=create, headers=_bearer(forged)
+        )
+        assert response.status_code == 401
+    assert URL.query.filter_by(slug="forged").first() is None
+
+
+def test_revoked_key_stops_working(client, auth_client, issued):
+    body = issued(["read", "write"])
+    key_id = body["api_key"]["id"]
+    assert auth_client.delete(f"/api/api-keys/{key_id}").status_code == 200
+    assert auth_client.delete(f"/api/api-keys/{key_id}").status_code == 404
+    auth_client.get("/logout")
+    assert client.get("/api/links", headers=_bearer(body["key"])).status_code == 401
+    response = client.post(
+        "/api/create-short-url",
+        json={"url": "https://example.com", "slug": "revoked"},
+        headers=_bearer(body["key"]),
+    )
+    assert response.status_code == 401
+    assert URL.query.filter_by(slug="revoked").first() is None
@@ -0,0 +1,61 @@
+from app.routes import api
+from app.services.avatar_cache import AvatarCache
+
+
+def test_memory_tier_is_bounded_by_bytes():
+    cache = AvatarCache(memory_bytes=10)
+    cache.set("avatars/a.png", b"12345678", "image/png")
+    cache.set("avatars/b.png", b"12345678", "image/png")
+
+    assert cache.get("avatars/a.png") is None
+    assert cache.get("avatars/b.png") == (b"12345678", "image/png")
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    cache = AvatarCache(memory_bytes=0, disk_dir=str(tmp_path), disk_bytes=1024)
+    cache.set("avatars/a.webp", b"image-bytes", "image/webp")
+
+    fresh = AvatarCache(memory_bytes=1024, disk_dir=str(tmp_path), disk_bytes=1024)
+    assert fresh.get("avatars/a.webp") == (b"image-bytes", "image/webp")
+
+    fresh.delete("avatars/a.webp")
+    assert AvatarCache(0, str(tmp_path), 1024).get("avatars/a.webp") is None
+
+
+def test_disk_tier_evicts_oldest(tmp_path):
+    cache = AvatarCache(memory_bytes=0, disk_dir=str(tmp_path), disk_bytes=20)
+    cache.set("avatars/a.png", b"x" * 15, "image/png")
+    cache.set("avatars/b.png", b"y" * 15, "image/png")
+
+    assert len(list(tmp_path.iterdir())) == 1
+    assert cache.get("avatars/b.png") == (b"y" * 15, "image/png")
+
+
+def test_serve_avatar_revalidates_without_storage(client, monkeypatch):
+    calls = []
+
+    def fake_get_avatar(blob_name):
+        calls.append(blob_name)
+        return b"png-bytes", "image/png"
+
+    monkeypatch.setattr(api, "get_avatar", fake_get_avatar)
+
+    response = client.get("/api/avatar/avatars/abc.png")
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
+
+    etag = response.headers["ETag"]
+    again = client.get("/api/avatar/avatars/abc.png", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert calls == ["avatars/abc.png"]
+
+
+def test_local_avatar_is_served_immutable(client, monkeypatch, tmp_path):
+    path = tmp_path / "abc.png"
+    path.write_bytes(b"png-bytes")
+    monkeypatch.setattr(api, "get_avatar_path", lambda name: str(path))
+
+    response = client.get("/api/avatar/avatars/abc.png")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    response.close()
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.bio import BioLink, BioPage
+from app.models.bio_click import BioLinkClick, BioLinkDailyStat
+from app.services.click_buffer import get_click_buffer
+
+CHROME = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+def _page(db, user):
+    page = BioPage(user_id=user.id, username="stats")
+    db.session.add(page)
+    db.session.flush()
+    links = [
+        BioLink(bio_page_id=page.id, title=title, url=f"https://{title}.dev")
+        for title in ("one", "two")
+    ]
+    db.session.add_all(links)
+    db.session.commit()
+    return [link.id for link in links]
+
+
+def test_flush_writes_events_and_rollups(app, client, db, user):
+    first, second = _page(db, user)
+    for link_id in (first, first, second):
+        client.post(
+            f"/api/bio/links/{link_id}/click",
+            json={"referrer": "https://news.site/"},
+            headers={"User-Agent": CHROME},
+        )
+
+    assert get_click_buffer().flush() == 2
+
+    click = BioLinkClick.query.filter_by(bio_link_id=first).first()
+    assert click.referrer == "https://news.site/"
+    assert click.device_type == "desktop"
+    assert click.ip_hash
+
+    stats = {s.bio_link_id: s.clicks for s in BioLinkDailyStat.query.all()}
+    assert stats == {first: 2, second: 1}
+
+    # A second flush on the same day adds to the existing rollup rows
+    client.post(f"/api/bio/links/{first}/click")
+    get_click_buffer().flush()
+    db.session.expire_all()
+    assert (
+        db.session.get(BioLinkDailyStat, (first, datetime.utcnow().date())).clicks == 3
+    )
+
+
+def test_clicks_on_deleted_links_are_dropped(app, client, db, user):
+    first, _ = _page(db, user)
+    client.post(f"/api/bio/links/{first}/click")
+    client.post("/api/bio/links/999999/click")
+    assert get_click_buffer().flush() == 1
+    assert get_click_buffer().pending() == {}
+    assert BioLinkClick.query.count() == 1
+
+
+def test_analytics_come_from_rollups(auth_client, db, user):
+    first, second = _page(db, user)
+    today = datetime.utcnow().date()
+    db.session.add_all(
+        [
+            BioLinkDailyStat(bio_link_id=first, day=today, clicks=4),
+            BioLinkDailyStat(bio_link_id=second, day=today, clicks=1),
+            BioLinkDailyStat(
+                bio_link_id=first, day=today - timedelta(days=3), clicks=2
+            ),
+            BioLinkDailyStat(
+                bio_link_id=first, day=today - timedelta(days=40), clicks=9
+            ),
+        ]
+    )
+    db.session.commit()
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        response = auth_client.get("/api/bio/analytics?days=30")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    analytics = response.get_json()["analytics"]
+    assert analytics["total_clicks"] == 7
+    assert analytics["clicks_over_time"] == [
+        {"date": (today - timedelta(days=3)).isoformat(), "count": 2},
+        {"date": today.isoformat(), "count": 5},
+    ]
+    assert [link["clicks"] for link in analytics["links"]] == [6, 1]
+    assert not any("bio_link_clicks" in statement for statement in statements)
+
+    assert auth_client.get("/api/bio/analytics?days=abc").status_code == 400
+
+
+def test_deleting_a_link_does_not_load_its_clicks(auth_client, db, user):
+    first, second = _page(db, user)
+    today = datetime.utcnow().date()
+    db.session.add_all(
+        [BioLinkClick(bio_link_id=link_id) for link_id in [first] * 50 + [second]]
+    )
+    db.session.add(BioLinkDailyStat(bio_link_id=first, day=today, clicks=50))
+    db.session.commit()
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        assert auth_client.delete(f"/api/bio/links/{first}").status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert not any("FROM bio_link_clicks" in s for s in selects)
+    assert not any("FROM bio_link_daily_stats" in s for s in selects)
+    assert BioLinkClick.query.filter_by(bio_link_id=first).count() == 0
+    assert BioLinkClick.query.count() == 1
+    assert BioLinkDailyStat.query.count() == 0
@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.bio import BioLink, BioPage
+
+
+@pytest.fixture
+def page(db, user):
+    page = BioPage(user_id=user.id, username="batch")
+    db.session.add(page)
+    db.session.flush()
+    for i in range(3):
+        db.session.add(
+            BioLink(bio_page_id=page.id, title=f"Link {i}", url=f"https://{i}.dev")
+        )
+    db.session.commit()
+    return page
+
+
+def _ids(page):
+    return [link.id for link in page.links.order_by(BioLink.id)]
+
+
+def _batch(client, *operations):
+    return client.post("/api/bio/links/batch", json={"operations": list(operations)})
+
+
+def test_batch_applies_all_operations(auth_client, page):
+    first, second, third = _ids(page)
+    response = _batch(
+        auth_client,
+        {"op": "delete", "id": second},
+        {"op": "update", "id": first, "title": "Renamed", "is_active": False},
+        {"op": "update", "id": third, "url": "https://github.com/me"},
+        {"op": "create", "title": "New", "url": "https://new.dev", "ref": "n"},
+        {"op": "reorder", "ids": ["n", third, first]},
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    new_id = body["created"]["n"]
+
+    links = body["links"]
+    assert [link["id"] for link in links] == [new_id, third, first]
+    assert [link["position"] for link in links] == [0, 1, 2]
+    assert links[1]["social_platform"] == "github"
+    assert links[2]["title"] == "Renamed"
+    assert links[2]["is_active"] is False
+
+
+def test_batch_is_all_or_nothing(auth_client, page, db):
+    first, _, _ = _ids(page)
+    response = _batch(
+        auth_client,
+        {"op": "update", "id": first, "title": "Changed"},
+        {"op": "delete", "id": 999999},
+    )
+    assert response.status_code == 404
+    db.session.expire_all()
+    assert db.session.get(BioLink, first).title == "Link 0"
+    assert page.links.count() == 3
+
+    assert _batch(auth_client, {"op": "create", "title": ""}).status_code == 400
+    assert _batch(auth_client, {"op": "explode"}).status_code == 400
+
+
+def test_query_count_does_not_grow_with_batch_size(auth_client, page, db):
+    def run(size):
+        statements = []
+
+        def count(*args):
+            statements.append(args)
+
+        ops = [
+            {"op": "create", "title": f"T{i}", "url": f"https://t{i}.dev"}
+            for i in range(size)
+        ]
+        ops += [{"op": "update", "id": link_id, "title": "U"} for link_id in _ids(page)]
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            assert _batch(auth_client, *ops).status_code == 200
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        return len(statements)
+
+    assert run(2) == run(40)
+
+
+def test_reorder_uses_one_update(auth_client, page):
+    ids = _ids(page)
+    order = [{"id": link_id, "position": 2 - i} for i, link_id in enumerate(ids)]
+    response = auth_client.put("/api/bio/links/reorder", json={"order": order})
+    assert response.status_code == 200
+    assert [link.id for link in page.links] == ids[::-1]
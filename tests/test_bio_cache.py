@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.bio import BioLink, BioPage
+
+
+@pytest.fixture
+def bio(db, user):
+    page = BioPage(user_id=user.id, username="cached")
+    db.session.add(page)
+    db.session.flush()
+    db.session.add(BioLink(bio_page_id=page.id, title="Blog", url="https://blog.dev"))
+    db.session.commit()
+    return page
+
+
+@pytest.fixture
+def query_count(db):
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", count)
+
+
+def test_repeat_views_skip_the_database(client, bio, query_count):
+    first = client.get("/@cached")
+    assert first.status_code == 200
+    assert b"Blog" in first.data
+
+    query_count.clear()
+    second = client.get("/@cached")
+    assert second.data == first.data
+    assert query_count == []
+
+    revalidated = client.get(
+        "/@cached", headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_bio_mutations_invalidate(auth_client, bio):
+    assert b"Portfolio" not in auth_client.get("/@cached").data
+
+    auth_client.post(
+        "/api/bio/links", json={"title": "Portfolio", "url": "https://folio.dev"}
+    )
+    assert b"Portfolio" in auth_client.get("/@cached").data
+
+    auth_client.put("/api/bio", json={"username": "renamed"})
+    assert auth_client.get("/@cached").status_code == 404
+    assert auth_client.get("/@renamed").status_code == 200
@@ -0,0 +1,67 @@
+import time
+
+from app.models.url import URL
+from app.services import bulk_jobs
+from app.services.bulk_jobs import parse_url_list
+
+
+def fake_metadata(url):
+    title = url.rstrip("/").rsplit("/", 1)[-1].replace("-", " ")
+    return {
+        "success": True,
+        "title": title,
+        "description": "",
+        "content": "",
+        "keywords": [],
+    }
+
+
+def wait_for(client, job_id):
+    for _ in range(100):
+        status = client.get(f"/api/bulk-jobs/{job_id}").get_json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError("bulk job did not finish")
+
+
+def test_parse_url_list_uses_url_column():
+    assert parse_url_list("name,url\nA,https://a.com\nB,\n") == ["https://a.com"]
+    assert parse_url_list("https://a.com\nhttps://b.com\n") == [
+        "https://a.com",
+        "https://b.com",
+    ]
+
+
+def test_bulk_job_creates_links(auth_client, user, db, monkeypatch):
+    monkeypatch.setattr(bulk_jobs, "fetch_page_metadata", fake_metadata)
+
+    response = auth_client.post(
+        "/api/bulk-jobs",
+        json={
+            "urls": [
+                "https://example.com/spring-launch",
+                "https://example.com/summer-sale",
+                "http://localhost/admin",
+            ]
+        },
+    )
+    assert response.status_code == 202
+
+    status = wait_for(auth_client, response.get_json()["job_id"])
+    assert status["status"] == "done"
+    assert status["succeeded"] == 2
+    assert status["failed"] == 1
+
+    slugs = {url.slug for url in URL.query.filter_by(user_id=user.id)}
+    assert "spring-launch" in slugs
+    assert "summer-sale" in slugs
+
+    csv_text = auth_client.get(status["results_url"]).get_data(as_text=True)
+    assert csv_text.startswith("original_url,short_url,slug,status,error")
+    assert "/spring-launch,spring-launch,created," in csv_text
+
+
+def test_bulk_job_requires_auth(client):
+    response = client.post("/api/bulk-jobs", json={"urls": ["https://a.com"]})
+    assert response.status_code == 401
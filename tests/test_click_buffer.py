@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.bio import BioLink, BioPage
+from app.services import click_buffer
+from app.services.click_buffer import ClickBuffer, get_click_buffer
+
+
+def _link(db, user):
+    page = BioPage(user_id=user.id, username="clicks")
+    db.session.add(page)
+    db.session.flush()
+    link = BioLink(bio_page_id=page.id, title="Site", url="https://site.dev")
+    db.session.add(link)
+    db.session.commit()
+    return link
+
+
+def test_clicks_are_buffered_then_flushed(app, client, db, user):
+    link = _link(db, user)
+    link_id = link.id
+
+    for _ in range(3):
+        assert client.post(f"/api/bio/links/{link_id}/click").status_code == 200
+
+    buffer = get_click_buffer()
+    assert buffer.pending() == {link_id: 3}
+    assert db.session.get(BioLink, link_id).click_count == 0
+
+    assert buffer.flush() == 1
+    db.session.expire_all()
+    assert db.session.get(BioLink, link_id).click_count == 3
+    assert buffer.pending() == {}
+
+
+def test_concurrent_clicks_are_not_lost(app, db, user):
+    link_id = _link(db, user).id
+    buffer = get_click_buffer()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: buffer.record(link_id), range(500)))
+    buffer.flush()
+
+    db.session.expire_all()
+    assert db.session.get(BioLink, link_id).click_count == 500
+
+
+def test_unknown_links_are_refused_before_buffering(app, client, db, user):
+    link_id = _link(db, user).id
+    assert client.post("/api/bio/links/999999/click").status_code == 404
+    assert client.post(f"/api/bio/links/{link_id}/click").status_code == 200
+    assert get_click_buffer().pending() == {link_id: 1}
+    get_click_buffer().flush()
+
+
+def test_buffer_is_capped_even_when_flushes_fail(app, db, user, monkeypatch):
+    link_id = _link(db, user).id
+    buffer = ClickBuffer(app, interval=0, max_pending=3)
+
+    assert [buffer.record(link_id) for _ in range(5)] == [True] * 3 + [False] * 2
+    assert buffer.dropped == 2
+
+    def failing_write(conn, events):
+        # A click arrives while the batch is out, then the write fails
+        buffer.record(link_id)
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(click_buffer, "_write_clicks", failing_write)
+    assert buffer.flush() == 0
+    assert buffer.pending() == {link_id: 3}
+    assert buffer.dropped == 3
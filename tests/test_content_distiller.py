@@ -0,0 +1,60 @@
+from bs4 import BeautifulSoup
+
+from app.services.content_distiller import distill_page, truncate_to_budget
+
+PAGE = """
+<html>
+<head>
+  <title>Fallback title | Example</title>
+  <meta property="og:title" content="How We Cut Build Times in Half">
+  <meta name="description" content="A look at our CI pipeline.">
+  <script type="application/ld+json">
+    {"@context": "https://schema.org", "@graph": [
+      {"@type": "Article", "headline": "Ignored", "keywords": ["ci", "Caching"]}
+    ]}
+  </script>
+</head>
+<body>
+  <div class="cookie-consent"><p>We use cookies to improve your experience, accept all?</p></div>
+  <nav><a href="/">Home</a><a href="/blog">Blog</a></nav>
+  <div class="sidebar"><ul><li><a href="/x">Popular post one</a></li></ul></div>
+  <article class="post-content">
+    <p>Our builds took forty minutes, which slowed every review.</p>
+    <p>We added remote caching, split the test suite, and pinned dependencies.</p>
+  </article>
+</body>
+</html>
+"""
+
+
+def test_distill_prefers_metadata_and_main_content():
+    result = distill_page(BeautifulSoup(PAGE, "html.parser"))
+
+    assert result["title"] == "How We Cut Build Times in Half"
+    assert result["description"] == "A look at our CI pipeline."
+    assert result["keywords"] == ["ci", "Caching"]
+    assert result["content"].startswith("Our builds took forty minutes")
+    assert "cookies" not in result["content"]
+    assert "Popular post" not in result["content"]
+
+
+def test_truncate_to_budget_prefers_sentence_boundary():
+    text = "First sentence here. Second sentence is a bit longer than that one."
+    assert truncate_to_budget(text, 8) == "First sentence here."
+    assert truncate_to_budget(text, 100) == text
+
+
+def test_cookie_banner_with_content_class_is_stripped():
+    page = """
+    <body>
+      <div class="cookie-consent-content" id="gdpr-text">
+        <p>We and our partners use cookies, pixels, and similar tools to store,
+        read, and process data, personalise ads, and measure audiences.</p>
+      </div>
+      <div><p>Short post about release notes for version two.</p></div>
+    </body>
+    """
+    result = distill_page(BeautifulSoup(page, "html.parser"))
+
+    assert "cookies" not in result["content"]
+    assert result["content"].startswith("Short post about release notes")
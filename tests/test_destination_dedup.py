@@ -0,0 +1,62 @@
+import json
+
+from app.models.url import URL
+from app.services.url_cleaner import destination_hash
+
+
+def test_destination_hash_ignores_cosmetic_differences():
+    assert destination_hash("https://www.Example.com/page/?utm_source=x") == (
+        destination_hash("https://example.com/page")
+    )
+    assert destination_hash("https://example.com/a") != destination_hash(
+        "https://example.com/b"
+    )
+
+
+def test_hash_follows_original_url(db, user):
+    url = URL(original_url="https://example.com/one", slug="one", user_id=user.id)
+    db.session.add(url)
+    db.session.commit()
+
+    url.original_url = "https://example.com/two"
+    db.session.commit()
+
+    assert url.destination_hash == destination_hash("https://example.com/two")
+
+
+def test_create_short_url_reuses_existing_link(auth_client):
+    first = auth_client.post(
+        "/api/create-short-url",
+        json={"url": "https://example.com/post?utm_campaign=a", "slug": "my-post"},
+    )
+    assert first.status_code == 201
+
+    again = auth_client.post(
+        "/api/create-short-url",
+        json={
+            "url": "https://www.example.com/post/",
+            "slug": "other-slug",
+            "reuse_existing": True,
+        },
+    )
+    assert again.status_code == 200
+    data = again.get_json()
+    assert data["reused"] is True
+    assert data["slug"] == "my-post"
+    assert URL.query.count() == 1
+
+
+def test_generate_slugs_returns_existing_link(auth_client):
+    auth_client.post(
+        "/api/create-short-url",
+        json={"url": "https://example.com/post", "slug": "my-post"},
+    )
+
+    response = auth_client.post(
+        "/api/generate-slugs",
+        json={"url": "https://example.com/post", "reuse_existing": True},
+    )
+    body = response.get_data(as_text=True)
+    event = json.loads(body.split("data: ", 1)[1])
+    assert event["status"] == "existing"
+    assert event["slug"] == "my-post"
@@ -0,0 +1,84 @@
+import pytest
+from flask import g
+from sqlalchemy import event
+
+from app.models.user import User
+
+
+@pytest.fixture
+def user_queries(db):
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", capture)
+
+
+def _new_request(db):
+    # The fixture's app context outlives requests; start each one as a
+    # worker would, with an empty session and no user loaded yet
+    db.session.remove()
+    g.pop("_login_user", None)
+
+
+def _token(client):
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    )
+    return response.get_json()["token"]
+
+
+def test_jwt_requests_reuse_cached_identity(client, db, user, user_queries):
+    headers = {"Authorization": f"Bearer {_token(client)}"}
+    user_queries.clear()
+
+    for _ in range(3):
+        _new_request(db)
+        assert client.get("/api/links", headers=headers).status_code == 200
+    assert len(user_queries) == 1
+
+    assert client.get("/api/auth/verify", headers=headers).get_json()["user"] == {
+        "id": user.id,
+        "email": "test@example.com",
+    }
+    bad = {"Authorization": "Bearer not-a-token"}
+    assert client.get("/api/links", headers=bad).status_code == 401
+
+
+def test_session_requests_reuse_cached_identity(auth_client, db, user_queries):
+    user_queries.clear()
+    for _ in range(3):
+        _new_request(db)
+        assert auth_client.get("/api/links").status_code == 200
+    assert len(user_queries) == 1
+
+
+def test_subadmin_toggle_and_deletion_invalidate(app, client, db, user):
+    user_id = user.id
+    headers = {"Authorization": f"Bearer {_token(client)}"}
+    client.post("/login", data={"email": "test@example.com", "password": "password123"})
+    _new_request(db)
+    assert client.get("/api/ai/metrics").status_code == 403
+
+    user = db.session.get(User, user_id)
+    user.is_subadmin = True
+    db.session.commit()
+    _new_request(db)
+    assert client.get("/api/ai/metrics").status_code == 200
+
+    cache = app.extensions["identity_cache"]
+    assert ("user", user_id) in cache
+    user = db.session.get(User, user_id)
+    user.set_password("changed-password")
+    db.session.commit()
+    assert ("user", user_id) not in cache
+
+    db.session.delete(user)
+    db.session.commit()
+    _new_request(db)
+    assert client.get("/api/links", headers=headers).status_code == 401
@@ -0,0 +1,65 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.services.image_pipeline import (
+    build_avatar_variants,
+    pick_variant,
+    read_upload,
+    variant_name,
+)
+
+
+def _png(width, height, mode="RGBA"):
+    output = BytesIO()
+    Image.new(mode, (width, height), (200, 40, 40, 128)[: len(mode)]).save(
+        output, "PNG"
+    )
+    return output.getvalue()
+
+
+def test_variants_are_square_and_sized():
+    variants = build_avatar_variants(_png(1200, 800))
+
+    assert set(variants) == {(96, "webp"), (192, "webp"), (512, "webp"), (192, "jpg")}
+    for (size, fmt), data in variants.items():
+        image = Image.open(BytesIO(data))
+        assert image.size == (size, size)
+        assert image.format == {"webp": "WEBP", "jpg": "JPEG"}[fmt]
+    assert len(variants[(96, "webp")]) < len(variants[(512, "webp")])
+
+
+@pytest.mark.parametrize("fmt", ["PNG", "GIF"])
+def test_palette_transparency_survives(fmt):
+    image = Image.new("P", (64, 64), 0)
+    image.putpalette([255, 255, 255, 200, 40, 40] + [0] * 762)
+    image.paste(1, (16, 16, 48, 48))
+    output = BytesIO()
+    image.save(output, fmt, transparency=0)
+
+    variants = build_avatar_variants(output.getvalue())
+    webp = Image.open(BytesIO(variants[(96, "webp")]))
+    assert webp.mode == "RGBA"
+    assert webp.getpixel((2, 2))[3] == 0
+    assert webp.getpixel((32, 32))[3] == 255
+
+
+def test_rejects_non_images():
+    with pytest.raises(ValueError):
+        build_avatar_variants(b"definitely not an image")
+
+
+def test_read_upload_stops_early():
+    assert read_upload(BytesIO(b"x" * 100), max_size=100) == b"x" * 100
+    with pytest.raises(ValueError):
+        read_upload(BytesIO(b"x" * 200_000), max_size=100_000)
+
+
+def test_pick_variant():
+    blob = "avatars/abc.png"
+    assert variant_name(blob, 96, "webp") == "avatars/abc_96.webp"
+    assert pick_variant(blob, 96, accepts_webp=True) == "avatars/abc_96.webp"
+    assert pick_variant(blob, 150, accepts_webp=True) == "avatars/abc_192.webp"
+    assert pick_variant(blob, 2000, accepts_webp=True) == "avatars/abc_512.webp"
+    assert pick_variant(blob, 96, accepts_webp=False) == "avatars/abc_192.jpg"
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.bio import BioLink, BioPage
+from app.models.url import URL
+from app.services.link_counts import get_link_count
+
+
+@pytest.fixture
+def links(db, user):
+    base = datetime(2026, 1, 1)
+    urls = [
+        URL(
+            slug=f"link-{i:02d}",
+            original_url=f"https://site{i}.example/page",
+            user_id=user.id,
+            # Pairs share a timestamp so the id tie-breaker matters
+            created_at=base + timedelta(minutes=i // 2),
+        )
+        for i in range(25)
+    ]
+    urls.append(
+        URL(
+            slug="code",
+            original_url="https://github.com/me/repo",
+            user_id=user.id,
+            created_at=base,
+        )
+    )
+    db.session.add_all(urls)
+    db.session.commit()
+    return urls
+
+
+def _pages(client, query=""):
+    seen, cursor = [], None
+    while True:
+        url = f"/api/links?limit=10{query}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        seen += [link["slug"] for link in body["links"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen
+
+
+def test_keyset_pages_cover_every_link_once(auth_client, links):
+    slugs = _pages(auth_client)
+    expected = sorted(links, key=lambda u: (u.created_at, u.id), reverse=True)
+    assert slugs == [u.slug for u in expected]
+
+
+def test_prefix_search_on_slug_and_destination(auth_client, links):
+    assert _pages(auth_client, "&q=github.com/me") == ["code"]
+    assert _pages(auth_client, "&q=cod") == ["code"]
+    assert len(_pages(auth_client, "&q=link-1")) == 10
+    assert _pages(auth_client, "&q=%25") == []
+
+
+def test_links_on_bio_page_are_excluded(auth_client, db, user, links):
+    page = BioPage(user_id=user.id, username="picker")
+    db.session.add(page)
+    db.session.flush()
+    db.session.add(
+        BioLink(bio_page_id=page.id, title="Code", url="http://localhost/code")
+    )
+    db.session.commit()
+
+    slugs = _pages(auth_client, "&exclude_bio=1")
+    assert "code" not in slugs
+    assert len(slugs) == 25
+
+    editor = auth_client.get("/bio/edit")
+    assert editor.status_code == 200
+    assert b"link-00" not in editor.data
+
+
+def test_bad_requests(client, auth_client, links):
+    assert auth_client.get("/api/links?cursor=nope").status_code == 400
+    assert auth_client.get("/api/links?limit=x").status_code == 400
+    auth_client.get("/logout")
+    assert client.get("/api/links").status_code == 401
+
+
+def test_before_cursor_walks_back(auth_client, links):
+    first = auth_client.get("/api/links?limit=10").get_json()
+    assert first["prev_cursor"] is None
+    assert first["total"] == 26
+
+    second = auth_client.get(f"/api/links?limit=10&cursor={first['next_cursor']}")
+    back = auth_client.get(
+        f"/api/links?limit=10&before={second.get_json()['prev_cursor']}"
+    ).get_json()
+    assert back["links"] == first["links"]
+    assert back["prev_cursor"] is None
+
+
+def test_dashboard_pages_without_recounting(auth_client, db, user, links):
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    first = auth_client.get("/dashboard")
+    assert b"26 links" in first.data
+    assert b"link-24" in first.data and b"link-04" not in first.data
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        older = auth_client.get("/dashboard?after=" + _next_cursor(first.data))
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    assert b"link-04" in older.data
+    assert not any("count(" in statement.lower() for statement in statements)
+
+    db.session.add(URL(slug="fresh", original_url="https://new.dev", user_id=user.id))
+    db.session.commit()
+    assert b"27 links" in auth_client.get("/dashboard").data
+    assert auth_client.get("/dashboard?after=garbage").status_code == 302
+
+
+def test_link_count_ignores_rolled_back_changes(app, db, user, links):
+    user_id = user.id
+    assert get_link_count(user_id) == 26
+
+    db.session.add(URL(slug="draft", original_url="https://new.dev", user_id=user_id))
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+    assert user_id in app.extensions["link_count_cache"]
+
+    db.session.add(URL(slug="kept", original_url="https://new.dev", user_id=user_id))
+    db.session.commit()
+    assert user_id not in app.extensions["link_count_cache"]
+    assert get_link_count(user_id) == 27
+
+
+def _next_cursor(html):
+    marker = b"/dashboard?after="
+    start = html.index(marker) + len(marker)
+    return html[start : html.index(b'"', start)].decode()
@@ -0,0 +1,101 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.models.url import URL
+from app.models.user import User
+from app.services import link_search
+from app.services.link_search import search_user_links
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "migrations/versions/5e2d7b9c4a18_add_url_title_and_search_index.py"
+)
+
+
+@pytest.fixture
+def search_index(db):
+    """Build urls_fts from the migration's DDL; create_all doesn't make it."""
+    spec = importlib.util.spec_from_file_location("search_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    for statement in migration.SQLITE_DDL:
+        db.session.execute(text(statement))
+    db.session.commit()
+
+
+@pytest.fixture
+def links(db, user, search_index):
+    other = User(email="other@example.com")
+    other.set_password("password123")
+    db.session.add(other)
+    db.session.flush()
+    db.session.add_all(
+        [
+            URL(slug="gh", original_url="https://github.com/me", user_id=user.id),
+            URL(
+                slug="talk",
+                original_url="https://youtube.com/watch?v=1",
+                title="Scaling Postgres at GitHub",
+                user_id=user.id,
+            ),
+            URL(slug="github", original_url="https://example.com", user_id=user.id),
+            URL(slug="github-2", original_url="https://github.com", user_id=other.id),
+        ]
+    )
+    db.session.commit()
+    return user
+
+
+def _slugs(user_id, query, **kwargs):
+    return [link.slug for link in search_user_links(user_id, query, **kwargs)[0]]
+
+
+def test_search_ranks_slug_title_destination(app, links):
+    assert _slugs(links.id, "github") == ["github", "talk", "gh"]
+    assert app.extensions["link_searcher"] is link_search._sqlite_ids
+    assert _slugs(links.id, "postgres scal") == ["talk"]
+    assert _slugs(links.id, "nothing-here") == []
+    assert _slugs(links.id, '" OR *') == []
+
+
+def test_index_follows_edits_and_deletes(app, db, links):
+    link = URL.query.filter_by(slug="gh").one()
+    link.slug = "code"
+    db.session.commit()
+    assert _slugs(links.id, "code") == ["code"]
+    assert _slugs(links.id, "gh") == []
+
+    db.session.delete(link)
+    db.session.commit()
+    assert "code" not in _slugs(links.id, "github")
+
+
+def test_search_pages_and_api(auth_client, links):
+    page, next_offset = search_user_links(links.id, "github", limit=2)
+    assert len(page) == 2 and next_offset == 2
+    assert _slugs(links.id, "github", limit=2, offset=2) == ["gh"]
+
+    body = auth_client.get("/api/links/search?q=github&limit=2").get_json()
+    assert [link["slug"] for link in body["links"]] == ["github", "talk"]
+    assert body["links"][1]["title"] == "Scaling Postgres at GitHub"
+    rest = auth_client.get(f"/api/links/search?q=github&cursor={body['next_cursor']}")
+    assert [link["slug"] for link in rest.get_json()["links"]] == ["gh"]
+
+    dashboard = auth_client.get("/dashboard?q=postgres")
+    assert b"Scaling Postgres at GitHub" in dashboard.data
+    assert b"example.com" not in dashboard.data
+
+
+def test_search_without_index_falls_back_to_prefix_matching(app, db, user):
+    db.session.add_all(
+        [
+            URL(slug="gh", original_url="https://github.com/me", user_id=user.id),
+            URL(slug="other", original_url="https://example.com", user_id=user.id),
+        ]
+    )
+    db.session.commit()
+    assert _slugs(user.id, "git") == ["gh"]
+    assert app.extensions["link_searcher"] is link_search._fallback_ids
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from alembic.script import ScriptDirectory
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = "c810fce09bf0"
+
+# Each step is a fresh process that imports main.py, as a deploy does:
+# main.py runs db.create_all() before `flask db upgrade` gets to run
+STEP = """
+import sys
+from flask_migrate import downgrade, stamp, upgrade
+from main import app
+
+with app.app_context():
+    if sys.argv[1] == "baseline":
+        stamp()
+        downgrade(revision=sys.argv[2])
+    else:
+        upgrade()
+"""
+
+
+def _run(database, *args):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}", "AI_PROVIDER": "stub"}
+    result = subprocess.run(
+        [sys.executable, "-c", STEP, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+
+def test_upgrade_from_baseline_after_main_startup(tmp_path):
+    database = tmp_path / "deploy.db"
+    _run(database, "baseline", BASELINE)
+    _run(database, "upgrade")
+
+    head = ScriptDirectory(str(ROOT / "migrations")).get_current_head()
+    conn = sqlite3.connect(database)
+    assert conn.execute("SELECT version_num FROM alembic_version").fetchall() == [
+        (head,)
+    ]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert {"slug_sequences", "bio_link_clicks", "api_keys", "urls_fts"} <= tables
+
+
+def test_migrations_do_not_import_the_app():
+    # A later refactor of app code must not break upgrading old databases
+    for script in (ROOT / "migrations" / "versions").glob("*.py"):
+        source = script.read_text()
+        assert "from app" not in source and "import app" not in source, script.name
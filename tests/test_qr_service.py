@@ -0,0 +1,100 @@
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.url import URL
+from app.services import qr_service
+
+
+@pytest.fixture
+def owned_url(db, user):
+    url = URL(original_url="https://example.com", slug="qr-test", user_id=user.id)
+    db.session.add(url)
+    db.session.commit()
+    return url
+
+
+def test_svg_render_needs_no_raster():
+    svg = qr_service.render_qr_code("http://localhost/abc", box_size=4, fmt="svg")
+    assert svg.startswith(b"<svg")
+    assert b'fill="#000"' in svg
+
+
+def test_renders_are_cached_until_invalidated(monkeypatch):
+    calls = []
+    original = qr_service.render_qr_code
+
+    def counting_render(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(qr_service, "render_qr_code", counting_render)
+    qr_service.invalidate_qr_codes("cached")
+
+    first = qr_service.get_qr_code("cached", "http://localhost/cached")
+    assert qr_service.get_qr_code("cached", "http://localhost/cached") == first
+    assert len(calls) == 1
+
+    qr_service.invalidate_qr_codes("cached")
+    qr_service.get_qr_code("cached", "http://localhost/cached")
+    assert len(calls) == 2
+
+
+def test_qrcode_route_etag_and_formats(auth_client, owned_url):
+    response = auth_client.get(f"/api/qrcode/{owned_url.id}?format=svg")
+    assert response.status_code == 200
+    assert response.mimetype == "image/svg+xml"
+    assert "private" in response.headers["Cache-Control"]
+
+    etag = response.headers["ETag"]
+    revalidated = auth_client.get(
+        f"/api/qrcode/{owned_url.id}?format=svg", headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+
+    assert auth_client.get(f"/api/qrcode/{owned_url.id}?format=gif").status_code == 400
+
+
+def test_edit_slug_changes_qr_code(auth_client, owned_url):
+    first = auth_client.get(f"/api/qrcode/{owned_url.id}")
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    auth_client.put(f"/api/edit-slug/{owned_url.id}", json={"slug": "qr-renamed"})
+
+    # The browser revalidates with the old ETag and gets the new code back
+    after = auth_client.get(
+        f"/api/qrcode/{owned_url.id}", headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert after.status_code == 200
+    assert after.headers["ETag"] != first.headers["ETag"]
+    assert after.data != first.data
+
+
+def test_stream_qr_zip_contains_every_code():
+    slugs = [f"link-{i}" for i in range(20)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        chunks = list(
+            qr_service.stream_qr_zip(
+                slugs, "http://localhost/", executor, window=4, fmt="svg"
+            )
+        )
+
+    assert len(chunks) > len(slugs)
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert sorted(archive.namelist()) == sorted(f"qrcode-{s}.svg" for s in slugs)
+    assert archive.read("qrcode-link-3.svg").startswith(b"<svg")
+
+
+def test_export_only_includes_own_links(auth_client, db, owned_url):
+    db.session.add(URL(original_url="https://example.com", slug="not-mine"))
+    db.session.commit()
+
+    response = auth_client.get("/api/qrcode/export")
+    assert response.mimetype == "application/zip"
+
+    names = zipfile.ZipFile(io.BytesIO(response.get_data())).namelist()
+    assert names == ["qrcode-qr-test.png"]
+
+    response = auth_client.post("/api/qrcode/export", json={"url_ids": [999]})
+    assert response.status_code == 404
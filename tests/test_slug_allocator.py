@@ -0,0 +1,39 @@
+from app.models.url import URL
+from app.services.slug_allocator import (
+    CODE_LENGTH,
+    SlugAllocator,
+    code_for,
+    encode_base62,
+)
+
+
+def test_encode_base62_fixed_length():
+    assert encode_base62(0) == "000000"
+    assert encode_base62(61) == "00000Z"
+    assert len(encode_base62(62**CODE_LENGTH - 1)) == CODE_LENGTH
+
+
+def test_codes_are_unique_across_blocks(app):
+    allocator = SlugAllocator(block_size=50)
+    codes = [allocator.allocate() for _ in range(500)]
+
+    assert len(set(codes)) == 500
+    assert all(any(c.isupper() for c in code) for code in codes)
+
+    # A second worker reserves a separate block
+    other = SlugAllocator(block_size=50)
+    assert other.allocate() not in codes
+
+
+def test_code_for_is_not_sequential():
+    assert code_for(1)[:4] != code_for(2)[:4]
+
+
+def test_create_short_url_with_auto_slug(client, db):
+    response = client.post(
+        "/api/create-short-url", json={"url": "https://example.com", "auto_slug": True}
+    )
+    assert response.status_code == 201
+    slug = response.get_json()["slug"]
+    assert len(slug) == CODE_LENGTH
+    assert URL.query.filter_by(slug=slug).one().original_url == "https://example.com"
@@ -0,0 +1,107 @@
+import threading
+
+from app.models.url import URL
+from app.services import slug_index
+from app.services.slug_index import SlugIndex, get_slug_index
+
+
+def test_prefix_search_and_updates():
+    index = SlugIndex()
+    index.load(["beta", "alpha", "alp-2", "gamma"])
+
+    assert index.with_prefix("al") == ["alp-2", "alpha"]
+    index.add("alpine")
+    index.discard("alpha")
+    assert index.with_prefix("alp") == ["alp-2", "alpine"]
+    assert "gamma" in index and "alpha" not in index
+
+
+def test_suggest_skips_taken_variants():
+    index = SlugIndex()
+    index.load(["launch", "launch-2", "launch-4"])
+    assert index.suggest("launch") == ["launch-3", "launch-5", "launch-6"]
+
+
+def test_refresh_is_single_flight_and_keeps_concurrent_commits():
+    index = SlugIndex()
+    index.load(["old", "kept"])
+    index._loaded_at -= index.refresh_interval + 1
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch():
+        started.set()
+        release.wait(timeout=5)
+        # Read before the commits below reached the database
+        return ["old", "kept", "from-db"]
+
+    assert index.refresh_in_background(slow_fetch) is True
+    started.wait(timeout=5)
+    assert index.refresh_in_background(lambda: ["other"]) is False
+    assert "kept" in index
+
+    index.add("added-meanwhile")
+    index.discard("old")
+    release.set()
+    # Waits for the running reload, then finds the index fresh
+    index.refresh(lambda: ["other"])
+
+    assert index.with_prefix("") == ["added-meanwhile", "from-db", "kept"]
+    assert not index.is_stale
+
+
+def test_stale_index_reloads_in_background(app, db, monkeypatch):
+    index = get_slug_index()
+    index._loaded_at -= index.refresh_interval + 1
+    calls, release = [], threading.Event()
+
+    def slow_slugs(app):
+        calls.append(1)
+        release.wait(timeout=5)
+        return ["fresh"]
+
+    monkeypatch.setattr(slug_index, "_all_slugs", slow_slugs)
+    for _ in range(5):
+        assert get_slug_index() is index
+    assert "fresh" not in index
+
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "slug-index-refresh":
+            thread.join(timeout=5)
+    assert calls == [1]
+    assert "fresh" in index and not index.is_stale
+
+
+def test_index_follows_commits(db):
+    index = get_slug_index()
+    url = URL(original_url="https://example.com", slug="first")
+    db.session.add(url)
+    db.session.commit()
+    assert "first" in index
+
+    url.slug = "renamed"
+    db.session.commit()
+    assert "renamed" in index and "first" not in index
+
+    db.session.add(URL(original_url="https://example.com", slug="rolled-back"))
+    db.session.flush()
+    db.session.rollback()
+    assert "rolled-back" not in index
+
+    db.session.delete(url)
+    db.session.commit()
+    assert "renamed" not in index
+
+
+def test_check_endpoint(client, db):
+    db.session.add(URL(original_url="https://example.com", slug="taken"))
+    db.session.commit()
+
+    data = client.get("/api/slugs/check?prefix=taken").get_json()
+    assert data["available"] is False
+    assert data["suggestions"][0] == "taken-2"
+
+    assert client.get("/api/slugs/check?prefix=free").get_json()["available"]
+    # Route names are never available as slugs
+    assert not client.get("/api/slugs/check?prefix=login").get_json()["available"]
+    assert client.get("/api/slugs/check?prefix=Bad Slug!").status_code == 400
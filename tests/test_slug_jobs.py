@@ -0,0 +1,210 @@
+import asyncio
+import json
+import threading
+
+from app.asgi import SlugStreamingApp
+from app.services import slug_jobs
+from app.services.url_cleaner import normalize_destination
+
+
+def test_normalize_destination_equivalent_urls():
+    a = normalize_destination("https://WWW.Example.com:443/post/?q=2&page=1#top")
+    b = normalize_destination("https://example.com/post?page=1&q=2&utm_source=x")
+    assert a == b == "https://example.com/post?page=1&q=2"
+
+
+def test_concurrent_requests_share_one_generation(app, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_generate(url):
+        calls.append(url)
+        yield json.dumps({"status": "progress", "message": "working"})
+        release.wait(timeout=5)
+        yield json.dumps({"status": "success", "slugs": ["one", "two", "three"]})
+
+    monkeypatch.setattr(slug_jobs, "generate_slug_options", fake_generate)
+
+    first = slug_jobs.get_or_start_job("https://example.com/page", app)
+    second = slug_jobs.get_or_start_job("https://example.com/page/?utm_medium=x", app)
+    assert first is second
+
+    release.set()
+    events_a = [data for _, data in filter(None, first.stream(keepalive=1))]
+    events_b = [data for _, data in filter(None, second.stream(keepalive=1))]
+
+    assert calls == ["https://example.com/page"]
+    assert events_a == events_b
+    assert json.loads(events_a[-1])["status"] == "success"
+
+    # Once finished, a new request starts a fresh generation
+    third = slug_jobs.get_or_start_job("https://example.com/page", app)
+    assert third is not first
+    list(third.stream(keepalive=1))
+
+
+def test_stream_resumes_after_last_event_id():
+    job = slug_jobs.SlugJob("key", "https://example.com", buffer_size=3)
+    for i in range(5):
+        job.publish(json.dumps({"status": "progress", "message": str(i)}))
+    job.finish()
+
+    # Only the newest events are kept in the ring buffer
+    assert [event_id for event_id, _ in job.events_after(0)] == [3, 4, 5]
+    assert [event_id for event_id, _ in job.stream(last_event_id=4)] == [5]
+
+
+def test_slug_job_endpoints(app, client, monkeypatch):
+    def fake_generate(url):
+        yield json.dumps({"status": "progress", "message": "working"})
+        yield json.dumps({"status": "success", "slugs": ["one", "two", "three"]})
+
+    monkeypatch.setattr(slug_jobs, "generate_slug_options", fake_generate)
+
+    response = client.post("/api/slug-jobs", json={"url": "https://example.com/job"})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    stream = client.get(f"/api/slug-jobs/{job_id}/events").get_data(as_text=True)
+    assert "id: 2" in stream
+
+    resumed = client.get(
+        f"/api/slug-jobs/{job_id}/events", headers={"Last-Event-ID": "2"}
+    )
+    assert resumed.status_code == 204
+
+    polled = client.get(f"/api/slug-jobs/{job_id}?last_event_id=1").get_json()
+    assert polled["status"] == "done"
+    assert [e["id"] for e in polled["events"]] == [2]
+
+
+def test_generate_slugs_stream_is_capped_and_resumable(app, client, monkeypatch):
+    release = threading.Event()
+
+    def fake_generate(url):
+        yield json.dumps({"status": "progress", "message": "working"})
+        release.wait(timeout=5)
+        yield json.dumps({"status": "success", "slugs": ["one", "two", "three"]})
+
+    monkeypatch.setattr(slug_jobs, "generate_slug_options", fake_generate)
+    monkeypatch.setitem(app.config, "SLUG_JOB_STREAM_WINDOW", 0.2)
+
+    response = client.post(
+        "/api/generate-slugs", json={"url": "https://example.com/cap"}
+    )
+    stream = response.get_data(as_text=True)
+    assert "id: 1" in stream and "success" not in stream
+
+    release.set()
+    resumed = client.get(
+        response.headers["X-Slug-Job-Events"], headers={"Last-Event-ID": "1"}
+    ).get_data(as_text=True)
+    assert "id: 1\n" not in resumed
+    assert json.loads(resumed.split("id: 2\ndata: ", 1)[1].split("\n")[0])["slugs"]
+
+
+def test_asgi_generate_slugs_streams_without_threads(app, monkeypatch):
+    def fake_generate(url):
+        yield json.dumps({"status": "success", "slugs": ["one", "two", "three"]})
+
+    monkeypatch.setattr(slug_jobs, "generate_slug_options", fake_generate)
+
+    async def call():
+        messages = []
+        body = json.dumps({"url": "https://example.com/asgi"}).encode()
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.sleep(10)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": "/api/generate-slugs"}
+        await SlugStreamingApp(app)(scope, receive, send)
+        return messages
+
+    messages = asyncio.run(call())
+    assert messages[0]["status"] == 200
+    body = b"".join(m.get("body", b"") for m in messages[1:]).decode()
+    assert '"slugs": ["one", "two", "three"]' in body
+
+
+def _asgi_post(app, path, payload, headers=()):
+    async def call():
+        messages = []
+        body = json.dumps(payload).encode()
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.sleep(10)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": path,
+            "headers": [(b"content-type", b"application/json"), *headers],
+        }
+        await SlugStreamingApp(app)(scope, receive, send)
+        return messages
+
+    messages = asyncio.run(call())
+    return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_asgi_generate_slugs_returns_existing_link(
+    app, client, auth_client, monkeypatch
+):
+    def no_generation(url):
+        raise AssertionError("an existing link should not start a job")
+
+    monkeypatch.setattr(slug_jobs, "generate_slug_options", no_generation)
+    auth_client.post(
+        "/api/create-short-url",
+        json={"url": "https://example.com/post", "slug": "my-post"},
+    )
+    token = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    ).get_json()["token"]
+
+    payload = {"url": "https://www.example.com/post/", "reuse_existing": True}
+    status, body = _asgi_post(
+        app,
+        "/api/generate-slugs",
+        payload,
+        headers=[(b"authorization", f"Bearer {token}".encode())],
+    )
+    assert status == 200
+    event = json.loads(body.decode().split("data: ", 1)[1])
+    assert event["status"] == "existing"
+    assert event["slug"] == "my-post"
+
+    session = auth_client.get_cookie("session", domain="localhost").value
+    cookie = [(b"cookie", f"session={session}".encode())]
+    status, body = _asgi_post(app, "/api/generate-slugs", payload, headers=cookie)
+    assert '"slug": "my-post"' in body.decode()
+
+    forged = [(b"authorization", b"Bearer bk_deadbeef0000_notarealsecret")]
+    status, _ = _asgi_post(app, "/api/generate-slugs", payload, headers=forged)
+    assert status == 401
+
+
+def test_asgi_generate_slugs_rejects_oversized_body(app):
+    payload = {"url": "https://example.com/big", "padding": "x" * 70000}
+    status, body = _asgi_post(app, "/api/generate-slugs", payload)
+    assert status == 413
+    assert json.loads(body) == {"error": "Request body too large"}
@@ -0,0 +1,43 @@
+import pytest
+
+from app.models.bio import BioLink, BioPage
+from app.services.social_platforms import detect_platform
+
+
+@pytest.mark.parametrize(
+    ("url", "platform"),
+    [
+        ("https://github.com/me", "github"),
+        ("https://www.X.com/me", "twitter"),
+        ("https://m.youtube.com/@me", "youtube"),
+        ("t.me/me", "telegram"),
+        ("https://discord.gg/abc", "discord"),
+        ("https://notgithub.com/me", None),
+        ("https://example.com/?next=github.com", None),
+        ("not a url", None),
+        ("", None),
+    ],
+)
+def test_detect_platform(url, platform):
+    assert detect_platform(url) == platform
+
+
+def test_platform_is_stored_on_write(auth_client, db, user):
+    page = BioPage(user_id=user.id, username="social")
+    db.session.add(page)
+    db.session.commit()
+
+    response = auth_client.post(
+        "/api/bio/links", json={"title": "Code", "url": "https://github.com/me"}
+    )
+    link_data = response.get_json()["link"]
+    assert link_data["is_social"] is True
+    assert link_data["social_platform"] == "github"
+
+    auth_client.put(
+        f"/api/bio/links/{link_data['id']}", json={"url": "https://blog.dev"}
+    )
+    link = db.session.get(BioLink, link_data["id"])
+    assert link.social_platform is None
+    assert link.is_social is False
+    assert BioLink.query.filter_by(social_platform="github").count() == 0
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.models.bio import BioPage
+from app.services.storage_backends import LocalBackend, create_backend
+
+
+@pytest.fixture
+def local_storage(app, tmp_path):
+    app.config["STORAGE_BACKEND"] = "local"
+    app.config["LOCAL_STORAGE_DIR"] = str(tmp_path)
+    app.extensions.pop("storage_backend", None)
+    return tmp_path
+
+
+def _jpeg():
+    output = BytesIO()
+    Image.new("RGB", (800, 600), "teal").save(output, "JPEG")
+    return output.getvalue()
+
+
+def test_create_backend_selection(tmp_path):
+    assert create_backend({"STORAGE_BACKEND": "gcs"}) is None
+    backend = create_backend(
+        {"STORAGE_BACKEND": "local", "LOCAL_STORAGE_DIR": str(tmp_path)}
+    )
+    assert isinstance(backend, LocalBackend)
+
+
+def test_local_backend_round_trip_and_traversal(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    backend.save("avatars/a.png", b"data", "image/png")
+
+    assert backend.load("avatars/a.png") == (b"data", "image/png")
+    assert backend.local_path("../outside.png") is None
+    with pytest.raises(ValueError):
+        backend.save("../outside.png", b"data", "image/png")
+
+    backend.delete("avatars/a.png")
+    backend.delete("avatars/a.png")
+    assert backend.load("avatars/a.png") == (None, None)
+
+
+def test_avatar_upload_and_serving_from_disk(auth_client, db, user, local_storage):
+    db.session.add(BioPage(user_id=user.id, username="tester"))
+    db.session.commit()
+
+    response = auth_client.post(
+        "/api/bio/avatar",
+        data={"avatar": (BytesIO(_jpeg()), "me.jpg", "image/jpeg")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 200
+    avatar_url = response.get_json()["avatar_url"]
+    assert avatar_url.endswith("?size=192")
+    assert len(list((local_storage / "avatars").iterdir())) == 5
+
+    webp = auth_client.get(avatar_url, headers={"Accept": "image/webp,*/*"})
+    assert webp.mimetype == "image/webp"
+    assert Image.open(BytesIO(webp.get_data())).size == (192, 192)
+    assert "immutable" in webp.headers["Cache-Control"]
+
+    jpeg = auth_client.get(avatar_url, headers={"Accept": "image/png"})
+    assert jpeg.mimetype == "image/jpeg"
+
+    partial = auth_client.get(
+        avatar_url, headers={"Accept": "image/webp", "Range": "bytes=0-9"}
+    )
+    assert partial.status_code == 206
+    assert partial.get_data() == webp.get_data()[:10]
+
+    not_modified = auth_client.get(
+        avatar_url,
+        headers={"Accept": "image/webp", "If-None-Match": webp.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304